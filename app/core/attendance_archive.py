@@ -0,0 +1,84 @@
+# app/core/attendance_archive.py
+from sqlalchemy import select, insert, delete, union_all
+from sqlalchemy.orm import Session, aliased
+from datetime import date
+import logging
+
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def archive_cutoff(today: date = None, hot_months: int = None) -> date:
+    """First day of the oldest month kept in the hot attendance table"""
+    today = today or date.today()
+    hot_months = hot_months or settings.ATTENDANCE_HOT_MONTHS
+    months = today.year * 12 + today.month - hot_months
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def attendance_history():
+    """
+    Attendance entity over the hot table and the archive, for reads that
+    may reach past the horizon. Filters on the alias apply to both halves
+    of the UNION ALL, so each is served by its own indexes.
+    """
+    hot = models.Attendance.__table__
+    archive = models.AttendanceArchive.__table__
+    history = union_all(
+        select(hot),
+        select(*(archive.c[column.name] for column in hot.columns))
+    ).subquery("attendance_history")
+    return aliased(models.Attendance, history)
+
+
+def archive_attendance(session: Session, before: date = None, batch_size: int = None) -> int:
+    """
+    Move attendance rows dated before `before` (default: the hot horizon)
+    to attendance_archive, oldest first. Each batch is copied, deleted and
+    committed on its own, so no statement locks enough rows to escalate to
+    a table lock and an interrupted run can simply be started again.
+    """
+    before = before or archive_cutoff()
+    batch_size = batch_size or settings.ATTENDANCE_ARCHIVE_BATCH_SIZE
+    hot = models.Attendance.__table__
+    archive = models.AttendanceArchive.__table__
+    columns = [archive.c[column.name] for column in hot.columns]
+
+    moved = 0
+    while True:
+        ids = session.scalars(
+            select(hot.c.id)
+            .where(hot.c.date < before)
+            .order_by(hot.c.date, hot.c.id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            break
+
+        session.execute(insert(archive).from_select(columns, select(hot).where(hot.c.id.in_(ids))))
+        session.execute(delete(hot).where(hot.c.id.in_(ids)))
+        session.commit()
+
+        moved += len(ids)
+        logger.info(f"Attendance archive before {before}: {moved} rows moved")
+    return moved
+
+
+def run_attendance_archive(before: date = None) -> None:
+    with SessionLocal() as session:
+        try:
+            archive_attendance(session, before)
+        except Exception:
+            logger.exception("Attendance archive failed")
+            session.rollback()
+
+
+if __name__ == "__main__":
+    import sys
+
+    with SessionLocal() as session:
+        before = date.fromisoformat(sys.argv[1]) if len(sys.argv) > 1 else None
+        print(f"Archived {archive_attendance(session, before)} attendance rows")
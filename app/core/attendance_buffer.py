@@ -0,0 +1,166 @@
+# app/core/attendance_buffer.py
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Callable, List, Tuple
+import asyncio
+import logging
+
+from app.core.attendance_rollups import rollup_deltas, add_attendance_delta, apply_attendance_deltas
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class DuplicateCheckIn(Exception):
+    """Attendance is already recorded for this user and date"""
+
+
+class CheckInBufferClosed(Exception):
+    """The buffer is shutting down and accepts no more check-ins"""
+
+
+class CheckInBuffer:
+    """
+    Write-behind buffer for attendance check-ins.
+
+    Check-ins are queued in memory and inserted with one executemany per
+    batch, either `flush_interval_ms` after the first row of a batch
+    arrives or as soon as `max_batch_size` rows are waiting. Callers await
+    the flush of their own batch, so they still learn whether their row
+    was stored or duplicated an existing (user_id, date) record; the
+    unique constraint detects duplicates instead of a SELECT per check-in.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int,
+        flush_interval_ms: int,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.session_factory = session_factory
+        self._pending: List[Tuple[dict, asyncio.Future]] = []
+        self._keys = set()  # (user_id, date) buffered or being flushed
+        self._generation = 0
+        self._flushes = set()
+        self._closed = False
+
+    async def submit(self, row: dict) -> dict:
+        """Buffer an attendance row and return it once its batch is committed"""
+        if self._closed:
+            raise CheckInBufferClosed()
+        key = (row["user_id"], row["date"])
+        if key in self._keys:
+            raise DuplicateCheckIn()
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((row, future))
+        self._keys.add(key)
+        if len(self._pending) >= self.max_batch_size:
+            self._start(self._flush_batch(self._take()))
+        elif len(self._pending) == 1:
+            self._start(self._flush_after_interval(self._generation))
+        return await future
+
+    async def close(self) -> None:
+        """Stop accepting check-ins and flush everything still buffered"""
+        self._closed = True
+        await self._flush_batch(self._take())
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def _start(self, coroutine) -> None:
+        # Flushes run as tasks so a cancelled request cannot strand a batch
+        task = asyncio.ensure_future(coroutine)
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    def _take(self) -> List[Tuple[dict, asyncio.Future]]:
+        batch, self._pending = self._pending, []
+        self._generation += 1
+        return batch
+
+    async def _flush_after_interval(self, generation: int) -> None:
+        await asyncio.sleep(self.flush_interval)
+        # The batch may already have been flushed for being full
+        if generation == self._generation:
+            await self._flush_batch(self._take())
+
+    async def _flush_batch(self, batch: List[Tuple[dict, asyncio.Future]]) -> None:
+        if not batch:
+            return
+        rows = [row for row, _ in batch]
+        try:
+            inserted = await run_in_threadpool(self._insert, rows)
+        except Exception as e:
+            logger.exception(f"Failed to flush {len(rows)} check-ins")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (row, future), stored in zip(batch, inserted):
+                if future.done():
+                    continue
+                if stored:
+                    future.set_result(row)
+                else:
+                    future.set_exception(DuplicateCheckIn())
+        finally:
+            self._keys.difference_update((row["user_id"], row["date"]) for row in rows)
+
+    def _insert(self, rows: List[dict]) -> List[bool]:
+        """
+        Insert a batch with its monthly rollup increments and report which
+        rows were stored. When the unique constraint rejects the batch, the
+        rows that already exist are looked up and the rest inserted again;
+        if another worker races that too, the remaining rows are inserted
+        one at a time.
+        """
+        with self.session_factory() as session:
+            try:
+                self._store(session, rows)
+                return [True] * len(rows)
+            except IntegrityError:
+                session.rollback()
+
+            existing = set(session.execute(
+                select(models.Attendance.user_id, models.Attendance.date).where(
+                    models.Attendance.user_id.in_({row["user_id"] for row in rows}),
+                    models.Attendance.date.in_({row["date"] for row in rows})
+                )
+            ).all())
+            fresh = [row for row in rows if (row["user_id"], row["date"]) not in existing]
+            stored = set()
+            try:
+                if fresh:
+                    self._store(session, fresh)
+                stored = {row["id"] for row in fresh}
+            except IntegrityError:
+                session.rollback()
+                for row in fresh:
+                    try:
+                        self._store(session, [row])
+                        stored.add(row["id"])
+                    except IntegrityError:
+                        session.rollback()
+            return [row["id"] in stored for row in rows]
+
+    @staticmethod
+    def _store(session: Session, rows: List[dict]) -> None:
+        session.execute(models.Attendance.__table__.insert(), rows)
+        deltas = rollup_deltas()
+        for row in rows:
+            add_attendance_delta(deltas, row["user_id"], row["date"], row["status"], row.get("work_minutes"))
+        apply_attendance_deltas(session, deltas)
+        session.commit()
+
+
+checkin_buffer = CheckInBuffer(
+    max_batch_size=settings.ATTENDANCE_FLUSH_BATCH_SIZE,
+    flush_interval_ms=settings.ATTENDANCE_FLUSH_INTERVAL_MS
+)
@@ -0,0 +1,132 @@
+# app/core/attendance_rollups.py
+from sqlalchemy import select, insert, update, delete, func, case, extract, literal, bindparam
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+from app.core.attendance_archive import attendance_history
+from app.db import models
+
+# Attendance status counted by each rollup column
+STATUS_COLUMNS = {"present": "present_days", "absent": "absent_days", "half-day": "half_days"}
+MEASURES = ("present_days", "absent_days", "half_days", "total_minutes")
+
+RollupKey = Tuple[str, int, int]  # (user_id, year, month)
+
+
+def rollup_deltas() -> Dict[RollupKey, Counter]:
+    return defaultdict(Counter)
+
+
+def add_attendance_delta(
+    deltas: Dict[RollupKey, Counter],
+    user_id: str,
+    day: date,
+    status: Optional[str],
+    work_minutes: Optional[int],
+    sign: int = 1
+) -> None:
+    """Accumulate adding (sign=1) or removing (sign=-1) one attendance row"""
+    delta = deltas[(user_id, day.year, day.month)]
+    if status in STATUS_COLUMNS:
+        delta[STATUS_COLUMNS[status]] += sign
+    delta["total_minutes"] += sign * (work_minutes or 0)
+
+
+def apply_attendance_deltas(session: Session, deltas: Dict[RollupKey, Counter]) -> None:
+    """
+    Add accumulated deltas to the rollup inside the caller's transaction:
+    one executemany UPDATE for the months that already have a row and one
+    executemany INSERT for the rest. If a concurrent writer creates one of
+    the new rows first, the inserts are redone one month at a time.
+    """
+    rollup = models.AttendanceRollup.__table__
+    deltas = {key: delta for key, delta in deltas.items() if any(delta.values())}
+    if not deltas:
+        return
+
+    now = datetime.utcnow()
+    increment = (
+        update(rollup)
+        .where(
+            rollup.c.user_id == bindparam("key_user_id"),
+            rollup.c.year == bindparam("key_year"),
+            rollup.c.month == bindparam("key_month")
+        )
+        .values(
+            updated_at=bindparam("key_updated_at"),
+            **{measure: rollup.c[measure] + bindparam(f"delta_{measure}") for measure in MEASURES}
+        )
+    )
+
+    def increment_params(key):
+        return {
+            "key_user_id": key[0], "key_year": key[1], "key_month": key[2], "key_updated_at": now,
+            **{f"delta_{measure}": deltas[key][measure] for measure in MEASURES}
+        }
+
+    def insert_params(key):
+        # A month first seen through a decrement is out of sync anyway;
+        # never start it below zero
+        return {
+            "user_id": key[0], "year": key[1], "month": key[2], "updated_at": now,
+            **{measure: max(deltas[key][measure], 0) for measure in MEASURES}
+        }
+
+    existing = set(session.execute(
+        select(rollup.c.user_id, rollup.c.year, rollup.c.month).where(
+            rollup.c.user_id.in_({key[0] for key in deltas}),
+            rollup.c.year.in_({key[1] for key in deltas}),
+            rollup.c.month.in_({key[2] for key in deltas})
+        )
+    ).all())
+    new_keys = [key for key in deltas if key not in existing]
+    if existing:
+        session.execute(increment, [increment_params(key) for key in deltas if key in existing])
+    if not new_keys:
+        return
+    try:
+        with session.begin_nested():
+            session.execute(rollup.insert(), [insert_params(key) for key in new_keys])
+    except IntegrityError:
+        for key in new_keys:
+            if not session.execute(increment, increment_params(key)).rowcount:
+                session.execute(rollup.insert(), insert_params(key))
+
+
+def rebuild_attendance_rollups(session: Session) -> int:
+    """Recompute every rollup row from attendance, archive included; the caller commits"""
+    rollup = models.AttendanceRollup
+    attendance = attendance_history()
+    year = extract("year", attendance.date)
+    month = extract("month", attendance.date)
+
+    def status_count(status):
+        return func.sum(case((attendance.status == status, 1), else_=0))
+
+    session.execute(delete(rollup))
+    query = (
+        select(
+            attendance.user_id, year, month,
+            *(status_count(status) for status in STATUS_COLUMNS),
+            func.coalesce(func.sum(attendance.work_minutes), 0),
+            literal(datetime.utcnow())
+        )
+        .group_by(attendance.user_id, year, month)
+    )
+    return session.execute(insert(rollup).from_select([
+        rollup.user_id, rollup.year, rollup.month,
+        *(getattr(rollup, column) for column in STATUS_COLUMNS.values()),
+        rollup.total_minutes, rollup.updated_at
+    ], query)).rowcount
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as session:
+        rows = rebuild_attendance_rollups(session)
+        session.commit()
+    print(f"Rebuilt {rows} attendance rollup rows")
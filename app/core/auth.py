@@ -2,21 +2,23 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from typing import Optional
 
-from app.db.session import get_db
+from app.db.session import get_db, db_session
 from app.core.config import settings
 from app.db import models
 from app.schemas.token import TokenData
 from app.core.security import verify_password, create_access_token, get_password_hash
+from app.core.principal_cache import Principal, principal_cache
 import uuid
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
 async def get_current_user(
         token: str = Depends(oauth2_scheme),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -33,7 +35,7 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(models.User).filter(models.User.id == token_data.user_id).first()
+    user = await db.scalar(select(models.User).where(models.User.id == token_data.user_id))
     if user is None:
         raise credentials_exception
 
@@ -52,11 +54,54 @@ async def get_current_active_user(
 
 
 async def get_current_user_with_permissions(
-        current_user: models.User = Depends(get_current_active_user),
-        db: Session = Depends(get_db)
+        token: str = Depends(oauth2_scheme)
 ):
-    # Load relationships to check permissions
-    current_user.role = db.query(models.Role).filter(models.Role.id == current_user.role_id).first()
-    return current_user
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+        user_id: str = payload.get("sub")
+        if user_id is None:
+            raise credentials_exception
+    except JWTError:
+        raise credentials_exception
+
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        # Resolve user and role in a single round trip. The session is opened
+        # only on a cache miss, so endpoints that need no other database
+        # access, such as check-in, open none at all on a hit
+        async with db_session() as db:
+            row = (await db.execute(
+                select(
+                    models.User.id,
+                    models.User.is_active,
+                    models.User.department_id,
+                    models.User.manager_id,
+                    models.Role.name
+                ).outerjoin(models.Role, models.Role.id == models.User.role_id).where(
+                    models.User.id == user_id
+                )
+            )).first()
+        if row is None:
+            raise credentials_exception
+
+        principal = Principal(
+            id=row[0],
+            is_active=bool(row[1]),
+            department_id=row[2],
+            manager_id=row[3],
+            role_name=row[4]
+        )
+        principal_cache.set(principal)
 
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user"
+        )
+    return principal
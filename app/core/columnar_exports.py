@@ -0,0 +1,80 @@
+# app/core/columnar_exports.py
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer
+from typing import AsyncIterator, List
+import io
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# SQLAlchemy column types and their Arrow equivalents; anything else is a string
+ARROW_TYPES = (
+    (Boolean, pa.bool_()),
+    (Integer, pa.int64()),
+    (Float, pa.float64()),
+    (DateTime, pa.timestamp("us")),
+    (Date, pa.date32()),
+)
+
+
+def arrow_schema(query) -> pa.Schema:
+    """Arrow schema of a select()'s columns"""
+    fields = []
+    for column in query.selected_columns:
+        arrow_type = next(
+            (arrow_type for sql_type, arrow_type in ARROW_TYPES if isinstance(column.type, sql_type)),
+            pa.string()
+        )
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+def record_batch(schema: pa.Schema, partition: List[tuple]) -> pa.RecordBatch:
+    """Transpose a partition of row tuples into one typed array per column"""
+    columns = list(zip(*partition)) if partition else [()] * len(schema)
+    return pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+        schema=schema
+    )
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file the Arrow writers append to; drained after every batch"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def arrow_chunks(schema: pa.Schema, partitions: AsyncIterator[List[tuple]]) -> AsyncIterator[bytes]:
+    """Arrow IPC stream with one record batch per cursor partition"""
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        async for partition in partitions:
+            writer.write_batch(record_batch(schema, partition))
+            yield sink.drain()
+    yield sink.drain()
+
+
+async def parquet_chunks(schema: pa.Schema, partitions: AsyncIterator[List[tuple]]) -> AsyncIterator[bytes]:
+    """Parquet file with one row group per cursor partition; the footer comes last"""
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        async for partition in partitions:
+            writer.write_batch(record_batch(schema, partition))
+            yield sink.drain()
+    yield sink.drain()
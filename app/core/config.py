@@ -13,6 +13,10 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-for-development")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+    # Password hashing pool
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    PASSWORD_HASH_MAX_WAIT_SECONDS: float = float(os.getenv("PASSWORD_HASH_MAX_WAIT_SECONDS", "5"))
+
     # CORS
     CORS_ORIGINS: List[str] = [
         "http://localhost:3000",
@@ -25,6 +29,50 @@ class Settings(BaseSettings):
     DB_NAME: str = os.getenv("DB_NAME", "hrms")
     DB_USER: str = os.getenv("DB_USER", "admin")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "password")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    # Use the aioodbc AsyncEngine instead of pyodbc sessions run in the threadpool
+    DB_ASYNC: bool = os.getenv("DB_ASYNC", "false").lower() == "true"
+
+    # Pagination
+    PAGE_SIZE_DEFAULT: int = int(os.getenv("PAGE_SIZE_DEFAULT", "100"))
+    PAGE_SIZE_MAX: int = int(os.getenv("PAGE_SIZE_MAX", "500"))
+
+    # Principal cache
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    PRINCIPAL_CACHE_MAX_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+
+    # Payroll runs
+    PAYROLL_BATCH_SIZE: int = int(os.getenv("PAYROLL_BATCH_SIZE", "1000"))
+    # A running payroll run with no progress for this long may be resumed
+    PAYROLL_RUN_STALE_SECONDS: int = int(os.getenv("PAYROLL_RUN_STALE_SECONDS", "300"))
+    # Working-day calendar; week mask starts on Monday
+    WORK_WEEK_MASK: str = os.getenv("WORK_WEEK_MASK", "1111100")
+    WORK_CALENDAR_TTL_SECONDS: int = int(os.getenv("WORK_CALENDAR_TTL_SECONDS", "3600"))
+
+    # Users per INSERT ... SELECT chunk in the year-end leave accrual job
+    LEAVE_ACCRUAL_CHUNK_SIZE: int = int(os.getenv("LEAVE_ACCRUAL_CHUNK_SIZE", "5000"))
+    # A running accrual with no progress for this long may be resumed
+    LEAVE_ACCRUAL_STALE_SECONDS: int = int(os.getenv("LEAVE_ACCRUAL_STALE_SECONDS", "300"))
+    # Active leave types are served from memory for this long
+    LEAVE_TYPE_CACHE_TTL_SECONDS: int = int(os.getenv("LEAVE_TYPE_CACHE_TTL_SECONDS", "300"))
+
+    # Check-ins are buffered and inserted in batches of up to this many
+    # rows, at most this many milliseconds after the first one arrives
+    ATTENDANCE_FLUSH_BATCH_SIZE: int = int(os.getenv("ATTENDANCE_FLUSH_BATCH_SIZE", "500"))
+    ATTENDANCE_FLUSH_INTERVAL_MS: int = int(os.getenv("ATTENDANCE_FLUSH_INTERVAL_MS", "50"))
+
+    # Attendance older than this many months (counting the current one)
+    # is moved to attendance_archive, in batches small enough to stay
+    # below SQL Server's lock escalation threshold
+    ATTENDANCE_HOT_MONTHS: int = int(os.getenv("ATTENDANCE_HOT_MONTHS", "13"))
+    ATTENDANCE_ARCHIVE_BATCH_SIZE: int = int(os.getenv("ATTENDANCE_ARCHIVE_BATCH_SIZE", "1000"))
+
+    # Rows fetched per server-side cursor round trip by the export endpoints
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", "5000"))
+
+    # Regime applied when an employee has not chosen one in TaxInfo
+    TAX_DEFAULT_REGIME: str = os.getenv("TAX_DEFAULT_REGIME", "new")
     
     
     def get_connection_string(self) -> str:
@@ -0,0 +1,125 @@
+# app/core/exports.py
+from sqlalchemy import select, DateTime
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Callable, List, NamedTuple, Optional, Sequence, Tuple
+import csv
+import io
+import json
+
+from app.core.attendance_archive import attendance_history
+from app.core.config import settings
+from app.db import models
+
+
+class ExportSpec(NamedTuple):
+    source: Callable  # mapped class or alias the rows are selected from
+    columns: Tuple[str, ...]
+    date_column: str  # target of the from_date/to_date predicates
+
+
+EXPORTS = {
+    "leaves": ExportSpec(
+        lambda: models.Leave,
+        ("id", "user_id", "leave_type_id", "start_date", "end_date", "days", "status",
+         "reason", "comment", "created_at", "updated_at"),
+        "start_date"
+    ),
+    # Archived history included
+    "attendance": ExportSpec(
+        attendance_history,
+        ("id", "user_id", "date", "check_in", "check_out", "status", "work_minutes",
+         "created_at", "updated_at"),
+        "date"
+    ),
+    "salaries": ExportSpec(
+        lambda: models.Salary,
+        ("id", "user_id", "basic_salary", "allowances", "deductions", "gross_salary",
+         "net_salary", "effective_date", "created_at", "updated_at"),
+        "effective_date"
+    ),
+    "payslips": ExportSpec(
+        lambda: models.Payslip,
+        ("id", "user_id", "year", "month", "basic_salary", "allowances", "deductions",
+         "gross_salary", "net_salary", "tax_deducted", "status", "generated_at",
+         "created_at", "updated_at"),
+        "generated_at"
+    ),
+    "performance_ratings": ExportSpec(
+        lambda: models.PerformanceRating,
+        ("id", "user_id", "rated_by", "rating", "category", "period_start", "period_end",
+         "comments", "created_at", "updated_at"),
+        "period_start"
+    ),
+    # Never hashed_password
+    "users": ExportSpec(
+        lambda: models.User,
+        ("id", "first_name", "last_name", "email", "phone_number", "department_id", "role_id",
+         "manager_id", "joining_date", "status", "is_active", "created_at", "updated_at"),
+        "joining_date"
+    ),
+}
+
+
+def export_query(
+    dataset: str,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    columns: Optional[Sequence[str]] = None
+):
+    """
+    Core select of an export's columns, or of the projected subset, fetched
+    EXPORT_CHUNK_SIZE rows at a time. The date range is inclusive, also for
+    timestamp columns.
+    """
+    spec = EXPORTS[dataset]
+    entity = spec.source()
+    query = select(*(getattr(entity, column) for column in columns or spec.columns))
+    date_column = getattr(entity, spec.date_column)
+    if from_date:
+        query = query.where(date_column >= from_date)
+    if to_date:
+        if isinstance(date_column.type, DateTime):
+            query = query.where(date_column < to_date + timedelta(days=1))
+        else:
+            query = query.where(date_column <= to_date)
+    return query.execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+
+
+async def export_partitions(db: AsyncSession, query) -> AsyncIterator[List[tuple]]:
+    """
+    Rows of `query` from a server-side cursor, one partition at a time, so
+    only EXPORT_CHUNK_SIZE rows are held in memory whatever the result size.
+    """
+    result = await db.stream(query)
+    try:
+        async for partition in result.partitions():
+            yield partition
+    finally:
+        await result.close()
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+async def csv_chunks(columns: Sequence[str], partitions: AsyncIterator[List[tuple]]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for partition in partitions:
+        writer.writerows(partition)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+async def ndjson_chunks(columns: Sequence[str], partitions: AsyncIterator[List[tuple]]) -> AsyncIterator[str]:
+    async for partition in partitions:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=_json_default) + "\n"
+            for row in partition
+        )
@@ -0,0 +1,175 @@
+# app/core/leave_accrual.py
+from sqlalchemy import select, insert, update, func, case, cast, literal, and_, or_, null, true, String
+from sqlalchemy.orm import Session, aliased
+from datetime import datetime, timedelta
+import logging
+
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _accrual_insert(year: int, after_user_id, last_user_id):
+    """
+    INSERT ... SELECT of the `year` balances for active users in
+    (after_user_id, last_user_id] and every active leave type: the type's
+    default days plus the previous year's unused days, capped at its
+    max_carry_forward_days. Existing balances are left untouched.
+    """
+    user = models.User
+    leave_type = models.LeaveType
+    balance = models.LeaveBalance
+    previous = aliased(models.LeaveBalance)
+
+    unused = func.coalesce(
+        previous.total_days - previous.used_days - previous.reserved_days, 0
+    )
+    cap = func.coalesce(leave_type.max_carry_forward_days, 0)
+    carry_forward = case(
+        (unused <= 0, 0),
+        (unused > cap, cap),
+        else_=unused
+    )
+    already_created = select(balance.id).where(
+        balance.user_id == user.id,
+        balance.leave_type_id == leave_type.id,
+        balance.year == year
+    ).exists()
+
+    now = datetime.utcnow()
+    rows = (
+        select(
+            cast(func.newid(), String(36)),
+            user.id,
+            leave_type.id,
+            literal(year),
+            func.coalesce(leave_type.default_days, 0) + carry_forward,
+            literal(0),
+            literal(0),
+            literal(now),
+            literal(now)
+        )
+        .select_from(user)
+        .join(leave_type, true())
+        .outerjoin(previous, and_(
+            previous.user_id == user.id,
+            previous.leave_type_id == leave_type.id,
+            previous.year == year - 1
+        ))
+        .where(
+            user.is_active == True,
+            leave_type.is_active == True,
+            user.id <= last_user_id,
+            ~already_created
+        )
+    )
+    if after_user_id is not None:
+        rows = rows.where(user.id > after_user_id)
+
+    return insert(balance).from_select([
+        balance.id, balance.user_id, balance.leave_type_id, balance.year,
+        balance.total_days, balance.used_days, balance.reserved_days,
+        balance.created_at, balance.updated_at
+    ], rows)
+
+
+def claim_accrual_statement(run_id: str):
+    """
+    Conditional UPDATE that moves an accrual run to `running`. It matches
+    only runs that are not running, or whose last progress is older than
+    LEAVE_ACCRUAL_STALE_SECONDS (the worker died), so one worker wins.
+    Failed and stale runs keep their resume point; a completed run is
+    walked again from the first user to pick up users added since.
+    """
+    run = models.LeaveAccrualRun
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.LEAVE_ACCRUAL_STALE_SECONDS)
+    return (
+        update(run)
+        .where(
+            run.id == run_id,
+            or_(
+                run.status.in_(["pending", "failed", "completed"]),
+                and_(run.status == "running", run.updated_at < stale_before)
+            )
+        )
+        .values(
+            status="running",
+            error=None,
+            last_user_id=case((run.status == "completed", null()), else_=run.last_user_id),
+            users_processed=case((run.status == "completed", 0), else_=run.users_processed),
+            balances_created=case((run.status == "completed", 0), else_=run.balances_created),
+            started_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+    )
+
+
+def accrue_leave_balances(session: Session, run: models.LeaveAccrualRun, chunk_size: int = None) -> None:
+    """
+    Create the run's year of leave balances for all active users, from the
+    run's resume point onwards. Each chunk of users is committed together
+    with the run's progress, so a crashed or timed-out run resumes after
+    the last committed chunk; balances that already exist are skipped.
+    """
+    chunk_size = chunk_size or settings.LEAVE_ACCRUAL_CHUNK_SIZE
+    while True:
+        query = select(models.User.id).where(models.User.is_active == True)
+        if run.last_user_id is not None:
+            query = query.where(models.User.id > run.last_user_id)
+        chunk = session.scalars(query.order_by(models.User.id).limit(chunk_size)).all()
+        if not chunk:
+            break
+
+        run.balances_created += session.execute(
+            _accrual_insert(run.year, run.last_user_id, chunk[-1])
+        ).rowcount
+        run.users_processed += len(chunk)
+        run.last_user_id = chunk[-1]
+        session.commit()
+        logger.info(
+            f"Leave accrual {run.year}: {run.users_processed} users, {run.balances_created} balances"
+        )
+
+    run.status = "completed"
+    run.error = None
+    run.completed_at = datetime.utcnow()
+    session.commit()
+
+
+def run_leave_accrual(run_id: str, chunk_size: int = None) -> None:
+    """Background entry point for a claimed accrual run; failures are recorded on the run"""
+    with SessionLocal() as session:
+        run = session.get(models.LeaveAccrualRun, run_id)
+        try:
+            accrue_leave_balances(session, run, chunk_size)
+        except Exception as e:
+            logger.exception(f"Leave accrual run {run_id} failed")
+            session.rollback()
+            run = session.get(models.LeaveAccrualRun, run_id)
+            run.status = "failed"
+            run.error = str(e)[:1000]
+            session.commit()
+
+
+if __name__ == "__main__":
+    import sys
+    import uuid
+
+    year = int(sys.argv[1])
+    with SessionLocal() as session:
+        run = session.scalar(select(models.LeaveAccrualRun).where(models.LeaveAccrualRun.year == year))
+        if not run:
+            run = models.LeaveAccrualRun(id=str(uuid.uuid4()), year=year, status="pending")
+            session.add(run)
+            session.commit()
+        claimed = session.execute(claim_accrual_statement(run.id)).rowcount
+        session.commit()
+        run_id = run.id
+    if not claimed:
+        sys.exit(f"Leave accrual run {run_id} for {year} is already running")
+    run_leave_accrual(run_id)
+    with SessionLocal() as session:
+        run = session.get(models.LeaveAccrualRun, run_id)
+        print(f"Leave accrual {year} {run.status}: {run.users_processed} users, {run.balances_created} balances")
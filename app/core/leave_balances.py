@@ -0,0 +1,88 @@
+# app/core/leave_balances.py
+from sqlalchemy import update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+
+from app.db import models
+
+
+def _balance_update(leave: models.Leave):
+    balance = models.LeaveBalance
+    return update(balance).where(
+        balance.user_id == leave.user_id,
+        balance.leave_type_id == leave.leave_type_id,
+        balance.year == leave.start_date.year
+    ).execution_options(synchronize_session=False)
+
+
+async def reserve_leave_days(db: AsyncSession, leave: models.Leave) -> bool:
+    """
+    Hold the leave's days against the balance for its year.
+
+    The availability check is part of the UPDATE's WHERE clause, so
+    concurrent applications cannot both pass it; returns False when the
+    balance is missing or too small.
+    """
+    balance = models.LeaveBalance
+    result = await db.execute(
+        _balance_update(leave)
+        .where(balance.total_days - balance.used_days - balance.reserved_days >= leave.days)
+        .values(reserved_days=balance.reserved_days + leave.days)
+    )
+    return result.rowcount == 1
+
+
+async def consume_reservation(db: AsyncSession, leave: models.Leave) -> None:
+    """Move an approved leave's reserved days to used days"""
+    balance = models.LeaveBalance
+    await db.execute(_balance_update(leave).values(
+        reserved_days=balance.reserved_days - leave.days,
+        used_days=balance.used_days + leave.days
+    ))
+
+
+async def release_reservation(db: AsyncSession, leave: models.Leave) -> None:
+    """Return a rejected or cancelled pending leave's days"""
+    balance = models.LeaveBalance
+    await db.execute(_balance_update(leave).values(
+        reserved_days=balance.reserved_days - leave.days
+    ))
+
+
+async def refund_leave_days(db: AsyncSession, leave: models.Leave) -> None:
+    """Return a cancelled approved leave's used days"""
+    balance = models.LeaveBalance
+    await db.execute(_balance_update(leave).values(
+        used_days=balance.used_days - leave.days
+    ))
+
+
+async def transition_leave(
+    db: AsyncSession,
+    leave: models.Leave,
+    from_status: str,
+    to_status: str,
+    **values
+) -> bool:
+    """
+    Change a leave's status only if it is still `from_status`, so a leave
+    cannot be approved, rejected or cancelled twice by racing requests.
+    The in-session instance is updated in place.
+    """
+    result = await db.execute(
+        update(models.Leave)
+        .where(models.Leave.id == leave.id, models.Leave.status == from_status)
+        .values(status=to_status, updated_at=datetime.utcnow(), **values)
+        .execution_options(synchronize_session="evaluate")
+    )
+    return result.rowcount == 1
+
+
+async def delete_leave(db: AsyncSession, leave: models.Leave) -> bool:
+    """Delete a leave only if its status has not changed since it was read"""
+    result = await db.execute(
+        delete(models.Leave)
+        .where(models.Leave.id == leave.id, models.Leave.status == leave.status)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
@@ -0,0 +1,90 @@
+# app/core/leave_overlaps.py
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional
+import heapq
+
+from app.db import models
+
+# Leaves in these states block the dates they cover
+ACTIVE_LEAVE_STATUSES = ("pending", "approved")
+
+
+class Interval(NamedTuple):
+    user_id: str
+    start_date: date
+    end_date: date
+    index: Optional[int] = None  # position in the uploaded batch
+    leave_id: Optional[str] = None  # existing leave
+
+
+def overlaps(start_date: date, end_date: date):
+    """Closed-interval overlap predicate against Leave, served by (user_id, start_date, end_date)"""
+    return (
+        models.Leave.start_date <= end_date,
+        models.Leave.end_date >= start_date,
+        models.Leave.status.in_(ACTIVE_LEAVE_STATUSES)
+    )
+
+
+async def find_overlapping_leave(
+    db: AsyncSession,
+    user_id: str,
+    start_date: date,
+    end_date: date
+) -> Optional[models.Leave]:
+    return await db.scalar(
+        select(models.Leave)
+        .where(models.Leave.user_id == user_id, *overlaps(start_date, end_date))
+        .order_by(models.Leave.start_date)
+        .limit(1)
+    )
+
+
+async def validate_leave_batch(db: AsyncSession, batch: List[Interval]) -> Dict[int, List[Interval]]:
+    """
+    Overlaps of each uploaded interval with existing leaves and with the
+    rest of the batch, keyed by batch index.
+
+    Existing leaves of the batch's users inside the batch's overall date
+    range are fetched in one query; overlaps are then found with a
+    sort-and-sweep per user that keeps the intervals still open at each
+    start in a heap ordered by end date.
+    """
+    conflicts = defaultdict(list)
+    if not batch:
+        return conflicts
+
+    user_ids = {interval.user_id for interval in batch}
+    existing = (await db.execute(
+        select(models.Leave.id, models.Leave.user_id, models.Leave.start_date, models.Leave.end_date)
+        .where(
+            models.Leave.user_id.in_(user_ids),
+            *overlaps(
+                min(interval.start_date for interval in batch),
+                max(interval.end_date for interval in batch)
+            )
+        )
+    )).all()
+
+    by_user = defaultdict(list)
+    for interval in batch:
+        by_user[interval.user_id].append(interval)
+    for leave_id, user_id, start_date, end_date in existing:
+        by_user[user_id].append(Interval(user_id, start_date, end_date, leave_id=leave_id))
+
+    for intervals in by_user.values():
+        intervals.sort(key=lambda interval: interval.start_date)
+        open_intervals = []  # heap of (end_date, position, interval)
+        for position, interval in enumerate(intervals):
+            while open_intervals and open_intervals[0][0] < interval.start_date:
+                heapq.heappop(open_intervals)
+            for _, _, other in open_intervals:
+                if interval.index is not None:
+                    conflicts[interval.index].append(other)
+                if other.index is not None:
+                    conflicts[other.index].append(interval)
+            heapq.heappush(open_intervals, (interval.end_date, position, interval))
+    return conflicts
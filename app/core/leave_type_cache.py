@@ -0,0 +1,56 @@
+# app/core/leave_type_cache.py
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from threading import Lock
+from typing import Dict, List, Optional
+import time
+
+from app.core.config import settings
+from app.db import models
+from app.schemas.leave import LeaveTypeResponse
+
+
+class LeaveTypeCache:
+    """
+    In-process snapshot of the active leave types.
+
+    There are only a handful of them and they change rarely, so the whole
+    set is loaded in one query and served until it is invalidated by a
+    leave type write or `ttl` seconds pass (for writes on other workers).
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._types: Optional[Dict[str, LeaveTypeResponse]] = None
+        self._expires_at = 0.0
+        self._lock = Lock()
+
+    async def _load(self, db: AsyncSession) -> Dict[str, LeaveTypeResponse]:
+        with self._lock:
+            if self._types is not None and self._expires_at >= time.monotonic():
+                return self._types
+        leave_types = (await db.scalars(
+            select(models.LeaveType)
+            .where(models.LeaveType.is_active == True)
+            .order_by(models.LeaveType.name)
+        )).all()
+        types = {
+            leave_type.id: LeaveTypeResponse.from_orm(leave_type) for leave_type in leave_types
+        }
+        with self._lock:
+            self._types = types
+            self._expires_at = time.monotonic() + self.ttl
+        return types
+
+    async def get_all(self, db: AsyncSession) -> List[LeaveTypeResponse]:
+        return list((await self._load(db)).values())
+
+    async def get(self, db: AsyncSession, leave_type_id: str) -> Optional[LeaveTypeResponse]:
+        return (await self._load(db)).get(leave_type_id)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._types = None
+
+
+leave_type_cache = LeaveTypeCache(ttl=settings.LEAVE_TYPE_CACHE_TTL_SECONDS)
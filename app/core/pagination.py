@@ -0,0 +1,89 @@
+# app/core/pagination.py
+from fastapi import HTTPException, Query, Request, Response, status
+from sqlalchemy import and_, or_
+from datetime import datetime
+from typing import Optional
+import base64
+import json
+
+from app.core.config import settings
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: str) -> str:
+    raw = json.dumps([created_at.isoformat() if created_at else None, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return (datetime.fromisoformat(created_at) if created_at is not None else None), row_id
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+class KeysetPagination:
+    """
+    Dependency for keyset pagination on (created_at, id).
+
+    created_at is nullable and older rows may lack it; those rows sort
+    first, as NULLs do in both SQL Server and SQLite, and are paged by id.
+
+    The page is returned as the response body; the opaque cursor for the
+    following page is sent in the X-Next-Cursor header and as a
+    `Link: <...>; rel="next"` header. Both are omitted on the last page.
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        response: Response,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page"),
+        limit: int = Query(
+            settings.PAGE_SIZE_DEFAULT,
+            ge=1,
+            le=settings.PAGE_SIZE_MAX,
+            description="Maximum number of items to return"
+        )
+    ):
+        self.request = request
+        self.response = response
+        self.limit = limit
+        self.after = decode_cursor(cursor) if cursor else None
+
+    def apply(self, query, model):
+        """Restrict a select() to the current page, ordered by (created_at, id)"""
+        if self.after:
+            created_at, row_id = self.after
+            if created_at is None:
+                # Still among the NULL timestamps: the rest of them, then all others
+                query = query.where(or_(
+                    and_(model.created_at.is_(None), model.id > row_id),
+                    model.created_at.isnot(None)
+                ))
+            else:
+                # Expanded form of (created_at, id) > (:created_at, :id);
+                # SQL Server has no row-value comparison. NULLs sort first,
+                # so they are behind the cursor and fail both comparisons
+                query = query.where(or_(
+                    model.created_at > created_at,
+                    and_(model.created_at == created_at, model.id > row_id)
+                ))
+        # Fetch one extra row to know whether there is a next page
+        return query.order_by(model.created_at, model.id).limit(self.limit + 1)
+
+    def page(self, rows):
+        """Trim the look-ahead row and publish the next cursor"""
+        rows = list(rows)
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+            next_url = self.request.url.include_query_params(cursor=next_cursor)
+            self.response.headers["X-Next-Cursor"] = next_cursor
+            self.response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return rows
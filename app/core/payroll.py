@@ -0,0 +1,203 @@
+# app/core/payroll.py
+from sqlalchemy import select, update, func, or_, and_
+from sqlalchemy.orm import Session
+from datetime import datetime, date, timedelta
+import calendar
+import logging
+import uuid
+
+from app.core.config import settings
+from app.core.tax import compute_tax
+from app.db import models
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+SALARY_COLUMNS = ("basic_salary", "allowances", "deductions", "gross_salary", "net_salary")
+
+
+def period_end(year: int, month: int) -> date:
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+
+def gross_pay(salary) -> float:
+    """Gross salary, derived from its components on legacy rows that lack it"""
+    if salary.gross_salary is not None:
+        return salary.gross_salary
+    return (salary.basic_salary or 0) + (salary.allowances or 0)
+
+
+def net_pay(salary) -> float:
+    """Net salary before tax, derived from its components on legacy rows that lack it"""
+    if salary.net_salary is not None:
+        return salary.net_salary
+    return gross_pay(salary) - (salary.deductions or 0)
+
+
+def payslip_values(salary, tax_deducted: float = 0) -> dict:
+    """Payslip amounts for a salary row or Salary instance; tax is withheld from net pay"""
+    return {
+        "basic_salary": salary.basic_salary,
+        "allowances": salary.allowances or 0,
+        "deductions": salary.deductions or 0,
+        "gross_salary": gross_pay(salary),
+        "net_salary": net_pay(salary) - tax_deducted,
+        "tax_deducted": tax_deducted
+    }
+
+
+def effective_salaries_query(year: int, month: int):
+    """
+    Latest salary effective by the end of the month for every active user,
+    resolved with ROW_NUMBER() in one query, with the user's tax regime and
+    declarations and the id of any payslip already generated for the month.
+    """
+    ranked = (
+        select(
+            models.Salary.user_id,
+            *(getattr(models.Salary, column) for column in SALARY_COLUMNS),
+            func.row_number().over(
+                partition_by=models.Salary.user_id,
+                order_by=(models.Salary.effective_date.desc(), models.Salary.created_at.desc())
+            ).label("rank")
+        )
+        .join(models.User, models.User.id == models.Salary.user_id)
+        .where(
+            models.User.is_active == True,
+            models.Salary.effective_date <= period_end(year, month)
+        )
+        .subquery()
+    )
+    return (
+        select(
+            ranked,
+            models.TaxInfo.tax_regime,
+            models.TaxInfo.tax_declarations,
+            models.Payslip.id.label("payslip_id")
+        )
+        .outerjoin(models.TaxInfo, models.TaxInfo.user_id == ranked.c.user_id)
+        .outerjoin(models.Payslip, and_(
+            models.Payslip.user_id == ranked.c.user_id,
+            models.Payslip.year == year,
+            models.Payslip.month == month
+        ))
+        .where(ranked.c.rank == 1)
+        .order_by(ranked.c.user_id)
+    )
+
+
+def claim_statement(run_id: str):
+    """
+    Conditional UPDATE that moves a run to `running`. It matches only runs
+    that are not running, or whose last progress is older than
+    PAYROLL_RUN_STALE_SECONDS (the worker died), so one worker wins.
+    Completed runs can be claimed again to pick up employees added since.
+    """
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.PAYROLL_RUN_STALE_SECONDS)
+    return (
+        update(models.PayrollRun)
+        .where(
+            models.PayrollRun.id == run_id,
+            or_(
+                models.PayrollRun.status.in_(["pending", "failed", "completed"]),
+                and_(
+                    models.PayrollRun.status == "running",
+                    models.PayrollRun.updated_at < stale_before
+                )
+            )
+        )
+        .values(
+            status="running",
+            error=None,
+            started_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+    )
+
+
+def run_payroll(run_id: str, batch_size: int = None) -> None:
+    """
+    Generate the month's payslips for a claimed run.
+
+    Payslips are inserted in batches with one executemany per batch
+    (fast_executemany on pyodbc) and each batch is committed with the run's
+    progress. Users that already have a payslip for the month are skipped,
+    so re-running after a crash resumes where the last commit left off and
+    never duplicates a (user, year, month).
+    """
+    batch_size = batch_size or settings.PAYROLL_BATCH_SIZE
+    with SessionLocal() as session:
+        run = session.get(models.PayrollRun, run_id)
+        try:
+            _generate_payslips(session, run, batch_size)
+        except Exception as e:
+            logger.exception(f"Payroll run {run_id} failed")
+            session.rollback()
+            run = session.get(models.PayrollRun, run_id)
+            run.status = "failed"
+            run.error = str(e)[:1000]
+            session.commit()
+
+
+def _generate_payslips(session: Session, run: models.PayrollRun, batch_size: int) -> None:
+    rows = session.execute(effective_salaries_query(run.year, run.month)).all()
+    pending = [row for row in rows if row.payslip_id is None]
+
+    run.total_employees = len(rows)
+    run.processed_employees = len(rows) - len(pending)
+    session.commit()
+
+    # Monthly withholding for every pending employee in one vectorised pass
+    monthly_tax = compute_tax(
+        [gross_pay(row) for row in pending],
+        [row.tax_declarations for row in pending],
+        [row.tax_regime for row in pending]
+    ).monthly_liability.tolist()
+
+    payslips = models.Payslip.__table__
+    for start in range(0, len(pending), batch_size):
+        generated_at = datetime.utcnow()
+        batch = [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": row.user_id,
+                "year": run.year,
+                "month": run.month,
+                "status": "generated",
+                "generated_at": generated_at,
+                **payslip_values(row, monthly_tax[index])
+            }
+            for index, row in enumerate(pending[start:start + batch_size], start)
+        ]
+        session.execute(payslips.insert(), batch)
+        run.processed_employees += len(batch)
+        session.commit()
+        logger.info(
+            f"Payroll run {run.id}: {run.processed_employees}/{run.total_employees} payslips"
+        )
+
+    run.status = "completed"
+    run.error = None
+    run.completed_at = datetime.utcnow()
+    session.commit()
+
+
+if __name__ == "__main__":
+    import sys
+
+    year, month = int(sys.argv[1]), int(sys.argv[2])
+    with SessionLocal() as session:
+        run = session.scalar(select(models.PayrollRun).where(
+            models.PayrollRun.year == year,
+            models.PayrollRun.month == month
+        ))
+        if not run:
+            run = models.PayrollRun(id=str(uuid.uuid4()), year=year, month=month, status="pending")
+            session.add(run)
+            session.commit()
+        claimed = session.execute(claim_statement(run.id)).rowcount
+        session.commit()
+        run_id = run.id
+    if not claimed:
+        sys.exit(f"Payroll run {run_id} for {year}-{month:02d} is already running")
+    run_payroll(run_id)
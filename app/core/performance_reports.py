@@ -0,0 +1,147 @@
+# app/core/performance_reports.py
+from sqlalchemy import select, func, case, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, timedelta
+from typing import Optional
+
+from app.db import models
+
+RATING_SCALE = range(1, 6)
+COMPLETED_REVIEW_STATUSES = ("submitted", "approved")
+
+
+def _rating_filters(
+    period_start: Optional[date],
+    period_end: Optional[date],
+    department_id: Optional[str]
+):
+    """Conditions on ratings joined to their user"""
+    filters = []
+    if period_start:
+        filters.append(models.PerformanceRating.period_start >= period_start)
+    if period_end:
+        filters.append(models.PerformanceRating.period_end <= period_end)
+    if department_id:
+        filters.append(models.User.department_id == department_id)
+    return filters
+
+
+def _aggregate_filters(period_start: Optional[date], period_end: Optional[date]):
+    filters = []
+    if period_start:
+        filters.append(models.RatingAggregate.period_start >= period_start)
+    if period_end:
+        filters.append(models.RatingAggregate.period_end <= period_end)
+    return filters
+
+
+async def build_performance_report(
+    db: AsyncSession,
+    period_start: Optional[date] = None,
+    period_end: Optional[date] = None,
+    department_id: Optional[str] = None,
+    top_n: int = 5
+) -> dict:
+    """
+    Aggregate ratings and reviews in the database.
+
+    Means and top performers are read from rating_aggregates, so they cost
+    one row per department or user and period rather than one per rating.
+    The distribution over the 1-5 scale and the review completion rate are
+    single grouped queries.
+    """
+    aggregate = models.RatingAggregate
+    aggregate_filters = _aggregate_filters(period_start, period_end)
+
+    rating = models.PerformanceRating
+    bucket = func.round(rating.rating, 0)
+    distribution_rows = (await db.execute(
+        select(bucket, func.count())
+        .select_from(rating)
+        .join(models.User, models.User.id == rating.user_id)
+        .where(*_rating_filters(period_start, period_end, department_id))
+        .group_by(bucket)
+    )).all()
+    rating_distribution = {value: 0 for value in RATING_SCALE}
+    for value, count in distribution_rows:
+        rating_distribution[int(value)] = count
+
+    if department_id:
+        overall_scope = (aggregate.scope == "department", aggregate.scope_id == department_id)
+    else:
+        overall_scope = (aggregate.scope == "company",)
+    total_count, total_sum = (await db.execute(
+        select(func.sum(aggregate.rating_count), func.sum(aggregate.rating_sum))
+        .where(*overall_scope, *aggregate_filters)
+    )).one()
+
+    # Department means; departments without ratings report 0
+    department_rows = (await db.execute(
+        select(
+            models.Department.name,
+            func.sum(aggregate.rating_count),
+            func.sum(aggregate.rating_sum)
+        )
+        .outerjoin(aggregate, and_(
+            aggregate.scope == "department",
+            aggregate.scope_id == models.Department.id,
+            *aggregate_filters
+        ))
+        .where(*([models.Department.id == department_id] if department_id else []))
+        .group_by(models.Department.id, models.Department.name)
+    )).all()
+    department_averages = {
+        name: rating_sum / count if count else 0
+        for name, count, rating_sum in department_rows
+    }
+
+    average = func.sum(aggregate.rating_sum) / func.sum(aggregate.rating_count)
+    top_rows = (await db.execute(
+        select(models.User.id, models.User.first_name, models.User.last_name, average)
+        .join(aggregate, and_(aggregate.scope == "user", aggregate.scope_id == models.User.id))
+        .where(
+            *aggregate_filters,
+            *([models.User.department_id == department_id] if department_id else [])
+        )
+        .group_by(models.User.id, models.User.first_name, models.User.last_name)
+        .having(func.sum(aggregate.rating_count) > 0)
+        .order_by(average.desc(), models.User.id)
+        .limit(top_n)
+    )).all()
+    top_performers = [
+        {
+            "id": user_id,
+            "name": f"{first_name} {last_name}",
+            "average_rating": average_rating
+        }
+        for user_id, first_name, last_name, average_rating in top_rows
+    ]
+
+    # Share of reviews created in the period that were submitted or approved
+    review_filters = []
+    if period_start:
+        review_filters.append(models.PerformanceReview.created_at >= period_start)
+    if period_end:
+        review_filters.append(models.PerformanceReview.created_at < period_end + timedelta(days=1))
+    if department_id:
+        review_filters.append(models.User.department_id == department_id)
+    total_reviews, completed_reviews = (await db.execute(
+        select(
+            func.count(),
+            func.sum(case(
+                (models.PerformanceReview.status.in_(COMPLETED_REVIEW_STATUSES), 1),
+                else_=0
+            ))
+        )
+        .select_from(models.PerformanceReview)
+        .join(models.User, models.User.id == models.PerformanceReview.user_id)
+        .where(*review_filters)
+    )).one()
+
+    return {
+        "average_rating": total_sum / total_count if total_count else 0,
+        "rating_distribution": rating_distribution,
+        "review_completion_rate": (completed_reviews or 0) / total_reviews if total_reviews else 0,
+        "department_averages": department_averages,
+        "top_performers": top_performers
+    }
@@ -0,0 +1,87 @@
+# app/core/principal_cache.py
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import NamedTuple, Optional
+import time
+
+from app.core.config import settings
+
+
+class RoleRef(NamedTuple):
+    name: Optional[str]
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable snapshot of the authenticated user used for permission checks"""
+    id: str
+    is_active: bool
+    role_name: Optional[str]
+    department_id: Optional[str]
+    manager_id: Optional[str]
+
+    @property
+    def role(self) -> RoleRef:
+        # Keeps `current_user.role.name` working in the routers
+        return RoleRef(self.role_name)
+
+
+class PrincipalCache:
+    """
+    In-process LRU cache of principals keyed by the JWT `sub` claim.
+
+    Entries expire after `ttl` seconds, which also bounds how stale a
+    principal can get on other workers that did not see the invalidation.
+    """
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, user_id: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, principal: Principal) -> None:
+        with self._lock:
+            self._entries[principal.id] = (principal, time.monotonic() + self.ttl)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl
+            }
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE
+)
@@ -0,0 +1,122 @@
+# app/core/rating_aggregates.py
+from sqlalchemy import select, insert, update, delete, func, literal
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from datetime import datetime
+
+from app.db import models
+
+COMPANY_SCOPE_ID = ""
+
+
+def _category(category):
+    return category or ""
+
+
+def _insert_aggregate(session: Session, statement) -> bool:
+    """
+    Run the INSERT in a savepoint, so a unique key violation rolls back only
+    the savepoint and the caller's transaction can still take the UPDATE
+    """
+    try:
+        with session.begin_nested():
+            session.execute(statement)
+    except IntegrityError:
+        return False
+    return True
+
+
+async def apply_rating_delta(db: AsyncSession, rating: models.PerformanceRating, sign: int):
+    """
+    Add (sign=1) or remove (sign=-1) a rating from the user, department and
+    company aggregates, inside the caller's transaction.
+
+    The department is the user's department at the time of the write; run
+    rebuild_rating_aggregates after moving people between departments.
+    """
+    aggregate = models.RatingAggregate
+    department_id = await db.scalar(
+        select(models.User.department_id).where(models.User.id == rating.user_id)
+    )
+    scopes = [("company", COMPANY_SCOPE_ID), ("user", rating.user_id)]
+    if department_id:
+        scopes.append(("department", department_id))
+
+    key = {
+        "category": _category(rating.category),
+        "period_start": rating.period_start,
+        "period_end": rating.period_end
+    }
+    for scope, scope_id in scopes:
+        where = (
+            aggregate.scope == scope,
+            aggregate.scope_id == scope_id,
+            aggregate.category == key["category"],
+            aggregate.period_start == key["period_start"],
+            aggregate.period_end == key["period_end"]
+        )
+        increment = update(aggregate).where(*where).values(
+            rating_count=aggregate.rating_count + sign,
+            rating_sum=aggregate.rating_sum + sign * rating.rating,
+            rating_sum_squares=aggregate.rating_sum_squares + sign * rating.rating ** 2,
+            updated_at=datetime.utcnow()
+        )
+        if (await db.execute(increment)).rowcount or sign < 0:
+            continue
+        created = await db.run_sync(_insert_aggregate, insert(aggregate).values(
+            scope=scope,
+            scope_id=scope_id,
+            rating_count=1,
+            rating_sum=rating.rating,
+            rating_sum_squares=rating.rating ** 2,
+            updated_at=datetime.utcnow(),
+            **key
+        ))
+        if not created:
+            # A concurrent writer created the row first
+            await db.execute(increment)
+
+
+def rebuild_rating_aggregates(session: Session) -> int:
+    """Recompute every aggregate from performance_ratings; the caller commits"""
+    aggregate = models.RatingAggregate
+    rating = models.PerformanceRating
+    category = func.coalesce(rating.category, "")
+    columns = [
+        aggregate.scope, aggregate.scope_id, aggregate.category,
+        aggregate.period_start, aggregate.period_end, aggregate.rating_count,
+        aggregate.rating_sum, aggregate.rating_sum_squares, aggregate.updated_at
+    ]
+    measures = (
+        func.count(), func.sum(rating.rating), func.sum(rating.rating * rating.rating),
+        literal(datetime.utcnow())
+    )
+
+    session.execute(delete(aggregate))
+    inserted = 0
+    grouping = (category, rating.period_start, rating.period_end)
+    for scope, scope_id, scope_grouping in (
+        ("company", literal(COMPANY_SCOPE_ID), ()),
+        ("user", rating.user_id, (rating.user_id,)),
+        ("department", models.User.department_id, (models.User.department_id,))
+    ):
+        query = (
+            select(literal(scope), scope_id, *grouping, *measures)
+            .select_from(rating)
+            .join(models.User, models.User.id == rating.user_id)
+            .group_by(*scope_grouping, *grouping)
+        )
+        if scope == "department":
+            query = query.where(models.User.department_id.isnot(None))
+        inserted += session.execute(insert(aggregate).from_select(columns, query)).rowcount
+    return inserted
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as session:
+        rows = rebuild_rating_aggregates(session)
+        session.commit()
+    print(f"Rebuilt {rows} rating aggregate rows")
@@ -1,6 +1,9 @@
 # app/core/security.py
 from datetime import datetime, timedelta
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 from jose import jwt
 
@@ -17,6 +20,78 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 
+class PasswordHashingPool:
+    """
+    Runs bcrypt on a dedicated, size-capped thread pool so hashing never
+    blocks the event loop. Callers that cannot get a worker within
+    `max_wait` seconds are rejected with a 503 instead of queueing forever.
+    """
+
+    def __init__(self, workers: int, max_wait: float):
+        self.workers = workers
+        self.max_wait = max_wait
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = None
+
+    async def run(self, fn, *args):
+        # Created lazily so the semaphore belongs to the serving event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy, please try again",
+                headers={"Retry-After": "1"}
+            )
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "max_wait_seconds": self.max_wait
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+password_hashing_pool = PasswordHashingPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_wait=settings.PASSWORD_HASH_MAX_WAIT_SECONDS
+)
+
+
+async def verify_password_async(plain_password, hashed_password):
+    return await password_hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password):
+    return await password_hashing_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -25,4 +100,4 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
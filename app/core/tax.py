@@ -0,0 +1,113 @@
+# app/core/tax.py
+from dataclasses import dataclass
+from typing import List, Optional
+import numpy as np
+
+from app.core.config import settings
+
+REGIMES = ("old", "new")
+
+# Income tax slabs as (lower bounds, marginal rates), annual INR
+SLABS = {
+    "old": (
+        np.array([0, 250_000, 500_000, 1_000_000], dtype=np.float64),
+        np.array([0.0, 0.05, 0.20, 0.30])
+    ),
+    "new": (
+        np.array([0, 400_000, 800_000, 1_200_000, 1_600_000, 2_000_000, 2_400_000], dtype=np.float64),
+        np.array([0.0, 0.05, 0.10, 0.15, 0.20, 0.25, 0.30])
+    )
+}
+STANDARD_DEDUCTION = {"old": 50_000, "new": 75_000}
+# Section 87A: full rebate up to the cap when taxable income is within the limit
+REBATE_LIMIT = {"old": 500_000, "new": 1_200_000}
+REBATE_CAP = {"old": 12_500, "new": 60_000}
+CESS_RATE = 0.04
+
+# Deductions honoured under the old regime and their annual caps (None = uncapped)
+DECLARATION_CAPS = {
+    "80C": 150_000,
+    "80CCD_1B": 50_000,
+    "80D": 25_000,
+    "24B": 200_000,
+    "HRA": None
+}
+
+
+@dataclass
+class TaxComputation:
+    """Annual liabilities under both regimes, one element per employee"""
+    annual_income: np.ndarray
+    old_regime: np.ndarray
+    new_regime: np.ndarray
+    regime: np.ndarray
+
+    @property
+    def liability(self) -> np.ndarray:
+        """Annual tax under each employee's chosen regime"""
+        return np.where(self.regime == "old", self.old_regime, self.new_regime)
+
+    @property
+    def monthly_liability(self) -> np.ndarray:
+        return np.round(self.liability / 12, 2)
+
+
+def parse_declarations(declarations: List[Optional[dict]]) -> np.ndarray:
+    """Total capped old-regime deductions per employee from TaxInfo.tax_declarations"""
+    columns = list(DECLARATION_CAPS)
+    amounts = np.zeros((len(declarations), len(columns)))
+    for row, declared in enumerate(declarations):
+        # tax_declarations is free-form JSON; anything but an object declares nothing
+        if not isinstance(declared, dict):
+            continue
+        for section, value in declared.items():
+            if section in DECLARATION_CAPS:
+                try:
+                    amounts[row, columns.index(section)] = float(value)
+                except (TypeError, ValueError):
+                    continue
+    caps = np.array([np.inf if cap is None else cap for cap in DECLARATION_CAPS.values()])
+    return np.minimum(np.clip(amounts, 0, None), caps).sum(axis=1)
+
+
+def slab_tax(taxable: np.ndarray, regime: str) -> np.ndarray:
+    """Slab tax with 87A rebate and cess for an array of taxable incomes"""
+    lower, rates = SLABS[regime]
+    widths = np.diff(np.append(lower, np.inf))
+    # Income falling in each slab, shape (employees, slabs)
+    in_slab = np.clip(taxable[:, None] - lower[None, :], 0, widths[None, :])
+    tax = in_slab @ rates
+    tax = np.where(
+        taxable <= REBATE_LIMIT[regime],
+        np.maximum(tax - REBATE_CAP[regime], 0),
+        tax
+    )
+    return np.round(tax * (1 + CESS_RATE), 2)
+
+
+def compute_tax(
+    monthly_gross: np.ndarray,
+    declarations: List[Optional[dict]],
+    regimes: List[Optional[str]]
+) -> TaxComputation:
+    """
+    Compute old and new regime liabilities for a whole population at once.
+
+    `monthly_gross` is annualised; declarations only reduce old-regime
+    income. Employees without a valid regime get TAX_DEFAULT_REGIME.
+    """
+    annual_income = np.asarray(monthly_gross, dtype=np.float64) * 12
+    deductions = parse_declarations(declarations)
+
+    old_taxable = np.maximum(annual_income - STANDARD_DEDUCTION["old"] - deductions, 0)
+    new_taxable = np.maximum(annual_income - STANDARD_DEDUCTION["new"], 0)
+
+    regime = np.array([
+        value if value in REGIMES else settings.TAX_DEFAULT_REGIME for value in regimes
+    ], dtype=object)
+    return TaxComputation(
+        annual_income=annual_income,
+        old_regime=slab_tax(old_taxable, "old"),
+        new_regime=slab_tax(new_taxable, "new"),
+        regime=regime
+    )
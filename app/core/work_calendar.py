@@ -0,0 +1,121 @@
+# app/core/work_calendar.py
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from collections import defaultdict
+from datetime import date
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+import time
+import numpy as np
+
+from app.core.config import settings
+from app.db import models
+
+
+class WorkCalendarCache:
+    """
+    Compiled numpy business-day calendars keyed by (department_id, year).
+
+    A department's calendar combines company-wide holidays (department_id
+    NULL) with its own. Entries expire after `ttl` seconds so holiday edits
+    made through another worker are eventually picked up.
+    """
+
+    def __init__(self, weekmask: str, ttl: int):
+        self.weekmask = weekmask
+        self.ttl = ttl
+        self._calendars = {}
+        self._lock = Lock()
+
+    def get(self, department_id: Optional[str], year: int) -> Optional[np.busdaycalendar]:
+        with self._lock:
+            entry = self._calendars.get((department_id, year))
+            if entry is None or entry[1] < time.monotonic():
+                return None
+            return entry[0]
+
+    def set(self, department_id: Optional[str], year: int, holidays: Sequence[date]) -> np.busdaycalendar:
+        calendar = np.busdaycalendar(
+            weekmask=self.weekmask,
+            holidays=np.array(sorted(holidays), dtype="datetime64[D]")
+        )
+        with self._lock:
+            self._calendars[(department_id, year)] = (calendar, time.monotonic() + self.ttl)
+        return calendar
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._calendars.clear()
+
+
+work_calendar_cache = WorkCalendarCache(
+    weekmask=settings.WORK_WEEK_MASK,
+    ttl=settings.WORK_CALENDAR_TTL_SECONDS
+)
+
+
+async def get_calendar(db: AsyncSession, department_id: Optional[str], year: int) -> np.busdaycalendar:
+    calendar = work_calendar_cache.get(department_id, year)
+    if calendar is None:
+        holidays = (await db.scalars(select(models.Holiday.date).where(
+            models.Holiday.date >= date(year, 1, 1),
+            models.Holiday.date < date(year + 1, 1, 1),
+            or_(
+                models.Holiday.department_id.is_(None),
+                models.Holiday.department_id == department_id
+            )
+        ))).all()
+        calendar = work_calendar_cache.set(department_id, year, holidays)
+    return calendar
+
+
+async def count_working_days(
+    db: AsyncSession,
+    department_id: Optional[str],
+    start_dates: Sequence[date],
+    end_dates: Sequence[date]
+) -> np.ndarray:
+    """
+    Working days in each inclusive [start, end] range for one department,
+    with one numpy.busday_count call per calendar year spanned by the batch.
+    """
+    starts = np.array(start_dates, dtype="datetime64[D]")
+    ends = np.array(end_dates, dtype="datetime64[D]") + np.timedelta64(1, "D")
+    counts = np.zeros(len(starts), dtype=np.int64)
+    if not len(starts):
+        return counts
+
+    first_year = starts.min().astype(object).year
+    last_year = (ends.max() - np.timedelta64(1, "D")).astype(object).year
+    for year in range(first_year, last_year + 1):
+        year_start = np.datetime64(f"{year:04d}-01-01")
+        year_end = np.datetime64(f"{year + 1:04d}-01-01")
+        begin = np.maximum(starts, year_start)
+        end = np.minimum(ends, year_end)
+        in_year = begin < end
+        if in_year.any():
+            calendar = await get_calendar(db, department_id, year)
+            counts[in_year] += np.busday_count(begin[in_year], end[in_year], busdaycal=calendar)
+    return counts
+
+
+async def count_leave_working_days(
+    db: AsyncSession,
+    ranges: List[Tuple[Optional[str], date, date]]
+) -> List[int]:
+    """Working days for (department_id, start, end) ranges, batched per department"""
+    by_department: Dict[Optional[str], List[int]] = defaultdict(list)
+    for index, (department_id, _, _) in enumerate(ranges):
+        by_department[department_id].append(index)
+
+    result = [0] * len(ranges)
+    for department_id, indexes in by_department.items():
+        counts = await count_working_days(
+            db,
+            department_id,
+            [ranges[index][1] for index in indexes],
+            [ranges[index][2] for index in indexes]
+        )
+        for index, count in zip(indexes, counts.tolist()):
+            result[index] = count
+    return result
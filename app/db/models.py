@@ -1,5 +1,5 @@
 # app/db/models.py
-from sqlalchemy import Column, String, ForeignKey, Date, Boolean, DateTime, Integer, Float, JSON
+from sqlalchemy import Column, String, ForeignKey, Date, Boolean, DateTime, Integer, Float, JSON, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -8,6 +8,11 @@ Base = declarative_base()
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_manager_id", "manager_id"),
+        Index("ix_users_department_id", "department_id"),
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)  # UUID length
     first_name = Column(String(100), nullable=False)
@@ -85,6 +90,11 @@ class RolePermission(Base):
 
 class Leave(Base):
     __tablename__ = "leaves"
+    __table_args__ = (
+        Index("ix_leaves_user_id_start_date_end_date", "user_id", "start_date", "end_date"),
+        Index("ix_leaves_status_start_date", "status", "start_date", mssql_include=["end_date", "user_id"]),
+        Index("ix_leaves_created_at_id", "created_at", "id"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
@@ -93,6 +103,8 @@ class Leave(Base):
     end_date = Column(Date, nullable=False)
     status = Column(String(20), default="pending")  # pending, approved, rejected
     reason = Column(String(500))
+    days = Column(Integer)  # days charged to the leave balance
+    comment = Column(String(500))  # reviewer's comment, e.g. rejection reason
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     leave_type_id = Column(String(36), ForeignKey("leave_types.id"), nullable=False)
@@ -103,6 +115,11 @@ class Leave(Base):
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (
+        UniqueConstraint("user_id", "date", name="uq_attendance_user_id_date"),
+        Index("ix_attendance_date", "date", mssql_include=["user_id", "status"]),
+        Index("ix_attendance_created_at_id", "created_at", "id"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
@@ -110,7 +127,8 @@ class Attendance(Base):
     check_in = Column(DateTime)
     check_out = Column(DateTime)
     status = Column(String(20))  # present, absent, half-day
-    work_hours = Column(String(20))
+    work_hours = Column(String(20))  # "H:MM", kept for existing clients
+    work_minutes = Column(Integer)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -118,6 +136,44 @@ class Attendance(Base):
     user = relationship("User", back_populates="attendance")
 
 
+class AttendanceArchive(Base):
+    """Attendance rows older than the hot horizon, moved here by app.core.attendance_archive"""
+    __tablename__ = "attendance_archive"
+    __table_args__ = (
+        UniqueConstraint("user_id", "date", name="uq_attendance_archive_user_id_date"),
+        Index("ix_attendance_archive_date", "date", mssql_include=["user_id", "status"]),
+        Index("ix_attendance_archive_created_at_id", "created_at", "id"),
+    )
+
+    id = Column(String(36), primary_key=True)
+    user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    check_in = Column(DateTime)
+    check_out = Column(DateTime)
+    status = Column(String(20))
+    work_hours = Column(String(20))
+    work_minutes = Column(Integer)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+
+
+class AttendanceRollup(Base):
+    """Monthly attendance counts per user, maintained on every attendance write"""
+    __tablename__ = "attendance_rollups"
+    __table_args__ = (
+        Index("ix_attendance_rollups_year_month", "year", "month"),
+    )
+
+    user_id = Column(String(36), ForeignKey("users.id"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    present_days = Column(Integer, nullable=False, default=0)
+    absent_days = Column(Integer, nullable=False, default=0)
+    half_days = Column(Integer, nullable=False, default=0)
+    total_minutes = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class LeaveType(Base):
     __tablename__ = "leave_types"
 
@@ -125,6 +181,7 @@ class LeaveType(Base):
     name = Column(String(100), nullable=False)
     description = Column(String(500))
     default_days = Column(Integer, default=0)
+    max_carry_forward_days = Column(Integer, default=0)  # unused days carried into the next year
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -134,6 +191,9 @@ class LeaveType(Base):
 
 class LeaveBalance(Base):
     __tablename__ = "leave_balances"
+    __table_args__ = (
+        UniqueConstraint("user_id", "leave_type_id", "year", name="uq_leave_balances_user_id_leave_type_id_year"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
@@ -141,6 +201,7 @@ class LeaveBalance(Base):
     year = Column(Integer, nullable=False)
     total_days = Column(Integer, default=0)
     used_days = Column(Integer, default=0)
+    reserved_days = Column(Integer, default=0)  # held by pending leaves
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -148,9 +209,39 @@ class LeaveBalance(Base):
     user = relationship("User", back_populates="leave_balances")
     leave_type = relationship("LeaveType")
 
+class LeaveAccrualRun(Base):
+    __tablename__ = "leave_accrual_runs"
+
+    id = Column(String(36), primary_key=True, index=True)
+    year = Column(Integer, nullable=False, unique=True)
+    status = Column(String(20), default="pending")  # pending, running, completed, failed
+    users_processed = Column(Integer, default=0)
+    balances_created = Column(Integer, default=0)
+    last_user_id = Column(String(36))  # resume point: last user of the last committed chunk
+    error = Column(String(1000))
+    started_by = Column(String(36), ForeignKey("users.id"))
+    started_at = Column(DateTime)
+    completed_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 # Update User model to include leave balances
 User.leave_balances = relationship("LeaveBalance", back_populates="user")
 
+class Holiday(Base):
+    __tablename__ = "holidays"
+    __table_args__ = (
+        UniqueConstraint("department_id", "date", name="uq_holidays_department_id_date"),
+        Index("ix_holidays_date", "date"),
+    )
+
+    id = Column(String(36), primary_key=True, index=True)
+    date = Column(Date, nullable=False)
+    name = Column(String(100), nullable=False)
+    department_id = Column(String(36), ForeignKey("departments.id"))  # NULL = company-wide
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 
 
 
@@ -159,6 +250,9 @@ User.leave_balances = relationship("LeaveBalance", back_populates="user")
 
 class Salary(Base):
     __tablename__ = "salaries"
+    __table_args__ = (
+        Index("ix_salaries_user_id_effective_date", "user_id", "effective_date"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
@@ -176,6 +270,9 @@ class Salary(Base):
 
 class Payslip(Base):
     __tablename__ = "payslips"
+    __table_args__ = (
+        UniqueConstraint("user_id", "year", "month", name="uq_payslips_user_id_year_month"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
@@ -195,6 +292,25 @@ class Payslip(Base):
     # Relationships
     user = relationship("User", back_populates="payslips")
 
+class PayrollRun(Base):
+    __tablename__ = "payroll_runs"
+    __table_args__ = (
+        UniqueConstraint("year", "month", name="uq_payroll_runs_year_month"),
+    )
+
+    id = Column(String(36), primary_key=True, index=True)
+    month = Column(Integer, nullable=False)
+    year = Column(Integer, nullable=False)
+    status = Column(String(20), default="pending")  # pending, running, completed, failed
+    total_employees = Column(Integer, default=0)
+    processed_employees = Column(Integer, default=0)
+    error = Column(String(1000))
+    started_by = Column(String(36), ForeignKey("users.id"))
+    started_at = Column(DateTime)
+    completed_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class TaxInfo(Base):
     __tablename__ = "tax_info"
 
@@ -232,6 +348,9 @@ class Course(Base):
 
 class CourseEnrollment(Base):
     __tablename__ = "course_enrollments"
+    __table_args__ = (
+        Index("ix_course_enrollments_user_id", "user_id"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
@@ -267,6 +386,9 @@ class CertificationType(Base):
 
 class EmployeeCertification(Base):
     __tablename__ = "employee_certifications"
+    __table_args__ = (
+        Index("ix_employee_certifications_user_id", "user_id"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
@@ -321,6 +443,9 @@ class OffboardingTask(Base):
 
 class EmployeeOnboarding(Base):
     __tablename__ = "employee_onboarding"
+    __table_args__ = (
+        Index("ix_employee_onboarding_user_id", "user_id"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
@@ -337,6 +462,9 @@ class EmployeeOnboarding(Base):
 
 class EmployeeOffboarding(Base):
     __tablename__ = "employee_offboarding"
+    __table_args__ = (
+        Index("ix_employee_offboarding_user_id", "user_id"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
@@ -375,6 +503,9 @@ class Policy(Base):
 
 class PolicyAcknowledgment(Base):
     __tablename__ = "policy_acknowledgments"
+    __table_args__ = (
+        Index("ix_policy_acknowledgments_user_id_policy_id", "user_id", "policy_id"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
@@ -408,6 +539,9 @@ class Benefit(Base):
 
 class EmployeeBenefit(Base):
     __tablename__ = "employee_benefits"
+    __table_args__ = (
+        Index("ix_employee_benefits_user_id", "user_id"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
@@ -429,6 +563,9 @@ User.benefits = relationship("EmployeeBenefit", back_populates="user")
 
 class PerformanceRating(Base):
     __tablename__ = "performance_ratings"
+    __table_args__ = (
+        Index("ix_performance_ratings_user_id", "user_id"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
@@ -447,6 +584,9 @@ class PerformanceRating(Base):
 
 class PerformanceReview(Base):
     __tablename__ = "performance_reviews"
+    __table_args__ = (
+        Index("ix_performance_reviews_user_id", "user_id"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
@@ -470,6 +610,20 @@ class PerformanceReview(Base):
 User.ratings = relationship("PerformanceRating", foreign_keys=[PerformanceRating.user_id], back_populates="user")
 User.reviews = relationship("PerformanceReview", foreign_keys=[PerformanceReview.user_id], back_populates="user")
 
+class RatingAggregate(Base):
+    """Running count, sum and sum of squares of ratings, maintained on every rating write"""
+    __tablename__ = "rating_aggregates"
+
+    scope = Column(String(20), primary_key=True)  # user, department, company
+    scope_id = Column(String(36), primary_key=True)  # user or department id, "" for company
+    category = Column(String(50), primary_key=True)  # "" when the rating has no category
+    period_start = Column(Date, primary_key=True)
+    period_end = Column(Date, primary_key=True)
+    rating_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Float, nullable=False, default=0)
+    rating_sum_squares = Column(Float, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 
 
 
@@ -493,6 +647,9 @@ class Project(Base):
 
 class ProjectAssignment(Base):
     __tablename__ = "project_assignments"
+    __table_args__ = (
+        Index("ix_project_assignments_user_id_project_id_status", "user_id", "project_id", "status"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     project_id = Column(String(36), ForeignKey("projects.id"), nullable=False)
@@ -2,6 +2,10 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import CursorResult, FrozenResult
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
 import pyodbc
 import urllib
 
@@ -18,18 +22,132 @@ params = urllib.parse.quote_plus(
 
 engine = create_engine(
     f"mssql+pyodbc:///?odbc_connect={params}",
+    fast_executemany=True,
     pool_pre_ping=True,
     pool_recycle=3600,
-    pool_size=10,
-    max_overflow=20
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine, only built when DB_ASYNC is enabled so aioodbc stays optional
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    async_engine = create_async_engine(
+        f"mssql+aioodbc:///?odbc_connect={params}",
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+class ThreadedStreamResult:
+    """Server-side cursor of a ThreadedSession, fetched one partition per threadpool call"""
+
+    def __init__(self, result):
+        self.sync_result = result
+
+    async def partitions(self, size=None):
+        partitions = self.sync_result.partitions(size)
+        while True:
+            partition = await run_in_threadpool(next, partitions, None)
+            if partition is None:
+                return
+            yield partition
+
+    async def close(self):
+        await run_in_threadpool(self.sync_result.close)
+
+
+class ThreadedSession:
+    """
+    Awaitable facade over a sync Session used when DB_ASYNC is disabled.
+
+    Exposes the subset of the AsyncSession API the routers rely on and runs
+    every database call in the threadpool, so handlers never block the
+    event loop on pyodbc I/O.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, params=None, **kwargs):
+        def _execute():
+            result = self.sync_session.execute(statement, params, **kwargs)
+            # Buffer rows in the worker thread, like AsyncSession does;
+            # DML without RETURNING has only a rowcount to hand back
+            if isinstance(result, CursorResult) and not result.returns_rows:
+                return result
+            return result.freeze()
+        result = await run_in_threadpool(_execute)
+        return result() if isinstance(result, FrozenResult) else result
+
+    async def stream(self, statement, params=None, **kwargs):
+        result = await run_in_threadpool(
+            self.sync_session.execute,
+            statement.execution_options(stream_results=True),
+            params,
+            **kwargs
+        )
+        return ThreadedStreamResult(result)
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, params, **kwargs)
+
+    async def scalars(self, statement, params=None, **kwargs):
+        return (await self.execute(statement, params, **kwargs)).scalars()
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def refresh(self, instance, attribute_names=None):
+        await run_in_threadpool(self.sync_session.refresh, instance, attribute_names)
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self):
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+
 # Dependency to get DB session
-def get_db():
-    db = SessionLocal()
+async def get_db():
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    db = ThreadedSession(SessionLocal(expire_on_commit=False))
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        await db.close()
+
+
+# The same session outside dependency injection, for code that needs one
+# only on some paths
+db_session = asynccontextmanager(get_db)
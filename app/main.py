@@ -1,6 +1,7 @@
 # app/main.py
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from typing import List, Optional
 import os
@@ -8,8 +9,9 @@ from dotenv import load_dotenv
 
 from app.routers import users,auth
 from app.core.config import settings
-from app.core.security import create_access_token
-from app.db.session import engine
+from app.core.security import create_access_token, password_hashing_pool
+from app.core.attendance_buffer import checkin_buffer
+from app.db.session import engine, async_engine
 from app.db import models
 from app.routers import leaves
 from app.routers import salary
@@ -22,6 +24,7 @@ from app.routers import performance
 from app.routers import projects
 from app.routers import attendance
 from app.routers import departments
+from app.routers import exports
 
 
 # Load environment variables
@@ -33,7 +36,8 @@ models.Base.metadata.create_all(bind=engine)
 app = FastAPI(
     title="HRMS API",
     description="Human Resource Management System API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware setup
@@ -43,6 +47,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Link", "X-Next-Cursor"],
 )
 
 
@@ -61,6 +66,15 @@ app.include_router(performance.router, prefix="/api/v1", tags=["performance"])
 app.include_router(projects.router, prefix="/api/v1", tags=["projects"])
 app.include_router(attendance.router, prefix="/api/v1", tags=["attendance"])
 app.include_router(departments.router, prefix="/api/v1", tags=["departments"])
+app.include_router(exports.router, prefix="/api/v1", tags=["exports"])
+
+@app.on_event("shutdown")
+async def shutdown_resources():
+    # Flush buffered check-ins before the engines go away
+    await checkin_buffer.close()
+    password_hashing_pool.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 @app.get("/")
 def root():
@@ -1,63 +1,203 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import date, datetime
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date, datetime, timedelta
 import uuid
 
 from app.db.session import get_db
 from app.db import models
 from app.core.auth import get_current_user_with_permissions
+from app.core.pagination import KeysetPagination
+from app.core.serialization import trusted_response
+from app.core.attendance_buffer import checkin_buffer, DuplicateCheckIn, CheckInBufferClosed
+from app.core.attendance_archive import archive_cutoff, attendance_history, run_attendance_archive
+from app.core.attendance_rollups import (
+    rollup_deltas, add_attendance_delta, apply_attendance_deltas, rebuild_attendance_rollups
+)
 from app.schemas.attendance import (
     AttendanceCreate,
     AttendanceUpdate,
-    AttendanceResponse
+    AttendanceResponse,
+    AttendanceMonthlySummary
 )
 
 router = APIRouter()
 
+
+def _work_duration(work_minutes: int) -> dict:
+    """Integer minutes plus the legacy "H:MM" work_hours string"""
+    return {
+        "work_minutes": work_minutes,
+        "work_hours": f"{work_minutes // 60}:{work_minutes % 60:02d}"
+    }
+
+
 @router.post("/attendance", response_model=AttendanceResponse)
 async def mark_attendance(
     attendance: AttendanceCreate,
-    current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    current_user: models.User = Depends(get_current_user_with_permissions)
 ):
     """Mark attendance for the current day"""
-    # Check if attendance already exists for the day
-    existing_attendance = db.query(models.Attendance).filter(
-        models.Attendance.user_id == current_user.id,
-        models.Attendance.date == date.today()
-    ).first()
-    
-    if existing_attendance:
+    check_in = datetime.now()
+    row = {
+        "id": str(uuid.uuid4()),
+        "user_id": current_user.id,
+        "date": check_in.date(),
+        "check_in": check_in,
+        "status": "present",
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+
+    # Inserted by the write-behind buffer; the unique (user_id, date)
+    # constraint rejects a second check-in for the day
+    try:
+        return await checkin_buffer.submit(row)
+    except DuplicateCheckIn:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Attendance already marked for today"
         )
-    
-    new_attendance = models.Attendance(
-        id=str(uuid.uuid4()),
-        user_id=current_user.id,
-        date=date.today(),
-        check_in=datetime.now(),
-        status="present"
+    except CheckInBufferClosed:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is shutting down, please retry"
+        )
+
+@router.post("/attendance/check-out", response_model=AttendanceResponse)
+async def check_out(
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    """Check out of the open attendance record, from today or a shift that started yesterday"""
+    check_out_at = datetime.now()
+    attendance = await db.scalar(
+        select(models.Attendance)
+        .where(
+            models.Attendance.user_id == current_user.id,
+            models.Attendance.date >= check_out_at.date() - timedelta(days=1),
+            models.Attendance.check_in.is_not(None),
+            models.Attendance.check_out.is_(None)
+        )
+        .order_by(models.Attendance.date.desc())
+        .limit(1)
     )
-    
-    db.add(new_attendance)
-    db.commit()
-    db.refresh(new_attendance)
-    
-    return new_attendance
+
+    if not attendance:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No open check-in found"
+        )
+
+    work_minutes = max(int((check_out_at - attendance.check_in).total_seconds() // 60), 0)
+    # Conditional on check_out still being empty so racing requests check out once
+    result = await db.execute(
+        update(models.Attendance)
+        .where(models.Attendance.id == attendance.id, models.Attendance.check_out.is_(None))
+        .values(check_out=check_out_at, updated_at=datetime.utcnow(), **_work_duration(work_minutes))
+        .execution_options(synchronize_session="evaluate")
+    )
+    if result.rowcount != 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Already checked out"
+        )
+    deltas = rollup_deltas()
+    add_attendance_delta(deltas, attendance.user_id, attendance.date, None, work_minutes)
+    await db.run_sync(apply_attendance_deltas, deltas)
+    await db.commit()
+
+    return attendance
+
+@router.get("/attendance/summary", response_model=List[AttendanceMonthlySummary])
+async def attendance_summary(
+    year: int = Query(..., ge=2000, le=2100),
+    month: int = Query(..., ge=1, le=12),
+    department_id: Optional[str] = Query(None, description="Only this department's employees"),
+    manager_id: Optional[str] = Query(None, description="Only this manager's team"),
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    """Monthly attendance counts per employee, read from the maintained rollup"""
+    if current_user.role.name not in ["Admin", "HR", "Manager"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view attendance summaries"
+        )
+
+    rollup = models.AttendanceRollup
+    query = (
+        select(rollup, models.User.first_name, models.User.last_name, models.User.department_id)
+        .join(models.User, models.User.id == rollup.user_id)
+        .where(rollup.year == year, rollup.month == month)
+        .order_by(models.User.first_name, models.User.last_name, rollup.user_id)
+    )
+    # Managers only see their own team
+    if current_user.role.name == "Manager":
+        query = query.where(models.User.manager_id == current_user.id)
+    elif manager_id:
+        query = query.where(models.User.manager_id == manager_id)
+    if department_id:
+        query = query.where(models.User.department_id == department_id)
+
+    return [
+        AttendanceMonthlySummary(
+            user_id=row.user_id,
+            name=f"{first_name} {last_name}",
+            department_id=user_department_id,
+            year=row.year,
+            month=row.month,
+            present_days=row.present_days,
+            absent_days=row.absent_days,
+            half_days=row.half_days,
+            total_minutes=row.total_minutes
+        )
+        for row, first_name, last_name, user_department_id in (await db.execute(query)).all()
+    ]
+
+@router.post("/attendance/rollups/rebuild")
+async def rebuild_rollups(
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    """Recompute the monthly attendance rollup from the attendance table"""
+    if current_user.role.name != "Admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    rows = await db.run_sync(rebuild_attendance_rollups)
+    await db.commit()
+    return {"message": "Attendance rollups rebuilt successfully", "rows": rows}
+
+@router.post("/attendance/archive", status_code=status.HTTP_202_ACCEPTED)
+async def archive_old_attendance(
+    background_tasks: BackgroundTasks,
+    before: Optional[date] = Query(None, description="Archive rows dated before this day; defaults to the hot horizon"),
+    current_user: models.User = Depends(get_current_user_with_permissions)
+):
+    """Move attendance older than the hot horizon to the archive in the background"""
+    if current_user.role.name != "Admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    before = before or archive_cutoff()
+    background_tasks.add_task(run_attendance_archive, before)
+    return {"message": "Attendance archive started", "before": before}
 
 @router.get("/attendance/{attendance_id}", response_model=AttendanceResponse)
 async def get_attendance(
     attendance_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get attendance details by ID"""
-    attendance = db.query(models.Attendance).filter(
-        models.Attendance.id == attendance_id
-    ).first()
+    history = attendance_history()
+    attendance = await db.scalar(select(history).where(history.id == attendance_id))
     
     if not attendance:
         raise HTTPException(
@@ -79,7 +219,7 @@ async def update_attendance(
     attendance_id: str,
     attendance_update: AttendanceUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update attendance record"""
     if current_user.role.name not in ["Admin", "HR", "Manager"]:
@@ -88,9 +228,9 @@ async def update_attendance(
             detail="Not authorized to update attendance records"
         )
     
-    attendance = db.query(models.Attendance).filter(
+    attendance = await db.scalar(select(models.Attendance).where(
         models.Attendance.id == attendance_id
-    ).first()
+    ))
     
     if not attendance:
         raise HTTPException(
@@ -98,18 +238,41 @@ async def update_attendance(
             detail="Attendance record not found"
         )
     
-    for field, value in attendance_update.dict(exclude_unset=True).items():
+    values = attendance_update.dict(exclude_unset=True)
+    # Keep the duration in step with the check-out unless it is set explicitly
+    if values.get("work_minutes") is not None:
+        values.update(_work_duration(values["work_minutes"]))
+    elif values.get("check_out") and attendance.check_in:
+        values.update(_work_duration(max(
+            int((values["check_out"] - attendance.check_in).total_seconds() // 60), 0
+        )))
+    deltas = rollup_deltas()
+    add_attendance_delta(
+        deltas, attendance.user_id, attendance.date, attendance.status, attendance.work_minutes, -1
+    )
+    for field, value in values.items():
         setattr(attendance, field, value)
+    add_attendance_delta(
+        deltas, attendance.user_id, attendance.date, attendance.status, attendance.work_minutes
+    )
+    await db.run_sync(apply_attendance_deltas, deltas)
     
-    db.commit()
-    db.refresh(attendance)
+    await db.commit()
+    await db.refresh(attendance)
     
     return attendance
 
 @router.get("/attendance", response_model=List[AttendanceResponse])
 async def list_attendance(
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    pagination: KeysetPagination = Depends(),
+    from_date: Optional[date] = Query(None, description="Filter from date"),
+    to_date: Optional[date] = Query(None, description="Filter to date"),
+    user_id: Optional[str] = Query(None, description="Filter by employee"),
+    department_id: Optional[str] = Query(None, description="Filter by the employee's department"),
+    manager_id: Optional[str] = Query(None, description="Filter by the employee's manager"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by status")
 ):
     """List attendance records"""
     if current_user.role.name not in ["Admin", "HR", "Manager"]:
@@ -117,6 +280,35 @@ async def list_attendance(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to view all attendance records"
         )
-    
-    attendance = db.query(models.Attendance).all()
-    return attendance
\ No newline at end of file
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="from_date must not be after to_date"
+        )
+
+    # Archived history is read through the same query; date and user
+    # filters are served by the date and unique (user_id, date) indexes
+    attendance = attendance_history()
+    query = select(attendance)
+    if from_date:
+        query = query.where(attendance.date >= from_date)
+    if to_date:
+        query = query.where(attendance.date <= to_date)
+    if user_id:
+        query = query.where(attendance.user_id == user_id)
+    if status_filter:
+        query = query.where(attendance.status == status_filter)
+
+    # Managers can only see their team's attendance
+    if current_user.role.name == "Manager":
+        manager_id = current_user.id
+    if manager_id or department_id:
+        query = query.join(models.User, models.User.id == attendance.user_id)
+        if manager_id:
+            query = query.where(models.User.manager_id == manager_id)
+        if department_id:
+            query = query.where(models.User.department_id == department_id)
+
+    query = pagination.apply(query, attendance)
+    records = pagination.page((await db.scalars(query)).all())
+    return trusted_response(AttendanceResponse, records, pagination.response)
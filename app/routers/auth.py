@@ -1,11 +1,13 @@
 # app/routers/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
+from jose import JWTError, jwt
 import uuid
 
-from app.core.security import verify_password, create_access_token, get_password_hash
+from app.core.security import verify_password_async, create_access_token, get_password_hash_async
 from app.core.config import settings
 from app.db.session import get_db
 from app.db import models
@@ -23,15 +25,15 @@ from app.core.auth import get_current_user_with_permissions
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
         form_data: OAuth2PasswordRequestForm = Depends(),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     print(form_data)
     # Authenticate user
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
+    user = await db.scalar(select(models.User).where(models.User.email == form_data.username))
     print("-----------------")
     print(user)
     print("-----------------")
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -57,24 +59,24 @@ async def login_for_access_token(
 @router.post("/create-superuser", status_code=status.HTTP_201_CREATED)
 async def create_superuser(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # Check if any admin user exists
-    admin_role = db.query(models.Role).filter_by(name="Admin").first()
+    admin_role = await db.scalar(select(models.Role).filter_by(name="Admin"))
     if not admin_role:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Please run database initialization first"
         )
     
-    if db.query(models.User).filter_by(role_id=admin_role.id).first():
+    if await db.scalar(select(models.User).filter_by(role_id=admin_role.id).limit(1)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Superuser already exists"
         )
     
     # Create superuser
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     user = models.User(
         id=str(uuid.uuid4()),
         first_name=user_data.first_name,
@@ -88,8 +90,7 @@ async def create_superuser(
     )
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     
     return {"message": "Superuser created successfully"}
 
@@ -98,14 +99,14 @@ async def create_superuser(
 @router.post("/login", response_model=AuthResponse)
 async def login(
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Authenticate user and return JWT token"""
-    user = db.query(models.User).filter(
+    user = await db.scalar(select(models.User).where(
         models.User.email == login_data.email
-    ).first()
+    ))
 
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    if not user or not await verify_password_async(login_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -129,24 +130,24 @@ async def login(
         "token_type": "bearer",
         "user_id": user.id,
         "email": user.email,
-        "role": user.role.name
+        "role": await db.scalar(select(models.Role.name).where(models.Role.id == user.role_id))
     }
 
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     register_data: RegisterRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Register a new user"""
     # Check if user exists
-    if db.query(models.User).filter(models.User.email == register_data.email).first():
+    if await db.scalar(select(models.User.id).where(models.User.email == register_data.email)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
     # Get default role (Employee)
-    default_role = db.query(models.Role).filter(models.Role.name == "Employee").first()
+    default_role = await db.scalar(select(models.Role).where(models.Role.name == "Employee"))
     if not default_role:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -154,7 +155,7 @@ async def register(
         )
 
     # Create user
-    hashed_password = get_password_hash(register_data.password)
+    hashed_password = await get_password_hash_async(register_data.password)
     user = models.User(
         id=str(uuid.uuid4()),
         email=register_data.email,
@@ -168,8 +169,7 @@ async def register(
     )
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
 
     # Generate token
     access_token = create_access_token(data={"sub": user.id})
@@ -185,7 +185,7 @@ async def register(
 @router.post("/logout")
 async def logout(
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Log out user by invalidating JWT token"""
     # Note: JWT tokens are stateless, so we can't really "invalidate" them
@@ -197,10 +197,10 @@ async def logout(
 async def reset_password(
     reset_data: PasswordResetRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Initiate password reset process"""
-    user = db.query(models.User).filter(models.User.email == reset_data.email).first()
+    user = await db.scalar(select(models.User).where(models.User.email == reset_data.email))
     if not user:
         # Return success even if user doesn't exist to prevent email enumeration
         return {"message": "If your email is registered, you will receive a password reset link"}
@@ -219,7 +219,7 @@ async def reset_password(
 @router.post("/reset-password/confirm")
 async def reset_password_confirm(
     reset_data: PasswordResetConfirm,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Complete password reset process"""
     try:
@@ -236,15 +236,15 @@ async def reset_password_confirm(
             detail="Invalid or expired token"
         )
 
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = await db.scalar(select(models.User).where(models.User.id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
-    user.hashed_password = get_password_hash(reset_data.new_password)
-    db.commit()
+    user.hashed_password = await get_password_hash_async(reset_data.new_password)
+    await db.commit()
 
     return {"message": "Password has been reset successfully"}
 
@@ -252,16 +252,17 @@ async def reset_password_confirm(
 async def change_password(
     password_data: ChangePasswordRequest,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Change user password"""
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    user = await db.scalar(select(models.User).where(models.User.id == current_user.id))
+    if not await verify_password_async(password_data.current_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
         )
 
-    current_user.hashed_password = get_password_hash(password_data.new_password)
-    db.commit()
+    user.hashed_password = await get_password_hash_async(password_data.new_password)
+    await db.commit()
 
     return {"message": "Password changed successfully"}
\ No newline at end of file
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from datetime import datetime
 import uuid
@@ -17,11 +19,11 @@ router = APIRouter()
 @router.get("/benefits", response_model=List[BenefitResponse])
 async def list_benefits(
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    benefits = db.query(models.Benefit).filter(
+    benefits = (await db.scalars(select(models.Benefit).where(
         models.Benefit.is_active == True
-    ).all()
+    ))).all()
     return benefits
 
 @router.post("/employees/{employee_id}/benefits", response_model=EmployeeBenefitResponse)
@@ -29,7 +31,7 @@ async def assign_benefit(
     employee_id: str,
     benefit_data: EmployeeBenefitCreate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -44,8 +46,8 @@ async def assign_benefit(
     )
     
     db.add(employee_benefit)
-    db.commit()
-    db.refresh(employee_benefit)
+    await db.commit()
+    await db.refresh(employee_benefit, ["benefit"])
     return employee_benefit
 
 @router.put("/employees/{employee_id}/benefits/{benefit_id}", 
@@ -55,7 +57,7 @@ async def update_employee_benefit(
     benefit_id: str,
     benefit_data: EmployeeBenefitUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -63,10 +65,10 @@ async def update_employee_benefit(
             detail="Not enough permissions"
         )
 
-    benefit = db.query(models.EmployeeBenefit).filter(
+    benefit = await db.scalar(select(models.EmployeeBenefit).where(
         models.EmployeeBenefit.id == benefit_id,
         models.EmployeeBenefit.user_id == employee_id
-    ).first()
+    ))
     
     if not benefit:
         raise HTTPException(
@@ -77,8 +79,8 @@ async def update_employee_benefit(
     for key, value in benefit_data.dict(exclude_unset=True).items():
         setattr(benefit, key, value)
 
-    db.commit()
-    db.refresh(benefit)
+    await db.commit()
+    await db.refresh(benefit, ["benefit"])
     return benefit
 
 @router.delete("/employees/{employee_id}/benefits/{benefit_id}")
@@ -86,7 +88,7 @@ async def remove_employee_benefit(
     employee_id: str,
     benefit_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -94,10 +96,10 @@ async def remove_employee_benefit(
             detail="Not enough permissions"
         )
 
-    benefit = db.query(models.EmployeeBenefit).filter(
+    benefit = await db.scalar(select(models.EmployeeBenefit).where(
         models.EmployeeBenefit.id == benefit_id,
         models.EmployeeBenefit.user_id == employee_id
-    ).first()
+    ))
     
     if not benefit:
         raise HTTPException(
@@ -106,36 +108,38 @@ async def remove_employee_benefit(
         )
 
     benefit.status = "inactive"
-    db.commit()
+    await db.commit()
     return {"message": "Benefit removed successfully"}
 
 @router.get("/employees/{employee_id}/benefits", response_model=List[EmployeeBenefitResponse])
 async def list_employee_benefits(
     employee_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if (current_user.id != employee_id and 
         current_user.role.name not in ["Manager", "HR", "Admin"] and
-        not db.query(models.User).filter(
+        not await db.scalar(select(models.User.id).where(
             models.User.manager_id == current_user.id,
             models.User.id == employee_id
-        ).first()):
+        ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
 
-    benefits = db.query(models.EmployeeBenefit).filter(
+    benefits = (await db.scalars(select(models.EmployeeBenefit).options(
+        selectinload(models.EmployeeBenefit.benefit)
+    ).where(
         models.EmployeeBenefit.user_id == employee_id
-    ).all()
+    ))).all()
     return benefits
 
 @router.post("/benefits", response_model=BenefitResponse)
 async def create_benefit(
     benefit_data: BenefitCreate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -149,8 +153,8 @@ async def create_benefit(
     )
     
     db.add(benefit)
-    db.commit()
-    db.refresh(benefit)
+    await db.commit()
+    await db.refresh(benefit)
     return benefit
 
 @router.put("/benefits/{benefit_id}", response_model=BenefitResponse)
@@ -158,7 +162,7 @@ async def update_benefit_details(
     benefit_id: str,
     benefit_data: BenefitUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -166,9 +170,9 @@ async def update_benefit_details(
             detail="Not enough permissions"
         )
 
-    benefit = db.query(models.Benefit).filter(
+    benefit = await db.scalar(select(models.Benefit).where(
         models.Benefit.id == benefit_id
-    ).first()
+    ))
     
     if not benefit:
         raise HTTPException(
@@ -179,15 +183,15 @@ async def update_benefit_details(
     for key, value in benefit_data.dict(exclude_unset=True).items():
         setattr(benefit, key, value)
 
-    db.commit()
-    db.refresh(benefit)
+    await db.commit()
+    await db.refresh(benefit)
     return benefit
 
 @router.delete("/benefits/{benefit_id}")
 async def delete_benefit(
     benefit_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -195,9 +199,9 @@ async def delete_benefit(
             detail="Not enough permissions"
         )
 
-    benefit = db.query(models.Benefit).filter(
+    benefit = await db.scalar(select(models.Benefit).where(
         models.Benefit.id == benefit_id
-    ).first()
+    ))
     
     if not benefit:
         raise HTTPException(
@@ -206,5 +210,5 @@ async def delete_benefit(
         )
 
     benefit.is_active = False
-    db.commit()
+    await db.commit()
     return {"message": "Benefit deleted successfully"}
\ No newline at end of file
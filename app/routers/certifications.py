@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime, date
 import uuid
@@ -11,6 +13,8 @@ from app.schemas.certification import (
     EmployeeCertificationCreate, EmployeeCertificationUpdate, EmployeeCertificationResponse
 )
 from app.core.auth import get_current_user_with_permissions
+from app.core.pagination import KeysetPagination
+from app.core.serialization import trusted_response
 
 router = APIRouter()
 
@@ -18,22 +22,24 @@ router = APIRouter()
 async def get_employee_certifications(
     employee_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if (current_user.id != employee_id and 
         current_user.role.name not in ["Manager", "HR", "Admin"] and
-        not db.query(models.User).filter(
+        not await db.scalar(select(models.User.id).where(
             models.User.manager_id == current_user.id,
             models.User.id == employee_id
-        ).first()):
+        ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
 
-    certifications = db.query(models.EmployeeCertification).filter(
+    certifications = (await db.scalars(select(models.EmployeeCertification).options(
+        selectinload(models.EmployeeCertification.certification_type)
+    ).where(
         models.EmployeeCertification.user_id == employee_id
-    ).all()
+    ))).all()
     return certifications
 
 @router.post("/employees/{employee_id}/certifications", response_model=EmployeeCertificationResponse)
@@ -41,7 +47,7 @@ async def add_certification(
     employee_id: str,
     certification_data: EmployeeCertificationCreate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.id != employee_id and current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -56,8 +62,8 @@ async def add_certification(
     )
     
     db.add(certification)
-    db.commit()
-    db.refresh(certification)
+    await db.commit()
+    await db.refresh(certification, ["certification_type"])
     return certification
 
 @router.put("/employees/{employee_id}/certifications/{certification_id}", 
@@ -67,7 +73,7 @@ async def update_certification(
     certification_id: str,
     certification_data: EmployeeCertificationUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.id != employee_id and current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -75,10 +81,10 @@ async def update_certification(
             detail="Not enough permissions"
         )
 
-    certification = db.query(models.EmployeeCertification).filter(
+    certification = await db.scalar(select(models.EmployeeCertification).where(
         models.EmployeeCertification.id == certification_id,
         models.EmployeeCertification.user_id == employee_id
-    ).first()
+    ))
 
     if not certification:
         raise HTTPException(
@@ -89,8 +95,8 @@ async def update_certification(
     for key, value in certification_data.dict(exclude_unset=True).items():
         setattr(certification, key, value)
     
-    db.commit()
-    db.refresh(certification)
+    await db.commit()
+    await db.refresh(certification, ["certification_type"])
     return certification
 
 @router.delete("/employees/{employee_id}/certifications/{certification_id}")
@@ -98,7 +104,7 @@ async def remove_certification(
     employee_id: str,
     certification_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.id != employee_id and current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -106,10 +112,10 @@ async def remove_certification(
             detail="Not enough permissions"
         )
 
-    certification = db.query(models.EmployeeCertification).filter(
+    certification = await db.scalar(select(models.EmployeeCertification).where(
         models.EmployeeCertification.id == certification_id,
         models.EmployeeCertification.user_id == employee_id
-    ).first()
+    ))
 
     if not certification:
         raise HTTPException(
@@ -117,23 +123,25 @@ async def remove_certification(
             detail="Certification not found"
         )
 
-    db.delete(certification)
-    db.commit()
+    await db.delete(certification)
+    await db.commit()
     return {"message": "Certification removed successfully"}
 
 @router.get("/certifications", response_model=List[CertificationTypeResponse])
 async def list_certifications(
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    pagination: KeysetPagination = Depends()
 ):
-    certifications = db.query(models.CertificationType).all()
-    return certifications
+    query = pagination.apply(select(models.CertificationType), models.CertificationType)
+    certifications = pagination.page((await db.scalars(query)).all())
+    return trusted_response(CertificationTypeResponse, certifications, pagination.response)
 
 @router.post("/certifications", response_model=CertificationTypeResponse)
 async def create_certification_type(
     certification_data: CertificationTypeCreate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -147,8 +155,8 @@ async def create_certification_type(
     )
     
     db.add(certification_type)
-    db.commit()
-    db.refresh(certification_type)
+    await db.commit()
+    await db.refresh(certification_type)
     return certification_type
 
 @router.put("/certifications/{certification_id}", response_model=CertificationTypeResponse)
@@ -156,7 +164,7 @@ async def update_certification_type(
     certification_id: str,
     certification_data: CertificationTypeUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -164,9 +172,9 @@ async def update_certification_type(
             detail="Not enough permissions"
         )
 
-    certification_type = db.query(models.CertificationType).filter(
+    certification_type = await db.scalar(select(models.CertificationType).where(
         models.CertificationType.id == certification_id
-    ).first()
+    ))
 
     if not certification_type:
         raise HTTPException(
@@ -177,15 +185,15 @@ async def update_certification_type(
     for key, value in certification_data.dict(exclude_unset=True).items():
         setattr(certification_type, key, value)
     
-    db.commit()
-    db.refresh(certification_type)
+    await db.commit()
+    await db.refresh(certification_type)
     return certification_type
 
 @router.delete("/certifications/{certification_id}")
 async def delete_certification_type(
     certification_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -193,9 +201,9 @@ async def delete_certification_type(
             detail="Not enough permissions"
         )
 
-    certification_type = db.query(models.CertificationType).filter(
+    certification_type = await db.scalar(select(models.CertificationType).where(
         models.CertificationType.id == certification_id
-    ).first()
+    ))
 
     if not certification_type:
         raise HTTPException(
@@ -203,6 +211,6 @@ async def delete_certification_type(
             detail="Certification type not found"
         )
 
-    db.delete(certification_type)
-    db.commit()
+    await db.delete(certification_type)
+    await db.commit()
     return {"message": "Certification type deleted successfully"}
\ No newline at end of file
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
 import uuid
@@ -19,7 +20,7 @@ async def register_for_course(
     course_data: EnrollmentCreate,
     employee_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # Permission check
     if current_user.id != employee_id and current_user.role.name not in ["Manager", "HR", "Admin"]:
@@ -37,28 +38,28 @@ async def register_for_course(
     )
     
     db.add(enrollment)
-    db.commit()
-    db.refresh(enrollment)
+    await db.commit()
+    await db.refresh(enrollment, ["course"])
     
     return enrollment
 
 @router.get("/courses", response_model=List[CourseResponse])
 async def list_courses(
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    courses = db.query(models.Course).filter(
+    courses = (await db.scalars(select(models.Course).where(
         models.Course.status == "active"
-    ).all()
+    ))).all()
     return courses
 
 @router.get("/courses/{course_id}", response_model=CourseResponse)
 async def get_course(
     course_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    course = db.query(models.Course).filter(models.Course.id == course_id).first()
+    course = await db.scalar(select(models.Course).where(models.Course.id == course_id))
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -71,7 +72,7 @@ async def update_course(
     course_id: str,
     course_data: CourseUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -79,7 +80,7 @@ async def update_course(
             detail="Not enough permissions"
         )
 
-    course = db.query(models.Course).filter(models.Course.id == course_id).first()
+    course = await db.scalar(select(models.Course).where(models.Course.id == course_id))
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -89,6 +90,6 @@ async def update_course(
     for key, value in course_data.dict(exclude_unset=True).items():
         setattr(course, key, value)
     
-    db.commit()
-    db.refresh(course)
+    await db.commit()
+    await db.refresh(course)
     return course
\ No newline at end of file
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 import uuid
 
@@ -11,6 +12,9 @@ from app.schemas.department import (
 )
 from app.schemas.user import UserResponse
 from app.core.auth import get_current_user_with_permissions
+from app.core.principal_cache import principal_cache
+from app.core.pagination import KeysetPagination
+from app.core.serialization import trusted_response
 
 router = APIRouter()
 
@@ -18,7 +22,7 @@ router = APIRouter()
 async def create_department(
     department_data: DepartmentCreate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -32,19 +36,19 @@ async def create_department(
     )
     
     db.add(department)
-    db.commit()
-    db.refresh(department)
+    await db.commit()
+    await db.refresh(department)
     return department
 
 @router.get("/departments/{department_id}", response_model=DepartmentResponse)
 async def get_department(
     department_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    department = db.query(models.Department).filter(
+    department = await db.scalar(select(models.Department).where(
         models.Department.id == department_id
-    ).first()
+    ))
     
     if not department:
         raise HTTPException(
@@ -59,7 +63,7 @@ async def update_department(
     department_id: str,
     department_data: DepartmentUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -67,9 +71,9 @@ async def update_department(
             detail="Not enough permissions"
         )
 
-    department = db.query(models.Department).filter(
+    department = await db.scalar(select(models.Department).where(
         models.Department.id == department_id
-    ).first()
+    ))
     
     if not department:
         raise HTTPException(
@@ -80,15 +84,15 @@ async def update_department(
     for key, value in department_data.dict(exclude_unset=True).items():
         setattr(department, key, value)
 
-    db.commit()
-    db.refresh(department)
+    await db.commit()
+    await db.refresh(department)
     return department
 
 @router.delete("/departments/{department_id}")
 async def delete_department(
     department_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -96,9 +100,9 @@ async def delete_department(
             detail="Not enough permissions"
         )
 
-    department = db.query(models.Department).filter(
+    department = await db.scalar(select(models.Department).where(
         models.Department.id == department_id
-    ).first()
+    ))
     
     if not department:
         raise HTTPException(
@@ -106,23 +110,26 @@ async def delete_department(
             detail="Department not found"
         )
     
-    db.delete(department)
-    db.commit()
+    await db.delete(department)
+    await db.commit()
     return {"message": "Department deleted successfully"}
 
 @router.get("/departments", response_model=List[DepartmentResponse])
 async def list_departments(
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    pagination: KeysetPagination = Depends()
 ):
-    departments = db.query(models.Department).all()
-    return departments
+    query = pagination.apply(select(models.Department), models.Department)
+    departments = pagination.page((await db.scalars(query)).all())
+    return trusted_response(DepartmentResponse, departments, pagination.response)
 
 @router.get("/departments/{department_id}/employees", response_model=List[UserResponse])
 async def list_department_employees(
     department_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    pagination: KeysetPagination = Depends()
 ):
     if current_user.role.name not in ["Manager", "HR", "Admin"]:
         raise HTTPException(
@@ -130,18 +137,18 @@ async def list_department_employees(
             detail="Not enough permissions"
         )
 
-    employees = db.query(models.User).filter(
+    query = pagination.apply(select(models.User).where(
         models.User.department_id == department_id
-    ).all()
-    
-    return employees
+    ), models.User)
+    employees = pagination.page((await db.scalars(query)).all())
+    return trusted_response(UserResponse, employees, pagination.response)
 
 @router.post("/departments/{department_id}/employees")
 async def add_employee_to_department(
     department_id: str,
     employee_data: EmployeeDepartmentUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -149,9 +156,9 @@ async def add_employee_to_department(
             detail="Not enough permissions"
         )
 
-    employee = db.query(models.User).filter(
+    employee = await db.scalar(select(models.User).where(
         models.User.id == employee_data.user_id
-    ).first()
+    ))
     
     if not employee:
         raise HTTPException(
@@ -160,7 +167,8 @@ async def add_employee_to_department(
         )
 
     employee.department_id = department_id
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate(employee.id)
     return {"message": "Employee added to department successfully"}
 
 @router.delete("/departments/{department_id}/employees/{employee_id}")
@@ -168,7 +176,7 @@ async def remove_employee_from_department(
     department_id: str,
     employee_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -176,10 +184,10 @@ async def remove_employee_from_department(
             detail="Not enough permissions"
         )
 
-    employee = db.query(models.User).filter(
+    employee = await db.scalar(select(models.User).where(
         models.User.id == employee_id,
         models.User.department_id == department_id
-    ).first()
+    ))
     
     if not employee:
         raise HTTPException(
@@ -188,5 +196,6 @@ async def remove_employee_from_department(
         )
 
     employee.department_id = None
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate(employee_id)
     return {"message": "Employee removed from department successfully"}
\ No newline at end of file
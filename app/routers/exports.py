@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from datetime import date
+
+from app.db.session import get_db
+from app.db import models
+from app.core.auth import get_current_user_with_permissions
+from app.core.exports import EXPORTS, export_query, export_partitions, csv_chunks, ndjson_chunks
+from app.core.columnar_exports import arrow_schema, arrow_chunks, parquet_chunks
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream"
+}
+
+# Stream an export
+@router.get("/exports/{dataset}")
+async def export_dataset(
+    dataset: str = Path(..., description="leaves, attendance, salaries, payslips, performance_ratings or users"),
+    format: str = Query("csv", regex="^(csv|ndjson|parquet|arrow)$", description="csv, ndjson, parquet or arrow"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns to include; all by default"),
+    from_date: Optional[date] = Query(None, description="Filter from date"),
+    to_date: Optional[date] = Query(None, description="Filter to date"),
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    if current_user.role.name not in ["HR", "Admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    if dataset not in EXPORTS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unknown export"
+        )
+
+    selected = EXPORTS[dataset].columns
+    if columns:
+        selected = tuple(column.strip() for column in columns.split(",") if column.strip())
+        unknown = [column for column in selected if column not in EXPORTS[dataset].columns]
+        if unknown or not selected:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown columns: {', '.join(unknown)}" if unknown else "No columns selected"
+            )
+
+    # Rows go straight from the cursor to the response; the session stays
+    # open until the last chunk is sent
+    query = export_query(dataset, from_date, to_date, selected)
+    partitions = export_partitions(db, query)
+    if format == "csv":
+        chunks = csv_chunks(selected, partitions)
+    elif format == "ndjson":
+        chunks = ndjson_chunks(selected, partitions)
+    elif format == "parquet":
+        chunks = parquet_chunks(arrow_schema(query), partitions)
+    else:
+        chunks = arrow_chunks(arrow_schema(query), partitions)
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{format}"'}
+    )
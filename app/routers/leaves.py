@@ -1,19 +1,40 @@
 # app/routers/leaves.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Path, Query
+from sqlalchemy import select, or_
+from sqlalchemy.orm import joinedload
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+from collections import Counter, defaultdict
 import uuid
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 
 from app.db.session import get_db
 from app.db import models
 from app.schemas.leave import (
     LeaveCreate, LeaveUpdate, LeaveResponse,
     LeaveTypeCreate, LeaveTypeUpdate, LeaveTypeResponse,
-    LeaveBalanceCreate, LeaveBalanceUpdate, LeaveBalanceResponse
+    LeaveBalanceCreate, LeaveBalanceUpdate, LeaveBalanceResponse,
+    HolidayCreate, HolidayResponse, LeaveUsageReport,
+    LeaveValidationRequest, LeaveValidationResult, LeaveConflict,
+    AbsenceDay, AbsentEmployee,
+    LeaveAccrualRequest, LeaveAccrualRunResponse,
+    LeaveDecisionRequest, LeaveDecisionResult
 )
 from app.core.auth import get_current_user_with_permissions
+from app.core.pagination import KeysetPagination
+from app.core.serialization import trusted_response
+from app.core.work_calendar import (
+    count_working_days, count_leave_working_days, work_calendar_cache
+)
+from app.core.leave_accrual import claim_accrual_statement, run_leave_accrual
+from app.core.leave_type_cache import leave_type_cache
+from app.core.leave_overlaps import Interval, find_overlapping_leave, validate_leave_batch
+from app.core.leave_balances import (
+    reserve_leave_days, consume_reservation, release_reservation,
+    refund_leave_days, transition_leave, delete_leave
+)
 
 router = APIRouter()
 
@@ -22,21 +43,25 @@ router = APIRouter()
 async def get_employee_leaves(
     employee_id: str = Path(..., description="The ID of the employee"),
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if (current_user.id != employee_id and 
         current_user.role.name not in ["Manager", "HR", "Admin"] and
-        not db.query(models.User).filter(
+        not await db.scalar(select(models.User.id).where(
             models.User.manager_id == current_user.id,
             models.User.id == employee_id
-        ).first()):
+        ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
 
-    leaves = db.query(models.Leave).filter(models.Leave.user_id == employee_id).all()
-    return leaves
+    leaves = (await db.scalars(
+        select(models.Leave)
+        .options(joinedload(models.Leave.leave_type))
+        .where(models.Leave.user_id == employee_id)
+    )).all()
+    return trusted_response(LeaveResponse, leaves)
 
 # Apply Leave
 @router.post("/employees/{employee_id}/leaves", response_model=LeaveResponse)
@@ -44,7 +69,7 @@ async def apply_leave(
     leave_data: LeaveCreate,
     employee_id: str = Path(..., description="The ID of the employee"),
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # Only allow self-application or HR/Admin
     if current_user.id != employee_id and current_user.role.name not in ["HR", "Admin"]:
@@ -54,27 +79,44 @@ async def apply_leave(
         )
 
     # Validate leave type
-    leave_type = db.query(models.LeaveType).filter(
-        models.LeaveType.id == leave_data.leave_type_id,
-        models.LeaveType.is_active == True
-    ).first()
-    if not leave_type:
+    if not await leave_type_cache.get(db, leave_data.leave_type_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid leave type"
         )
 
-    # Check leave balance
-    balance = db.query(models.LeaveBalance).filter(
-        models.LeaveBalance.user_id == employee_id,
-        models.LeaveBalance.leave_type_id == leave_data.leave_type_id,
-        models.LeaveBalance.year == datetime.now().year
-    ).first()
+    if leave_data.end_date < leave_data.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End date must not be before start date"
+        )
 
-    if not balance or (balance.total_days - balance.used_days) <= 0:
+    # The update lock on the employee's row, held until commit, serializes
+    # this employee's applications whatever their leave type, so two
+    # overlapping requests cannot both pass the overlap check
+    department_id = await db.scalar(
+        select(models.User.department_id)
+        .where(models.User.id == employee_id)
+        .with_hint(models.User, "WITH (UPDLOCK, ROWLOCK)", "mssql")
+    )
+    overlapping = await find_overlapping_leave(
+        db, employee_id, leave_data.start_date, leave_data.end_date
+    )
+    if overlapping:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Insufficient leave balance"
+            detail=f"Leave overlaps an existing {overlapping.status} leave from "
+                   f"{overlapping.start_date} to {overlapping.end_date}"
+        )
+
+    # Charge working days on the employee's department calendar
+    days = int((await count_working_days(
+        db, department_id, [leave_data.start_date], [leave_data.end_date]
+    ))[0])
+    if days == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Leave does not include any working days"
         )
 
     # Create leave request
@@ -82,12 +124,20 @@ async def apply_leave(
         id=str(uuid.uuid4()),
         user_id=employee_id,
         status="pending",
+        days=days,
         **leave_data.dict()
     )
-    
+
+    # Reserve the days against the balance for the leave's year
+    if not await reserve_leave_days(db, leave):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Insufficient leave balance"
+        )
+
     db.add(leave)
-    db.commit()
-    db.refresh(leave)
+    await db.commit()
+    await db.refresh(leave, ["leave_type"])
     
     return leave
 
@@ -96,7 +146,7 @@ async def apply_leave(
 async def approve_leave(
     leave_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["Manager", "HR", "Admin"]:
         raise HTTPException(
@@ -104,7 +154,11 @@ async def approve_leave(
             detail="Not enough permissions"
         )
 
-    leave = db.query(models.Leave).filter(models.Leave.id == leave_id).first()
+    leave = await db.scalar(
+        select(models.Leave)
+        .options(joinedload(models.Leave.leave_type))
+        .where(models.Leave.id == leave_id)
+    )
     if not leave:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -113,18 +167,22 @@ async def approve_leave(
 
     # Manager can only approve their team's leaves
     if (current_user.role.name == "Manager" and
-        not db.query(models.User).filter(
+        not await db.scalar(select(models.User.id).where(
             models.User.manager_id == current_user.id,
             models.User.id == leave.user_id
-        ).first()):
+        ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Can only approve team member leaves"
         )
 
-    leave.status = "approved"
-    db.commit()
-    db.refresh(leave)
+    if not await transition_leave(db, leave, "pending", "approved"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only pending leaves can be approved"
+        )
+    await consume_reservation(db, leave)
+    await db.commit()
     
     return leave
 
@@ -134,7 +192,7 @@ async def reject_leave(
     leave_id: str,
     comment: str = Query(..., description="Reason for rejection"),
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["Manager", "HR", "Admin"]:
         raise HTTPException(
@@ -142,7 +200,11 @@ async def reject_leave(
             detail="Not enough permissions"
         )
 
-    leave = db.query(models.Leave).filter(models.Leave.id == leave_id).first()
+    leave = await db.scalar(
+        select(models.Leave)
+        .options(joinedload(models.Leave.leave_type))
+        .where(models.Leave.id == leave_id)
+    )
     if not leave:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -151,30 +213,94 @@ async def reject_leave(
 
     # Manager can only reject their team's leaves
     if (current_user.role.name == "Manager" and
-        not db.query(models.User).filter(
+        not await db.scalar(select(models.User.id).where(
             models.User.manager_id == current_user.id,
             models.User.id == leave.user_id
-        ).first()):
+        ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Can only reject team member leaves"
         )
 
-    leave.status = "rejected"
-    leave.comment = comment
-    db.commit()
-    db.refresh(leave)
+    if not await transition_leave(db, leave, "pending", "rejected", comment=comment):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only pending leaves can be rejected"
+        )
+    await release_reservation(db, leave)
+    await db.commit()
     
     return leave
 
+# Approve or reject a batch of leaves
+@router.post("/leaves/decisions", response_model=List[LeaveDecisionResult])
+async def decide_leaves(
+    request: LeaveDecisionRequest,
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    if current_user.role.name not in ["Manager", "HR", "Admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    # Load every leave with its owner's manager in one query
+    leave_ids = {item.leave_id for item in request.decisions}
+    rows = (await db.execute(
+        select(models.Leave, models.User.manager_id)
+        .join(models.User, models.User.id == models.Leave.user_id)
+        .where(models.Leave.id.in_(leave_ids))
+    )).all()
+    leaves = {leave.id: (leave, manager_id) for leave, manager_id in rows}
+
+    results = []
+    decided = set()
+    for item in request.decisions:
+        result = LeaveDecisionResult(leave_id=item.leave_id, decision=item.decision, success=False)
+        results.append(result)
+        if item.leave_id in decided:
+            result.detail = "Duplicate decision for this leave"
+            continue
+        decided.add(item.leave_id)
+
+        leave, manager_id = leaves.get(item.leave_id, (None, None))
+        if not leave:
+            result.detail = "Leave not found"
+            continue
+        result.status = leave.status
+        # Manager can only decide their team's leaves
+        if current_user.role.name == "Manager" and manager_id != current_user.id:
+            result.detail = "Can only decide team member leaves"
+            continue
+
+        if item.decision == "approve":
+            if await transition_leave(db, leave, "pending", "approved"):
+                await consume_reservation(db, leave)
+                result.success = True
+            else:
+                result.detail = "Only pending leaves can be approved"
+        elif not item.comment:
+            result.detail = "A comment is required to reject a leave"
+        elif await transition_leave(db, leave, "pending", "rejected", comment=item.comment):
+            await release_reservation(db, leave)
+            result.success = True
+        else:
+            result.detail = "Only pending leaves can be rejected"
+        result.status = leave.status
+
+    await db.commit()
+
+    return results
+
 # Cancel Leave
 @router.delete("/leaves/{leave_id}", response_model=dict)
 async def cancel_leave(
     leave_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    leave = db.query(models.Leave).filter(models.Leave.id == leave_id).first()
+    leave = await db.scalar(select(models.Leave).where(models.Leave.id == leave_id))
     if not leave:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -184,17 +310,25 @@ async def cancel_leave(
     # Only self, manager, HR or admin can cancel
     if (current_user.id != leave.user_id and
         current_user.role.name not in ["HR", "Admin"] and
-        not db.query(models.User).filter(
+        not await db.scalar(select(models.User.id).where(
             models.User.manager_id == current_user.id,
             models.User.id == leave.user_id
-        ).first()):
+        ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
 
-    db.delete(leave)
-    db.commit()
+    if not await delete_leave(db, leave):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Leave was updated concurrently, please retry"
+        )
+    if leave.status == "pending":
+        await release_reservation(db, leave)
+    elif leave.status == "approved":
+        await refund_leave_days(db, leave)
+    await db.commit()
     
     return {"message": "Leave cancelled successfully"}
 
@@ -202,7 +336,8 @@ async def cancel_leave(
 @router.get("/leaves", response_model=List[LeaveResponse])
 async def list_leaves(
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
+    pagination: KeysetPagination = Depends(),
     status: Optional[str] = Query(None, description="Filter by status"),
     from_date: Optional[date] = Query(None, description="Filter from date"),
     to_date: Optional[date] = Query(None, description="Filter to date")
@@ -213,43 +348,294 @@ async def list_leaves(
             detail="Not enough permissions"
         )
 
-    query = db.query(models.Leave)
+    query = select(models.Leave).options(joinedload(models.Leave.leave_type))
 
     # Managers can only see their team's leaves
     if current_user.role.name == "Manager":
-        query = query.join(models.User).filter(models.User.manager_id == current_user.id)
+        query = query.join(models.User).where(models.User.manager_id == current_user.id)
 
     if status:
-        query = query.filter(models.Leave.status == status)
+        query = query.where(models.Leave.status == status)
     if from_date:
-        query = query.filter(models.Leave.start_date >= from_date)
+        query = query.where(models.Leave.start_date >= from_date)
     if to_date:
-        query = query.filter(models.Leave.end_date <= to_date)
+        query = query.where(models.Leave.end_date <= to_date)
+
+    query = pagination.apply(query, models.Leave)
+    leaves = pagination.page((await db.scalars(query)).all())
+    return trusted_response(LeaveResponse, leaves, pagination.response)
+
+# Validate a batch of leaves for overlaps
+@router.post("/leaves/validate", response_model=List[LeaveValidationResult])
+async def validate_leaves(
+    request: LeaveValidationRequest,
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    if current_user.role.name not in ["HR", "Admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    batch = [
+        Interval(item.user_id, item.start_date, item.end_date, index=index)
+        for index, item in enumerate(request.leaves)
+    ]
+    conflicts = await validate_leave_batch(db, batch)
+
+    return [
+        LeaveValidationResult(
+            index=index,
+            valid=item.end_date >= item.start_date and not conflicts.get(index),
+            conflicts=[
+                LeaveConflict(
+                    leave_id=other.leave_id,
+                    index=other.index,
+                    start_date=other.start_date,
+                    end_date=other.end_date
+                )
+                for other in conflicts.get(index, [])
+            ]
+        )
+        for index, item in enumerate(request.leaves)
+    ]
+
+# Team Absence Calendar
+@router.get("/leaves/absence-calendar", response_model=List[AbsenceDay])
+async def absence_calendar(
+    from_date: date = Query(..., description="First day of the calendar"),
+    to_date: date = Query(..., description="Last day of the calendar"),
+    department_id: Optional[str] = Query(None, description="Department instead of the manager's team"),
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    if current_user.role.name not in ["Manager", "HR", "Admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    if to_date < from_date or (to_date - from_date).days >= 366:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Date range must be between 1 and 366 days"
+        )
+
+    query = (
+        select(
+            models.Leave.user_id,
+            models.User.first_name,
+            models.User.last_name,
+            models.Leave.start_date,
+            models.Leave.end_date
+        )
+        .join(models.User, models.User.id == models.Leave.user_id)
+        .where(
+            models.Leave.status == "approved",
+            models.Leave.start_date <= to_date,
+            models.Leave.end_date >= from_date
+        )
+    )
+    if department_id:
+        # Managers may view their own department only
+        if current_user.role.name == "Manager" and department_id != current_user.department_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Can only view your own department"
+            )
+        query = query.where(models.User.department_id == department_id)
+    elif current_user.role.name == "Manager":
+        query = query.where(models.User.manager_id == current_user.id)
+    leaves = (await db.execute(query)).all()
+
+    # Sweep the days once: leaves enter the absent set on their first day in
+    # range and leave it the day after their last
+    days = (to_date - from_date).days + 1
+    starting = defaultdict(list)
+    ending = defaultdict(list)
+    for leave in leaves:
+        starting[max((leave.start_date - from_date).days, 0)].append(leave)
+        ending[min((leave.end_date - from_date).days, days - 1) + 1].append(leave)
+
+    absent = Counter()
+    names = {}
+    calendar = []
+    for offset in range(days):
+        for leave in ending.pop(offset, ()):
+            absent[leave.user_id] -= 1
+            if not absent[leave.user_id]:
+                del absent[leave.user_id]
+        for leave in starting.pop(offset, ()):
+            absent[leave.user_id] += 1
+            names[leave.user_id] = f"{leave.first_name} {leave.last_name}"
+        calendar.append(AbsenceDay(
+            date=from_date + timedelta(days=offset),
+            count=len(absent),
+            employees=[
+                AbsentEmployee(user_id=user_id, name=names[user_id])
+                for user_id in sorted(absent, key=names.get)
+            ]
+        ))
+    return calendar
+
+# Leave Usage Report
+@router.get("/leaves/report", response_model=List[LeaveUsageReport])
+async def leave_usage_report(
+    from_date: date = Query(..., description="First day of the report period"),
+    to_date: date = Query(..., description="Last day of the report period"),
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    if current_user.role.name not in ["Manager", "HR", "Admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
 
-    return query.all()
+    # Approved leaves intersecting the period, with the owner's department
+    query = (
+        select(
+            models.Leave.leave_type_id,
+            models.LeaveType.name,
+            models.User.department_id,
+            models.Leave.start_date,
+            models.Leave.end_date
+        )
+        .join(models.User, models.User.id == models.Leave.user_id)
+        .join(models.LeaveType, models.LeaveType.id == models.Leave.leave_type_id)
+        .where(
+            models.Leave.status == "approved",
+            models.Leave.start_date <= to_date,
+            models.Leave.end_date >= from_date
+        )
+    )
+    if current_user.role.name == "Manager":
+        query = query.where(models.User.manager_id == current_user.id)
+    rows = (await db.execute(query)).all()
+
+    # Working days of each leave that fall inside the period
+    working_days = await count_leave_working_days(db, [
+        (row.department_id, max(row.start_date, from_date), min(row.end_date, to_date))
+        for row in rows
+    ])
+
+    report = {}
+    for row, days in zip(rows, working_days):
+        entry = report.setdefault(row.leave_type_id, LeaveUsageReport(
+            leave_type_id=row.leave_type_id,
+            leave_type_name=row.name,
+            leaves=0,
+            working_days=0
+        ))
+        entry.leaves += 1
+        entry.working_days += days
+    return list(report.values())
+
+# List Holidays
+@router.get("/holidays", response_model=List[HolidayResponse])
+async def list_holidays(
+    year: int = Query(..., description="Calendar year"),
+    department_id: Optional[str] = Query(None, description="Include this department's holidays"),
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    holidays = (await db.scalars(
+        select(models.Holiday)
+        .where(
+            models.Holiday.date >= date(year, 1, 1),
+            models.Holiday.date < date(year + 1, 1, 1),
+            or_(
+                models.Holiday.department_id.is_(None),
+                models.Holiday.department_id == department_id
+            )
+        )
+        .order_by(models.Holiday.date)
+    )).all()
+    return holidays
+
+# Create Holiday
+@router.post("/holidays", response_model=HolidayResponse)
+async def create_holiday(
+    holiday_data: HolidayCreate,
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    if current_user.role.name not in ["HR", "Admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    if await db.scalar(select(models.Holiday.id).where(
+        models.Holiday.date == holiday_data.date,
+        models.Holiday.department_id.is_(None) if holiday_data.department_id is None
+        else models.Holiday.department_id == holiday_data.department_id
+    )):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Holiday already exists for this date"
+        )
+
+    holiday = models.Holiday(
+        id=str(uuid.uuid4()),
+        **holiday_data.dict()
+    )
+
+    db.add(holiday)
+    await db.commit()
+    work_calendar_cache.invalidate()
+    await db.refresh(holiday)
+
+    return holiday
+
+# Delete Holiday
+@router.delete("/holidays/{holiday_id}", response_model=dict)
+async def delete_holiday(
+    holiday_id: str,
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    if current_user.role.name not in ["HR", "Admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    holiday = await db.scalar(select(models.Holiday).where(models.Holiday.id == holiday_id))
+    if not holiday:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Holiday not found"
+        )
+
+    await db.delete(holiday)
+    await db.commit()
+    work_calendar_cache.invalidate()
+
+    return {"message": "Holiday deleted successfully"}
 
 # Get Leave Balance
 @router.get("/employees/{employee_id}/leave-balance", response_model=List[LeaveBalanceResponse])
 async def get_leave_balance(
     employee_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if (current_user.id != employee_id and 
         current_user.role.name not in ["Manager", "HR", "Admin"] and
-        not db.query(models.User).filter(
+        not await db.scalar(select(models.User.id).where(
             models.User.manager_id == current_user.id,
             models.User.id == employee_id
-        ).first()):
+        ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
 
-    balances = db.query(models.LeaveBalance).filter(
+    balances = (await db.scalars(select(models.LeaveBalance).where(
         models.LeaveBalance.user_id == employee_id,
         models.LeaveBalance.year == datetime.now().year
-    ).all()
+    ))).all()
     return balances
 
 # Update Leave Balance
@@ -258,7 +644,7 @@ async def update_leave_balance(
     employee_id: str,
     balance_data: LeaveBalanceUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -266,11 +652,11 @@ async def update_leave_balance(
             detail="Not enough permissions"
         )
 
-    balance = db.query(models.LeaveBalance).filter(
+    balance = await db.scalar(select(models.LeaveBalance).where(
         models.LeaveBalance.user_id == employee_id,
         models.LeaveBalance.leave_type_id == balance_data.leave_type_id,
         models.LeaveBalance.year == datetime.now().year
-    ).first()
+    ))
 
     if not balance:
         raise HTTPException(
@@ -281,16 +667,76 @@ async def update_leave_balance(
     for key, value in balance_data.dict().items():
         setattr(balance, key, value)
 
-    db.commit()
-    db.refresh(balance)
+    await db.commit()
+    await db.refresh(balance)
     
     return balance
 
+# Start or resume the year-end accrual and carry-forward
+@router.post("/leave-balances/accrual", response_model=LeaveAccrualRunResponse,
+             status_code=status.HTTP_202_ACCEPTED)
+async def start_leave_accrual(
+    accrual_data: LeaveAccrualRequest,
+    background_tasks: BackgroundTasks,
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    if current_user.role.name not in ["HR", "Admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    run_query = select(models.LeaveAccrualRun).where(models.LeaveAccrualRun.year == accrual_data.year)
+    run = await db.scalar(run_query)
+    if not run:
+        db.add(models.LeaveAccrualRun(
+            id=str(uuid.uuid4()),
+            status="pending",
+            started_by=current_user.id,
+            **accrual_data.dict()
+        ))
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Another request created the run for this year first
+            await db.rollback()
+        run = await db.scalar(run_query)
+
+    claimed = (await db.execute(claim_accrual_statement(run.id))).rowcount
+    await db.commit()
+    if claimed:
+        background_tasks.add_task(run_leave_accrual, run.id)
+
+    await db.refresh(run)
+    return run
+
+# Accrual run progress
+@router.get("/leave-balances/accrual/{run_id}", response_model=LeaveAccrualRunResponse)
+async def get_leave_accrual(
+    run_id: str,
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    if current_user.role.name not in ["HR", "Admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    run = await db.scalar(select(models.LeaveAccrualRun).where(models.LeaveAccrualRun.id == run_id))
+    if not run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Leave accrual run not found"
+        )
+    return run
+
 # Get Leave Types
 @router.get("/leave-types", response_model=List[LeaveTypeResponse])
 async def get_leave_types(
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -298,15 +744,14 @@ async def get_leave_types(
             detail="Not enough permissions"
         )
 
-    leave_types = db.query(models.LeaveType).filter(models.LeaveType.is_active == True).all()
-    return leave_types
+    return await leave_type_cache.get_all(db)
 
 # Create Leave Type
 @router.post("/leave-types", response_model=LeaveTypeResponse)
 async def create_leave_type(
     leave_type_data: LeaveTypeCreate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name != "Admin":
         raise HTTPException(
@@ -320,8 +765,9 @@ async def create_leave_type(
     )
     
     db.add(leave_type)
-    db.commit()
-    db.refresh(leave_type)
+    await db.commit()
+    await db.refresh(leave_type)
+    leave_type_cache.invalidate()
     
     return leave_type
 
@@ -331,7 +777,7 @@ async def update_leave_type(
     leave_type_id: str,
     leave_type_data: LeaveTypeUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name != "Admin":
         raise HTTPException(
@@ -339,18 +785,19 @@ async def update_leave_type(
             detail="Not enough permissions"
         )
 
-    leave_type = db.query(models.LeaveType).filter(models.LeaveType.id == leave_type_id).first()
+    leave_type = await db.scalar(select(models.LeaveType).where(models.LeaveType.id == leave_type_id))
     if not leave_type:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Leave type not found"
         )
 
-    for key, value in leave_type_data.dict().items():
+    for key, value in leave_type_data.dict(exclude_unset=True).items():
         setattr(leave_type, key, value)
 
-    db.commit()
-    db.refresh(leave_type)
+    await db.commit()
+    await db.refresh(leave_type)
+    leave_type_cache.invalidate()
     
     return leave_type
 
@@ -359,7 +806,7 @@ async def update_leave_type(
 async def delete_leave_type(
     leave_type_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name != "Admin":
         raise HTTPException(
@@ -367,14 +814,15 @@ async def delete_leave_type(
             detail="Not enough permissions"
         )
 
-    leave_type = db.query(models.LeaveType).filter(models.LeaveType.id == leave_type_id).first()
+    leave_type = await db.scalar(select(models.LeaveType).where(models.LeaveType.id == leave_type_id))
     if not leave_type:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Leave type not found"
         )
 
-    db.delete(leave_type)
-    db.commit()
+    await db.delete(leave_type)
+    await db.commit()
+    leave_type_cache.invalidate()
     
     return {"message": "Leave type deleted successfully"}
\ No newline at end of file
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from datetime import datetime
 import uuid
@@ -19,22 +21,24 @@ router = APIRouter()
 async def get_onboarding_status(
     employee_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if (current_user.id != employee_id and 
         current_user.role.name not in ["Manager", "HR", "Admin"] and
-        not db.query(models.User).filter(
+        not await db.scalar(select(models.User.id).where(
             models.User.manager_id == current_user.id,
             models.User.id == employee_id
-        ).first()):
+        ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
 
-    tasks = db.query(models.EmployeeOnboarding).filter(
+    tasks = (await db.scalars(select(models.EmployeeOnboarding).options(
+        selectinload(models.EmployeeOnboarding.task)
+    ).where(
         models.EmployeeOnboarding.user_id == employee_id
-    ).all()
+    ))).all()
     return tasks
 
 @router.put("/employees/{employee_id}/onboarding/{task_id}", response_model=EmployeeTaskResponse)
@@ -43,7 +47,7 @@ async def update_onboarding_status(
     task_id: str,
     task_update: EmployeeTaskUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -51,10 +55,10 @@ async def update_onboarding_status(
             detail="Not enough permissions"
         )
 
-    task = db.query(models.EmployeeOnboarding).filter(
+    task = await db.scalar(select(models.EmployeeOnboarding).where(
         models.EmployeeOnboarding.user_id == employee_id,
         models.EmployeeOnboarding.id == task_id
-    ).first()
+    ))
     
     if not task:
         raise HTTPException(
@@ -68,30 +72,32 @@ async def update_onboarding_status(
     for key, value in task_update.dict(exclude_unset=True).items():
         setattr(task, key, value)
 
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task, ["task"])
     return task
 
 @router.get("/employees/{employee_id}/offboarding", response_model=List[EmployeeTaskResponse])
 async def get_offboarding_status(
     employee_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if (current_user.id != employee_id and 
         current_user.role.name not in ["Manager", "HR", "Admin"] and
-        not db.query(models.User).filter(
+        not await db.scalar(select(models.User.id).where(
             models.User.manager_id == current_user.id,
             models.User.id == employee_id
-        ).first()):
+        ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
 
-    tasks = db.query(models.EmployeeOffboarding).filter(
+    tasks = (await db.scalars(select(models.EmployeeOffboarding).options(
+        selectinload(models.EmployeeOffboarding.task)
+    ).where(
         models.EmployeeOffboarding.user_id == employee_id
-    ).all()
+    ))).all()
     return tasks
 
 @router.put("/employees/{employee_id}/offboarding/{task_id}", response_model=EmployeeTaskResponse)
@@ -100,7 +106,7 @@ async def update_offboarding_status(
     task_id: str,
     task_update: EmployeeTaskUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -108,10 +114,10 @@ async def update_offboarding_status(
             detail="Not enough permissions"
         )
 
-    task = db.query(models.EmployeeOffboarding).filter(
+    task = await db.scalar(select(models.EmployeeOffboarding).where(
         models.EmployeeOffboarding.user_id == employee_id,
         models.EmployeeOffboarding.id == task_id
-    ).first()
+    ))
     
     if not task:
         raise HTTPException(
@@ -125,14 +131,14 @@ async def update_offboarding_status(
     for key, value in task_update.dict(exclude_unset=True).items():
         setattr(task, key, value)
 
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task, ["task"])
     return task
 
 @router.get("/onboarding/tasks", response_model=List[TaskResponse])
 async def list_onboarding_tasks(
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -140,16 +146,16 @@ async def list_onboarding_tasks(
             detail="Not enough permissions"
         )
 
-    tasks = db.query(models.OnboardingTask).filter(
+    tasks = (await db.scalars(select(models.OnboardingTask).where(
         models.OnboardingTask.is_active == True
-    ).all()
+    ))).all()
     return tasks
 
 @router.post("/onboarding/tasks", response_model=TaskResponse)
 async def create_onboarding_task(
     task_data: OnboardingTaskCreate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -163,14 +169,14 @@ async def create_onboarding_task(
     )
     
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task)
     return task
 
 @router.get("/offboarding/tasks", response_model=List[TaskResponse])
 async def list_offboarding_tasks(
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -178,16 +184,16 @@ async def list_offboarding_tasks(
             detail="Not enough permissions"
         )
 
-    tasks = db.query(models.OffboardingTask).filter(
+    tasks = (await db.scalars(select(models.OffboardingTask).where(
         models.OffboardingTask.is_active == True
-    ).all()
+    ))).all()
     return tasks
 
 @router.post("/offboarding/tasks", response_model=TaskResponse)
 async def create_offboarding_task(
     task_data: OffboardingTaskCreate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -201,6 +207,6 @@ async def create_offboarding_task(
     )
     
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task)
     return task
\ No newline at end of file
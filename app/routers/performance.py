@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date, datetime
 import uuid
-from statistics import mean
 
 from app.db.session import get_db
 from app.db import models
@@ -13,6 +13,8 @@ from app.schemas.performance import (
     PerformanceReport
 )
 from app.core.auth import get_current_user_with_permissions
+from app.core.performance_reports import build_performance_report
+from app.core.rating_aggregates import apply_rating_delta, rebuild_rating_aggregates
 
 router = APIRouter()
 
@@ -20,22 +22,22 @@ router = APIRouter()
 async def check_ratings(
     employee_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if (current_user.id != employee_id and 
         current_user.role.name not in ["Manager", "HR", "Admin"] and
-        not db.query(models.User).filter(
+        not await db.scalar(select(models.User.id).where(
             models.User.manager_id == current_user.id,
             models.User.id == employee_id
-        ).first()):
+        ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
 
-    ratings = db.query(models.PerformanceRating).filter(
+    ratings = (await db.scalars(select(models.PerformanceRating).where(
         models.PerformanceRating.user_id == employee_id
-    ).all()
+    ))).all()
     return ratings
 
 @router.post("/employees/{employee_id}/ratings", response_model=RatingResponse)
@@ -43,7 +45,7 @@ async def submit_rating(
     employee_id: str,
     rating_data: RatingCreate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["Manager", "HR", "Admin"]:
         raise HTTPException(
@@ -59,8 +61,9 @@ async def submit_rating(
     )
     
     db.add(rating)
-    db.commit()
-    db.refresh(rating)
+    await apply_rating_delta(db, rating, 1)
+    await db.commit()
+    await db.refresh(rating)
     return rating
 
 @router.put("/employees/{employee_id}/ratings/{rating_id}", 
@@ -70,7 +73,7 @@ async def update_rating(
     rating_id: str,
     rating_data: RatingUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["Manager", "HR", "Admin"]:
         raise HTTPException(
@@ -78,10 +81,10 @@ async def update_rating(
             detail="Not enough permissions"
         )
 
-    rating = db.query(models.PerformanceRating).filter(
+    rating = await db.scalar(select(models.PerformanceRating).where(
         models.PerformanceRating.id == rating_id,
         models.PerformanceRating.user_id == employee_id
-    ).first()
+    ))
     
     if not rating:
         raise HTTPException(
@@ -89,11 +92,21 @@ async def update_rating(
             detail="Rating not found"
         )
 
-    for key, value in rating_data.dict(exclude_unset=True).items():
+    changes = rating_data.dict(exclude_unset=True)
+    reaggregate = any(
+        key in changes and changes[key] != getattr(rating, key)
+        for key in ("rating", "category")
+    )
+    if reaggregate:
+        await apply_rating_delta(db, rating, -1)
+
+    for key, value in changes.items():
         setattr(rating, key, value)
 
-    db.commit()
-    db.refresh(rating)
+    if reaggregate:
+        await apply_rating_delta(db, rating, 1)
+    await db.commit()
+    await db.refresh(rating)
     return rating
 
 @router.delete("/employees/{employee_id}/ratings/{rating_id}")
@@ -101,7 +114,7 @@ async def delete_rating(
     employee_id: str,
     rating_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["Manager", "HR", "Admin"]:
         raise HTTPException(
@@ -109,10 +122,10 @@ async def delete_rating(
             detail="Not enough permissions"
         )
 
-    rating = db.query(models.PerformanceRating).filter(
+    rating = await db.scalar(select(models.PerformanceRating).where(
         models.PerformanceRating.id == rating_id,
         models.PerformanceRating.user_id == employee_id
-    ).first()
+    ))
     
     if not rating:
         raise HTTPException(
@@ -120,30 +133,31 @@ async def delete_rating(
             detail="Rating not found"
         )
 
-    db.delete(rating)
-    db.commit()
+    await apply_rating_delta(db, rating, -1)
+    await db.delete(rating)
+    await db.commit()
     return {"message": "Rating deleted successfully"}
 
 @router.get("/employees/{employee_id}/reviews", response_model=List[ReviewResponse])
 async def get_performance_reviews(
     employee_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if (current_user.id != employee_id and 
         current_user.role.name not in ["Manager", "HR", "Admin"] and
-        not db.query(models.User).filter(
+        not await db.scalar(select(models.User.id).where(
             models.User.manager_id == current_user.id,
             models.User.id == employee_id
-        ).first()):
+        ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
 
-    reviews = db.query(models.PerformanceReview).filter(
+    reviews = (await db.scalars(select(models.PerformanceReview).where(
         models.PerformanceReview.user_id == employee_id
-    ).all()
+    ))).all()
     return reviews
 
 @router.post("/employees/{employee_id}/reviews", response_model=ReviewResponse)
@@ -151,7 +165,7 @@ async def submit_performance_review(
     employee_id: str,
     review_data: ReviewCreate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["Manager", "HR", "Admin"]:
         raise HTTPException(
@@ -168,8 +182,8 @@ async def submit_performance_review(
     )
     
     db.add(review)
-    db.commit()
-    db.refresh(review)
+    await db.commit()
+    await db.refresh(review)
     return review
 
 @router.put("/employees/{employee_id}/reviews/{review_id}", 
@@ -179,7 +193,7 @@ async def update_performance_review(
     review_id: str,
     review_data: ReviewUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["Manager", "HR", "Admin"]:
         raise HTTPException(
@@ -187,10 +201,10 @@ async def update_performance_review(
             detail="Not enough permissions"
         )
 
-    review = db.query(models.PerformanceReview).filter(
+    review = await db.scalar(select(models.PerformanceReview).where(
         models.PerformanceReview.id == review_id,
         models.PerformanceReview.user_id == employee_id
-    ).first()
+    ))
     
     if not review:
         raise HTTPException(
@@ -206,8 +220,8 @@ async def update_performance_review(
     for key, value in review_data.dict(exclude_unset=True).items():
         setattr(review, key, value)
 
-    db.commit()
-    db.refresh(review)
+    await db.commit()
+    await db.refresh(review)
     return review
 
 @router.delete("/employees/{employee_id}/reviews/{review_id}")
@@ -215,7 +229,7 @@ async def delete_performance_review(
     employee_id: str,
     review_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["Manager", "HR", "Admin"]:
         raise HTTPException(
@@ -223,10 +237,10 @@ async def delete_performance_review(
             detail="Not enough permissions"
         )
 
-    review = db.query(models.PerformanceReview).filter(
+    review = await db.scalar(select(models.PerformanceReview).where(
         models.PerformanceReview.id == review_id,
         models.PerformanceReview.user_id == employee_id
-    ).first()
+    ))
     
     if not review:
         raise HTTPException(
@@ -234,14 +248,18 @@ async def delete_performance_review(
             detail="Review not found"
         )
 
-    db.delete(review)
-    db.commit()
+    await db.delete(review)
+    await db.commit()
     return {"message": "Review deleted successfully"}
 
 @router.get("/performance/reports", response_model=PerformanceReport)
 async def generate_performance_reports(
+    period_start: Optional[date] = None,
+    period_end: Optional[date] = None,
+    department_id: Optional[str] = None,
+    top_n: int = Query(5, ge=1, le=100),
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["Manager", "HR", "Admin"]:
         raise HTTPException(
@@ -249,40 +267,26 @@ async def generate_performance_reports(
             detail="Not enough permissions"
         )
 
-    # Calculate overall statistics
-    ratings = db.query(models.PerformanceRating).all()
-    all_ratings = [r.rating for r in ratings]
-    
-    rating_distribution = {}
-    for rating in range(1, 6):
-        rating_distribution[rating] = len([r for r in all_ratings if r == rating])
-
-    # Calculate department averages
-    dept_ratings = {}
-    departments = db.query(models.Department).all()
-    for dept in departments:
-        dept_users = db.query(models.User).filter(
-            models.User.department_id == dept.id
-        ).all()
-        dept_user_ids = [u.id for u in dept_users]
-        dept_ratings[dept.name] = mean(
-            [r.rating for r in ratings if r.user_id in dept_user_ids]
-        ) if ratings else 0
-
-    # Get top performers
-    top_performers = (
-        db.query(models.User)
-        .join(models.PerformanceRating)
-        .group_by(models.User.id)
-        .order_by(db.func.avg(models.PerformanceRating.rating).desc())
-        .limit(5)
-        .all()
+    report = await build_performance_report(
+        db,
+        period_start=period_start,
+        period_end=period_end,
+        department_id=department_id,
+        top_n=top_n
     )
+    return PerformanceReport(**report)
+
+@router.post("/performance/aggregates/rebuild")
+async def rebuild_performance_aggregates(
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    if current_user.role.name != "Admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
 
-    return PerformanceReport(
-        average_rating=mean(all_ratings) if all_ratings else 0,
-        rating_distribution=rating_distribution,
-        review_completion_rate=0.85,  # Example - implement actual calculation
-        department_averages=dept_ratings,
-        top_performers=[{"id": user.id, "name": user.name} for user in top_performers]
-    )
\ No newline at end of file
+    rows = await db.run_sync(rebuild_rating_aggregates)
+    await db.commit()
+    return {"message": "Rating aggregates rebuilt successfully", "rows": rows}
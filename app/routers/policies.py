@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from datetime import datetime
+import json
 import uuid
 
 from app.db.session import get_db
@@ -11,25 +14,31 @@ from app.schemas.policy import (
     ComplianceStatus, PolicyAcknowledgmentResponse
 )
 from app.core.auth import get_current_user_with_permissions
+from app.core.config import settings
+from app.core.exports import export_partitions
+from app.core.pagination import KeysetPagination
+from app.core.serialization import trusted_response
 
 router = APIRouter()
 
 @router.get("/policies", response_model=List[PolicyResponse])
 async def get_company_policies(
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    pagination: KeysetPagination = Depends()
 ):
-    policies = db.query(models.Policy).filter(
+    query = pagination.apply(select(models.Policy).where(
         models.Policy.status == "active"
-    ).all()
-    return policies
+    ), models.Policy)
+    policies = pagination.page((await db.scalars(query)).all())
+    return trusted_response(PolicyResponse, policies, pagination.response)
 
 @router.put("/policies/{policy_id}", response_model=PolicyResponse)
 async def update_policy(
     policy_id: str,
     policy_data: PolicyUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -37,7 +46,7 @@ async def update_policy(
             detail="Not enough permissions"
         )
 
-    policy = db.query(models.Policy).filter(models.Policy.id == policy_id).first()
+    policy = await db.scalar(select(models.Policy).where(models.Policy.id == policy_id))
     if not policy:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -47,15 +56,15 @@ async def update_policy(
     for key, value in policy_data.dict(exclude_unset=True).items():
         setattr(policy, key, value)
     
-    db.commit()
-    db.refresh(policy)
+    await db.commit()
+    await db.refresh(policy)
     return policy
 
 @router.post("/policies", response_model=PolicyResponse)
 async def create_policy(
     policy_data: PolicyCreate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -69,15 +78,15 @@ async def create_policy(
     )
     
     db.add(policy)
-    db.commit()
-    db.refresh(policy)
+    await db.commit()
+    await db.refresh(policy)
     return policy
 
 @router.delete("/policies/{policy_id}")
 async def delete_policy(
     policy_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -85,7 +94,7 @@ async def delete_policy(
             detail="Not enough permissions"
         )
 
-    policy = db.query(models.Policy).filter(models.Policy.id == policy_id).first()
+    policy = await db.scalar(select(models.Policy).where(models.Policy.id == policy_id))
     if not policy:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -94,13 +103,13 @@ async def delete_policy(
 
     # Soft delete by changing status to archived
     policy.status = "archived"
-    db.commit()
+    await db.commit()
     return {"message": "Policy archived successfully"}
 
 @router.get("/policies/compliance", response_model=List[ComplianceStatus])
 async def check_compliance_status(
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["Manager", "HR", "Admin"]:
         raise HTTPException(
@@ -108,78 +117,105 @@ async def check_compliance_status(
             detail="Not enough permissions"
         )
 
-    # Get all active policies
-    total_policies = db.query(models.Policy).filter(
+    mandatory = (
         models.Policy.status == "active",
         models.Policy.is_mandatory == True
-    ).count()
+    )
 
-    # Get compliance status for each user
-    users = db.query(models.User).filter(models.User.is_active == True)
+    users = select(models.User.id).where(models.User.is_active == True)
     if current_user.role.name == "Manager":
-        users = users.filter(models.User.manager_id == current_user.id)
-
-    compliance_stats = []
-    for user in users.all():
-        acknowledged = db.query(models.PolicyAcknowledgment).filter(
-            models.PolicyAcknowledgment.user_id == user.id
-        ).count()
-
-        pending_policies = db.query(models.Policy).filter(
-            models.Policy.status == "active",
-            models.Policy.is_mandatory == True,
-            ~models.Policy.id.in_(
-                db.query(models.PolicyAcknowledgment.policy_id).filter(
-                    models.PolicyAcknowledgment.user_id == user.id
-                )
-            )
-        ).all()
-
-        compliance_stats.append(ComplianceStatus(
-            total_policies=total_policies,
-            acknowledged_policies=acknowledged,
-            pending_policies=len(pending_policies),
-            compliance_rate=acknowledged/total_policies if total_policies > 0 else 1.0,
-            pending_acknowledgments=pending_policies
-        ))
+        users = users.where(models.User.manager_id == current_user.id)
+    users = users.subquery()
+
+    # Mandatory policies are fetched once and referenced by id below
+    policies = (await db.scalars(select(models.Policy).where(*mandatory))).all()
+    policy_json = {
+        policy.id: PolicyResponse.from_orm(policy).json() for policy in policies
+    }
+    total_policies = len(policies)
+
+    # One row per (user, pending mandatory policy), or a single row with a
+    # NULL policy for a user with nothing pending, ordered by user so each
+    # user is complete once the next one starts. Rows come from a
+    # server-side cursor, so memory stays bounded by one user's policies
+    acknowledgments = select(func.count()).where(
+        models.PolicyAcknowledgment.user_id == users.c.id
+    ).scalar_subquery()
+    acknowledged = select(models.PolicyAcknowledgment.id).where(
+        models.PolicyAcknowledgment.user_id == users.c.id,
+        models.PolicyAcknowledgment.policy_id == models.Policy.id
+    ).exists()
+    query = (
+        select(users.c.id, acknowledgments, models.Policy.id)
+        .select_from(users)
+        .outerjoin(models.Policy, and_(*mandatory, ~acknowledged))
+        .order_by(users.c.id, models.Policy.id)
+        .execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+    )
 
-    return compliance_stats
+    def compliance_entry(user_id, acknowledged_count, pending_ids):
+        summary = json.dumps({
+            "user_id": user_id,
+            "total_policies": total_policies,
+            "acknowledged_policies": acknowledged_count,
+            "pending_policies": len(pending_ids),
+            "compliance_rate": acknowledged_count/total_policies if total_policies > 0 else 1.0
+        })
+        items = ",".join(policy_json[policy_id] for policy_id in pending_ids)
+        return summary[:-1] + f', "pending_acknowledgments": [{items}]}}'
+
+    async def generate():
+        yield "["
+        user = None
+        async for partition in export_partitions(db, query):
+            for user_id, acknowledged_count, policy_id in partition:
+                if user is None or user[0] != user_id:
+                    if user is not None:
+                        yield compliance_entry(*user) + ","
+                    user = (user_id, acknowledged_count, [])
+                if policy_id is not None:
+                    user[2].append(policy_id)
+        if user is not None:
+            yield compliance_entry(*user)
+        yield "]"
+
+    return StreamingResponse(generate(), media_type="application/json")
 
 @router.get("/employees/{employee_id}/compliance", response_model=ComplianceStatus)
 async def get_employee_compliance_status(
     employee_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if (current_user.id != employee_id and 
         current_user.role.name not in ["Manager", "HR", "Admin"] and
-        not db.query(models.User).filter(
+        not await db.scalar(select(models.User.id).where(
             models.User.manager_id == current_user.id,
             models.User.id == employee_id
-        ).first()):
+        ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
 
-    total_policies = db.query(models.Policy).filter(
+    total_policies = await db.scalar(select(func.count()).select_from(models.Policy).where(
         models.Policy.status == "active",
         models.Policy.is_mandatory == True
-    ).count()
+    ))
 
-    acknowledged = db.query(models.PolicyAcknowledgment).filter(
+    acknowledged = await db.scalar(select(func.count()).select_from(models.PolicyAcknowledgment).where(
         models.PolicyAcknowledgment.user_id == employee_id
-    ).count()
+    ))
 
-    pending_policies = db.query(models.Policy).filter(
+    pending_policies = (await db.scalars(select(models.Policy).where(
         models.Policy.status == "active",
         models.Policy.is_mandatory == True,
         ~models.Policy.id.in_(
-            db.query(models.PolicyAcknowledgment.policy_id).filter(
+            select(models.PolicyAcknowledgment.policy_id).where(
                 models.PolicyAcknowledgment.user_id == employee_id
             )
         )
-    ).all()
+    ))).all()
 
     return ComplianceStatus(
         total_policies=total_policies,
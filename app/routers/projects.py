@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from datetime import datetime
 import uuid
@@ -18,24 +20,26 @@ router = APIRouter()
 async def list_user_projects(
     user_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List all projects assigned to a user"""
     if (current_user.id != user_id and 
         current_user.role.name not in ["Manager", "HR", "Admin"] and
-        not db.query(models.User).filter(
+        not await db.scalar(select(models.User.id).where(
             models.User.manager_id == current_user.id,
             models.User.id == user_id
-        ).first()):
+        ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
 
-    assignments = db.query(models.ProjectAssignment).filter(
+    assignments = (await db.scalars(select(models.ProjectAssignment).options(
+        selectinload(models.ProjectAssignment.project)
+    ).where(
         models.ProjectAssignment.user_id == user_id,
         models.ProjectAssignment.status == "active"
-    ).all()
+    ))).all()
     return assignments
 
 @router.post("/users/{user_id}/projects", response_model=ProjectAssignmentResponse)
@@ -43,7 +47,7 @@ async def assign_project(
     user_id: str,
     assignment_data: ProjectAssignmentCreate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Assign a project to a user"""
     if current_user.role.name not in ["Manager", "HR", "Admin"]:
@@ -53,10 +57,10 @@ async def assign_project(
         )
 
     # Verify project exists
-    project = db.query(models.Project).filter(
+    project = await db.scalar(select(models.Project).where(
         models.Project.id == assignment_data.project_id,
         models.Project.status == "active"
-    ).first()
+    ))
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -64,11 +68,11 @@ async def assign_project(
         )
 
     # Check if user is already assigned to this project
-    existing_assignment = db.query(models.ProjectAssignment).filter(
+    existing_assignment = await db.scalar(select(models.ProjectAssignment).where(
         models.ProjectAssignment.user_id == user_id,
         models.ProjectAssignment.project_id == assignment_data.project_id,
         models.ProjectAssignment.status == "active"
-    ).first()
+    ))
     if existing_assignment:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -83,8 +87,8 @@ async def assign_project(
     )
     
     db.add(assignment)
-    db.commit()
-    db.refresh(assignment)
+    await db.commit()
+    await db.refresh(assignment, ["project"])
     return assignment
 
 @router.delete("/users/{user_id}/projects/{project_id}")
@@ -92,7 +96,7 @@ async def remove_project(
     user_id: str,
     project_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Remove a project assignment from a user"""
     if current_user.role.name not in ["Manager", "HR", "Admin"]:
@@ -101,11 +105,11 @@ async def remove_project(
             detail="Not enough permissions"
         )
 
-    assignment = db.query(models.ProjectAssignment).filter(
+    assignment = await db.scalar(select(models.ProjectAssignment).where(
         models.ProjectAssignment.user_id == user_id,
         models.ProjectAssignment.project_id == project_id,
         models.ProjectAssignment.status == "active"
-    ).first()
+    ))
     
     if not assignment:
         raise HTTPException(
@@ -115,5 +119,5 @@ async def remove_project(
 
     assignment.status = "removed"
     assignment.end_date = datetime.now().date()
-    db.commit()
+    await db.commit()
     return {"message": "Project assignment removed successfully"}
\ No newline at end of file
@@ -1,6 +1,8 @@
 # app/routers/salary.py
-from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Path, Query
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime, date
 import uuid
@@ -10,9 +12,15 @@ from app.db import models
 from app.schemas.salary import (
     SalaryBase, SalaryCreate, SalaryUpdate, SalaryResponse,
     PayslipCreate, PayslipResponse,
-    TaxInfoCreate, TaxInfoUpdate, TaxInfoResponse
+    TaxInfoCreate, TaxInfoUpdate, TaxInfoResponse,
+    PayrollRunCreate, PayrollRunResponse,
+    TaxComparison, TaxRegimeSummary
 )
 from app.core.auth import get_current_user_with_permissions
+from app.core.payroll import (
+    claim_statement, effective_salaries_query, gross_pay, payslip_values, period_end, run_payroll
+)
+from app.core.tax import compute_tax
 
 router = APIRouter()
 
@@ -21,23 +29,23 @@ router = APIRouter()
 async def get_salary(
     employee_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # Check permissions
     if (current_user.id != employee_id and 
         current_user.role.name not in ["Manager", "HR", "Admin"] and
-        not db.query(models.User).filter(
+        not await db.scalar(select(models.User.id).where(
             models.User.manager_id == current_user.id,
             models.User.id == employee_id
-        ).first()):
+        ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
 
-    salary = db.query(models.Salary).filter(
+    salary = await db.scalar(select(models.Salary).where(
         models.Salary.user_id == employee_id
-    ).order_by(models.Salary.effective_date.desc()).first()
+    ).order_by(models.Salary.effective_date.desc()).limit(1))
     
     if not salary:
         raise HTTPException(
@@ -53,7 +61,7 @@ async def update_salary(
     employee_id: str,
     salary_data: SalaryUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -73,8 +81,8 @@ async def update_salary(
     new_salary.net_salary = new_salary.gross_salary - new_salary.deductions
     
     db.add(new_salary)
-    db.commit()
-    db.refresh(new_salary)
+    await db.commit()
+    await db.refresh(new_salary)
     
     return new_salary
 
@@ -83,22 +91,22 @@ async def update_salary(
 async def get_salary_history(
     employee_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if (current_user.id != employee_id and 
         current_user.role.name not in ["Manager", "HR", "Admin"] and
-        not db.query(models.User).filter(
+        not await db.scalar(select(models.User.id).where(
             models.User.manager_id == current_user.id,
             models.User.id == employee_id
-        ).first()):
+        ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
 
-    salaries = db.query(models.Salary).filter(
+    salaries = (await db.scalars(select(models.Salary).where(
         models.Salary.user_id == employee_id
-    ).order_by(models.Salary.effective_date.desc()).all()
+    ).order_by(models.Salary.effective_date.desc()))).all()
     
     return salaries
 
@@ -108,7 +116,7 @@ async def generate_payslip(
     employee_id: str,
     payslip_data: PayslipCreate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -116,10 +124,21 @@ async def generate_payslip(
             detail="Not enough permissions"
         )
 
-    # Get current salary details
-    salary = db.query(models.Salary).filter(
-        models.Salary.user_id == employee_id
-    ).order_by(models.Salary.effective_date.desc()).first()
+    if await db.scalar(select(models.Payslip.id).where(
+        models.Payslip.user_id == employee_id,
+        models.Payslip.year == payslip_data.year,
+        models.Payslip.month == payslip_data.month
+    )):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Payslip already generated for this period"
+        )
+
+    # Salary in effect at the end of the payslip month
+    salary = await db.scalar(select(models.Salary).where(
+        models.Salary.user_id == employee_id,
+        models.Salary.effective_date <= period_end(payslip_data.year, payslip_data.month)
+    ).order_by(models.Salary.effective_date.desc()).limit(1))
     
     if not salary:
         raise HTTPException(
@@ -127,32 +146,98 @@ async def generate_payslip(
             detail="Salary details not found"
         )
     
+    tax_info = await db.scalar(select(models.TaxInfo).where(models.TaxInfo.user_id == employee_id))
+    tax = compute_tax(
+        [gross_pay(salary)],
+        [tax_info.tax_declarations if tax_info else None],
+        [tax_info.tax_regime if tax_info else None]
+    )
+
     # Create payslip
     payslip = models.Payslip(
         id=str(uuid.uuid4()),
         user_id=employee_id,
-        basic_salary=salary.basic_salary,
-        allowances=salary.allowances,
-        deductions=salary.deductions,
-        gross_salary=salary.gross_salary,
-        net_salary=salary.net_salary,
         status="generated",
         generated_at=datetime.utcnow(),
-        **payslip_data.dict()
+        **payslip_values(salary, tax.monthly_liability.item()),
+        **payslip_data.dict(exclude={"user_id"})
     )
     
     db.add(payslip)
-    db.commit()
-    db.refresh(payslip)
+    await db.commit()
+    await db.refresh(payslip)
     
     return payslip
 
+# Start or resume the payroll run for a month
+@router.post("/payroll/runs", response_model=PayrollRunResponse,
+             status_code=status.HTTP_202_ACCEPTED)
+async def start_payroll_run(
+    run_data: PayrollRunCreate,
+    background_tasks: BackgroundTasks,
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    if current_user.role.name not in ["HR", "Admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    run_query = select(models.PayrollRun).where(
+        models.PayrollRun.year == run_data.year,
+        models.PayrollRun.month == run_data.month
+    )
+    run = await db.scalar(run_query)
+    if not run:
+        db.add(models.PayrollRun(
+            id=str(uuid.uuid4()),
+            status="pending",
+            started_by=current_user.id,
+            **run_data.dict()
+        ))
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Another request created the run for this month first
+            await db.rollback()
+        run = await db.scalar(run_query)
+
+    claimed = (await db.execute(claim_statement(run.id))).rowcount
+    await db.commit()
+    if claimed:
+        background_tasks.add_task(run_payroll, run.id)
+
+    await db.refresh(run)
+    return run
+
+# Payroll run progress
+@router.get("/payroll/runs/{run_id}", response_model=PayrollRunResponse)
+async def get_payroll_run(
+    run_id: str,
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    if current_user.role.name not in ["HR", "Admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    run = await db.scalar(select(models.PayrollRun).where(models.PayrollRun.id == run_id))
+    if not run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Payroll run not found"
+        )
+    return run
+
 # List Payslips
 @router.get("/employees/{employee_id}/payslips", response_model=List[PayslipResponse])
 async def list_payslips(
     employee_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.id != employee_id and current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -160,9 +245,9 @@ async def list_payslips(
             detail="Not enough permissions"
         )
 
-    payslips = db.query(models.Payslip).filter(
+    payslips = (await db.scalars(select(models.Payslip).where(
         models.Payslip.user_id == employee_id
-    ).order_by(models.Payslip.year.desc(), models.Payslip.month.desc()).all()
+    ).order_by(models.Payslip.year.desc(), models.Payslip.month.desc()))).all()
     
     return payslips
 
@@ -171,7 +256,7 @@ async def list_payslips(
 async def get_tax_info(
     employee_id: str,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.id != employee_id and current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -179,7 +264,7 @@ async def get_tax_info(
             detail="Not enough permissions"
         )
 
-    tax_info = db.query(models.TaxInfo).filter(models.TaxInfo.user_id == employee_id).first()
+    tax_info = await db.scalar(select(models.TaxInfo).where(models.TaxInfo.user_id == employee_id))
     if not tax_info:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -194,7 +279,7 @@ async def update_tax_info(
     employee_id: str,
     tax_data: TaxInfoUpdate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role.name not in ["HR", "Admin"]:
         raise HTTPException(
@@ -202,7 +287,7 @@ async def update_tax_info(
             detail="Not enough permissions"
         )
 
-    tax_info = db.query(models.TaxInfo).filter(models.TaxInfo.user_id == employee_id).first()
+    tax_info = await db.scalar(select(models.TaxInfo).where(models.TaxInfo.user_id == employee_id))
     if not tax_info:
         tax_info = models.TaxInfo(
             id=str(uuid.uuid4()),
@@ -213,7 +298,74 @@ async def update_tax_info(
     for key, value in tax_data.dict(exclude_unset=True).items():
         setattr(tax_info, key, value)
         
-    db.commit()
-    db.refresh(tax_info)
+    await db.commit()
+    await db.refresh(tax_info)
     
-    return tax_info
\ No newline at end of file
+    return tax_info
+
+# Compare old and new regime liabilities for an employee
+@router.get("/employees/{employee_id}/tax/comparison", response_model=TaxComparison)
+async def compare_tax_regimes(
+    employee_id: str,
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    if current_user.id != employee_id and current_user.role.name not in ["HR", "Admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    salary = await db.scalar(select(models.Salary).where(
+        models.Salary.user_id == employee_id,
+        models.Salary.effective_date <= date.today()
+    ).order_by(models.Salary.effective_date.desc()).limit(1))
+    if not salary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Salary details not found"
+        )
+
+    tax_info = await db.scalar(select(models.TaxInfo).where(models.TaxInfo.user_id == employee_id))
+    tax = compute_tax(
+        [gross_pay(salary)],
+        [tax_info.tax_declarations if tax_info else None],
+        [tax_info.tax_regime if tax_info else None]
+    )
+    old_regime_tax, new_regime_tax = tax.old_regime.item(), tax.new_regime.item()
+    return TaxComparison(
+        user_id=employee_id,
+        annual_income=tax.annual_income.item(),
+        old_regime_tax=old_regime_tax,
+        new_regime_tax=new_regime_tax,
+        current_regime=tax.regime[0],
+        recommended_regime="old" if old_regime_tax < new_regime_tax else "new"
+    )
+
+# What-if regime comparison across all active employees
+@router.get("/tax/regime-comparison", response_model=TaxRegimeSummary)
+async def compare_tax_regimes_for_company(
+    current_user: models.User = Depends(get_current_user_with_permissions),
+    db: AsyncSession = Depends(get_db)
+):
+    if current_user.role.name not in ["HR", "Admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    today = date.today()
+    rows = (await db.execute(effective_salaries_query(today.year, today.month))).all()
+    tax = compute_tax(
+        [gross_pay(row) for row in rows],
+        [row.tax_declarations for row in rows],
+        [row.tax_regime for row in rows]
+    )
+    return TaxRegimeSummary(
+        employees=len(rows),
+        current_total=float(tax.liability.sum()),
+        old_regime_total=float(tax.old_regime.sum()),
+        new_regime_total=float(tax.new_regime.sum()),
+        better_under_old=int((tax.old_regime < tax.new_regime).sum()),
+        better_under_new=int((tax.old_regime >= tax.new_regime).sum())
+    )
@@ -1,7 +1,8 @@
 # app/routers/users.py
 from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import uuid
 
@@ -10,8 +11,11 @@ from app.db import models
 from app.schemas.user import (
     UserCreate, UserUpdate, UserResponse, UserBase, UserSearchParams
 )
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.security import get_password_hash_async
 from app.core.auth import get_current_active_user, get_current_user_with_permissions
+from app.core.principal_cache import principal_cache
+from app.core.pagination import KeysetPagination
+from app.core.serialization import trusted_response
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -22,22 +26,22 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 async def get_user(
         user_id: str = Path(..., description="The ID of the user to retrieve"),
         current_user: models.User = Depends(get_current_user_with_permissions),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     # Check permissions - user can view their own details, managers can view their team,
     # HR and Admin can view all
     if (current_user.id != user_id and
             current_user.role.name not in ["HR", "Admin"] and
-            not db.query(models.User).filter(
+            not await db.scalar(select(models.User.id).where(
                 models.User.manager_id == current_user.id,
                 models.User.id == user_id
-            ).first()):
+            ))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions to access this resource"
         )
 
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = await db.scalar(select(models.User).where(models.User.id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -53,7 +57,7 @@ async def update_user(
         user_data: UserUpdate,
         user_id: str = Path(..., description="The ID of the user to update"),
         current_user: models.User = Depends(get_current_user_with_permissions),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     # Check permissions
     if current_user.id != user_id and current_user.role.name not in ["HR", "Admin"]:
@@ -62,7 +66,7 @@ async def update_user(
             detail="Not enough permissions to update this user"
         )
 
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = await db.scalar(select(models.User).where(models.User.id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -78,7 +82,7 @@ async def update_user(
             update_data["manager_id"] = None
         else:
             # Verify manager exists
-            manager = db.query(models.User).filter(models.User.id == update_data["manager_id"]).first()
+            manager = await db.scalar(select(models.User.id).where(models.User.id == update_data["manager_id"]))
             if not manager:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -90,10 +94,11 @@ async def update_user(
         setattr(user, key, value)
 
     try:
-        db.commit()
+        await db.commit()
+        principal_cache.invalidate(user_id)
         return {"message": "User details updated successfully"}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error updating user: {str(e)}"
@@ -105,7 +110,7 @@ async def update_user(
 async def delete_user(
         user_id: str = Path(..., description="The ID of the user to delete"),
         current_user: models.User = Depends(get_current_user_with_permissions),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     # Check permissions - only HR and Admin can delete users
     if current_user.role.name not in ["HR", "Admin"]:
@@ -114,7 +119,7 @@ async def delete_user(
             detail="Not enough permissions to delete users"
         )
 
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = await db.scalar(select(models.User).where(models.User.id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -124,7 +129,8 @@ async def delete_user(
     # Soft delete by setting is_active to False instead of actually deleting
     user.is_active = False
     user.status = "inactive"
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate(user_id)
 
     return {"message": "User deleted successfully"}
 
@@ -137,38 +143,40 @@ async def search_users(
         role_id: Optional[str] = Query(None, description="Filter by role ID"),
         status: Optional[str] = Query(None, description="Filter by user status"),
         current_user: models.User = Depends(get_current_user_with_permissions),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db),
+        pagination: KeysetPagination = Depends()
 ):
     # Build query
-    query = db.query(models.User)
+    query = select(models.User)
 
     if name:
-        query = query.filter(
+        query = query.where(
             (models.User.first_name.contains(name)) |
             (models.User.last_name.contains(name))
         )
 
     if department_id:
-        query = query.filter(models.User.department_id == department_id)
+        query = query.where(models.User.department_id == department_id)
 
     if role_id:
-        query = query.filter(models.User.role_id == role_id)
+        query = query.where(models.User.role_id == role_id)
 
     if status:
-        query = query.filter(models.User.status == status)
+        query = query.where(models.User.status == status)
 
     # For managers, only show their team members
     if current_user.role.name == "Manager":
-        query = query.filter(models.User.manager_id == current_user.id)
+        query = query.where(models.User.manager_id == current_user.id)
 
-    users = query.all()
-    return users
+    query = pagination.apply(query, models.User)
+    users = pagination.page((await db.scalars(query)).all())
+    return trusted_response(UserResponse, users, pagination.response)
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user_data: UserCreate,
     current_user: models.User = Depends(get_current_user_with_permissions),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # Check permissions
     if current_user.role.name not in ["HR", "Admin"]:
@@ -178,9 +186,9 @@ async def create_user(
         )
 
     # Check if user with this email already exists
-    existing_user = db.query(models.User).filter(
+    existing_user = await db.scalar(select(models.User.id).where(
         models.User.email.ilike(user_data.email)
-    ).first()
+    ))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -192,7 +200,7 @@ async def create_user(
     if user_dict.get("manager_id") == "string":
         user_dict.pop("manager_id")
     elif user_dict.get("manager_id"):
-        manager = db.query(models.User).filter(models.User.id == user_dict["manager_id"]).first()
+        manager = await db.scalar(select(models.User.id).where(models.User.id == user_dict["manager_id"]))
         if not manager:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -200,7 +208,7 @@ async def create_user(
             )
 
     # Create new user with hashed password
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     user = models.User(
         id=str(uuid.uuid4()),
         hashed_password=hashed_password,
@@ -208,7 +216,7 @@ async def create_user(
     )
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     return user
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date, datetime
 from typing import Optional
 
@@ -8,6 +8,7 @@ class AttendanceBase(BaseModel):
     check_out: Optional[datetime] = None
     status: str
     work_hours: Optional[str] = None
+    work_minutes: Optional[int] = None
 
 class AttendanceCreate(AttendanceBase):
     pass
@@ -15,7 +16,7 @@ class AttendanceCreate(AttendanceBase):
 class AttendanceUpdate(BaseModel):
     check_out: Optional[datetime] = None
     status: Optional[str] = None
-    work_hours: Optional[str] = None
+    work_minutes: Optional[int] = Field(None, ge=0)
 
 class AttendanceResponse(AttendanceBase):
     id: str
@@ -24,4 +25,15 @@ class AttendanceResponse(AttendanceBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class AttendanceMonthlySummary(BaseModel):
+    user_id: str
+    name: str
+    department_id: Optional[str] = None
+    year: int
+    month: int
+    present_days: int
+    absent_days: int
+    half_days: int
+    total_minutes: int
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import date, datetime
 
@@ -6,6 +6,7 @@ class LeaveTypeBase(BaseModel):
     name: str
     description: Optional[str] = None
     default_days: int = 0
+    max_carry_forward_days: int = 0
     is_active: bool = True
 
 class LeaveTypeCreate(LeaveTypeBase):
@@ -14,6 +15,7 @@ class LeaveTypeCreate(LeaveTypeBase):
 class LeaveTypeUpdate(LeaveTypeBase):
     name: Optional[str] = None
     default_days: Optional[int] = None
+    max_carry_forward_days: Optional[int] = None
     is_active: Optional[bool] = None
 
 class LeaveTypeResponse(LeaveTypeBase):
@@ -40,6 +42,7 @@ class LeaveBalanceUpdate(BaseModel):
 class LeaveBalanceResponse(LeaveBalanceBase):
     id: str
     user_id: str
+    reserved_days: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -63,9 +66,92 @@ class LeaveResponse(LeaveBase):
     id: str
     user_id: str
     status: str
+    days: Optional[int] = None
     created_at: datetime
     updated_at: datetime
     leave_type: LeaveTypeResponse
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class HolidayBase(BaseModel):
+    date: date
+    name: str
+    department_id: Optional[str] = None
+
+class HolidayCreate(HolidayBase):
+    pass
+
+class HolidayResponse(HolidayBase):
+    id: str
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        orm_mode = True
+
+class LeaveUsageReport(BaseModel):
+    leave_type_id: str
+    leave_type_name: str
+    leaves: int
+    working_days: int
+
+class LeaveValidationItem(BaseModel):
+    user_id: str
+    start_date: date
+    end_date: date
+
+class LeaveValidationRequest(BaseModel):
+    leaves: List[LeaveValidationItem] = Field(..., max_items=10000)
+
+class LeaveConflict(BaseModel):
+    leave_id: Optional[str] = None  # existing leave
+    index: Optional[int] = None  # other item in the batch
+    start_date: date
+    end_date: date
+
+class LeaveValidationResult(BaseModel):
+    index: int
+    valid: bool
+    conflicts: List[LeaveConflict]
+
+class LeaveDecisionItem(BaseModel):
+    leave_id: str
+    decision: str = Field(..., regex="^(approve|reject)$")
+    comment: Optional[str] = None  # required to reject
+
+class LeaveDecisionRequest(BaseModel):
+    decisions: List[LeaveDecisionItem] = Field(..., min_items=1, max_items=1000)
+
+class LeaveDecisionResult(BaseModel):
+    leave_id: str
+    decision: str
+    success: bool
+    status: Optional[str] = None
+    detail: Optional[str] = None
+
+class AbsentEmployee(BaseModel):
+    user_id: str
+    name: str
+
+class AbsenceDay(BaseModel):
+    date: date
+    count: int
+    employees: List[AbsentEmployee]
+
+class LeaveAccrualRequest(BaseModel):
+    year: int = Field(..., ge=2000, le=2100)
+
+class LeaveAccrualRunResponse(LeaveAccrualRequest):
+    id: str
+    status: str
+    users_processed: int
+    balances_created: int
+    error: Optional[str]
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        orm_mode = True
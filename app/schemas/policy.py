@@ -32,6 +32,7 @@ class PolicyResponse(PolicyBase):
         orm_mode = True
 
 class ComplianceStatus(BaseModel):
+    user_id: Optional[str] = None
     total_policies: int
     acknowledged_policies: int
     pending_policies: int
@@ -1,5 +1,5 @@
 # app/schemas/salary.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import date, datetime
 
@@ -70,4 +70,38 @@ class TaxInfoResponse(TaxInfoBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class PayrollRunCreate(BaseModel):
+    month: int = Field(..., ge=1, le=12)
+    year: int = Field(..., ge=2000, le=2100)
+
+class PayrollRunResponse(PayrollRunCreate):
+    id: str
+    status: str
+    total_employees: int
+    processed_employees: int
+    error: Optional[str]
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        orm_mode = True
+
+class TaxComparison(BaseModel):
+    user_id: str
+    annual_income: float
+    old_regime_tax: float
+    new_regime_tax: float
+    current_regime: str
+    recommended_regime: str
+
+class TaxRegimeSummary(BaseModel):
+    employees: int
+    current_total: float
+    old_regime_total: float
+    new_regime_total: float
+    better_under_old: int
+    better_under_new: int
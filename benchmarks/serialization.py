@@ -0,0 +1,105 @@
+# benchmarks/serialization.py
+"""
+List endpoint serialization: FastAPI's default response_model path
+(validation + jsonable_encoder + json) against trusted_response (trusted
+dicts + orjson), on transient ORM rows so no database is needed.
+
+    python -m benchmarks.serialization [--rows 10000] [--repeat 5]
+
+Both paths must produce the same JSON document, or the run fails.
+"""
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from datetime import date, datetime, timedelta
+from typing import List
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+from app.core.serialization import trusted_response
+from app.db import models
+from app.schemas.attendance import AttendanceResponse
+from app.schemas.leave import LeaveResponse
+
+
+def leave_rows(count: int) -> list:
+    now = datetime(2026, 1, 1, 9, 30)
+    leave_types = [
+        models.LeaveType(
+            id=str(uuid.uuid4()), name=name, description=f"{name} leave", default_days=12,
+            max_carry_forward_days=5, is_active=True, created_at=now, updated_at=now
+        )
+        for name in ("Annual", "Sick", "Casual", "Unpaid")
+    ]
+    rows = []
+    for index in range(count):
+        leave_type = leave_types[index % len(leave_types)]
+        start = date(2026, 1, 5) + timedelta(days=index % 300)
+        rows.append(models.Leave(
+            id=str(uuid.uuid4()), user_id=str(uuid.uuid4()), leave_type_id=leave_type.id,
+            leave_type=leave_type, start_date=start, end_date=start + timedelta(days=2),
+            reason="Family event", status="pending", days=3,
+            created_at=now + timedelta(seconds=index), updated_at=now + timedelta(seconds=index)
+        ))
+    return rows
+
+
+def attendance_rows(count: int) -> list:
+    now = datetime(2026, 1, 1, 9, 30)
+    rows = []
+    for index in range(count):
+        day = date(2026, 1, 1) + timedelta(days=index % 300)
+        check_in = datetime.combine(day, datetime.min.time()) + timedelta(hours=9)
+        rows.append(models.Attendance(
+            id=str(uuid.uuid4()), user_id=str(uuid.uuid4()), date=day, check_in=check_in,
+            check_out=check_in + timedelta(hours=8, minutes=15), status="present",
+            work_minutes=495, created_at=now, updated_at=now
+        ))
+    return rows
+
+
+def default_path(schema, rows) -> bytes:
+    """What FastAPI does for a handler returning ORM rows under response_model=List[schema]"""
+    field = create_response_field(name="response", type_=List[schema])
+    content = asyncio.run(serialize_response(field=field, response_content=rows))
+    return JSONResponse(content).body
+
+
+def trusted_path(schema, rows) -> bytes:
+    return trusted_response(schema, rows).body
+
+
+def best_of(repeat: int, fn, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, schema, rows in (
+        ("leaves", LeaveResponse, leave_rows(args.rows)),
+        ("attendance", AttendanceResponse, attendance_rows(args.rows)),
+    ):
+        if json.loads(default_path(schema, rows)) != json.loads(trusted_path(schema, rows)):
+            raise SystemExit(f"{name}: trusted_response output differs from response_model output")
+        default_ms = best_of(args.repeat, default_path, schema, rows)
+        trusted_ms = best_of(args.repeat, trusted_path, schema, rows)
+        print(
+            f"{name:<12}{args.rows} rows  response_model + json {default_ms:8.1f} ms"
+            f"  trusted + orjson {trusted_ms:8.1f} ms  ({default_ms / trusted_ms:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""add_attendance_work_minutes
+
+Revision ID: 1b6e9d3a7c52
+Revises: a8d4f2c6b931
+Create Date: 2026-10-17 19:12:44.610327
+
+Work duration is stored as an integer number of minutes so it can be
+summed in SQL. Existing work_hours strings are backfilled: "H:MM" values
+and decimal hours ("7.5") are converted, and rows whose string cannot be
+parsed fall back to the check-in/check-out difference.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = '1b6e9d3a7c52'
+down_revision = 'a8d4f2c6b931'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('attendance', sa.Column('work_minutes', sa.Integer(), nullable=True))
+
+    # The CASE guards LEFT() itself: SQL Server may evaluate the SET
+    # expression before the WHERE filter, and a negative length aborts
+    op.execute(
+        "UPDATE attendance SET work_minutes = "
+        "TRY_CAST(CASE WHEN CHARINDEX(':', w) > 1 THEN LEFT(w, CHARINDEX(':', w) - 1) END AS int) * 60 "
+        "+ TRY_CAST(SUBSTRING(w, CHARINDEX(':', w) + 1, 2) AS int) "
+        "FROM attendance CROSS APPLY (SELECT LTRIM(RTRIM(work_hours)) AS w) t "
+        "WHERE CHARINDEX(':', w) > 1"
+    )
+    op.execute(
+        "UPDATE attendance SET work_minutes = "
+        "CAST(ROUND(TRY_CAST(LTRIM(RTRIM(work_hours)) AS decimal(9, 2)) * 60, 0) AS int) "
+        "WHERE work_minutes IS NULL AND work_hours IS NOT NULL"
+    )
+    op.execute(
+        "UPDATE attendance SET work_minutes = DATEDIFF(minute, check_in, check_out) "
+        "WHERE work_minutes IS NULL AND check_in IS NOT NULL AND check_out >= check_in"
+    )
+
+
+def downgrade():
+    op.drop_column('attendance', 'work_minutes')
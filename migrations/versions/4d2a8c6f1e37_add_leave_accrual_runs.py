@@ -0,0 +1,46 @@
+"""add_leave_accrual_runs
+
+Revision ID: 4d2a8c6f1e37
+Revises: 9e4b2d7f1a63
+Create Date: 2026-10-18 09:14:27.530418
+
+The year-end leave accrual runs in the background; each run records its
+progress and the last user of its last committed chunk, so a crashed run
+resumes from there.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = '4d2a8c6f1e37'
+down_revision = '9e4b2d7f1a63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'leave_accrual_runs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('users_processed', sa.Integer(), nullable=True),
+        sa.Column('balances_created', sa.Integer(), nullable=True),
+        sa.Column('last_user_id', sa.String(length=36), nullable=True),
+        sa.Column('error', sa.String(length=1000), nullable=True),
+        sa.Column('started_by', sa.String(length=36), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['started_by'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('year')
+    )
+    op.create_index(op.f('ix_leave_accrual_runs_id'), 'leave_accrual_runs', ['id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_leave_accrual_runs_id'), table_name='leave_accrual_runs')
+    op.drop_table('leave_accrual_runs')
@@ -0,0 +1,52 @@
+"""add_attendance_rollups
+
+Revision ID: 7c3f5a1e8d46
+Revises: 1b6e9d3a7c52
+Create Date: 2026-10-17 20:26:05.318204
+
+Creates attendance_rollups and fills it from the existing attendance
+rows. POST /attendance/rollups/rebuild or
+`python -m app.core.attendance_rollups` recompute it later.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = '7c3f5a1e8d46'
+down_revision = '1b6e9d3a7c52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'attendance_rollups',
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Integer(), nullable=False),
+        sa.Column('present_days', sa.Integer(), nullable=False),
+        sa.Column('absent_days', sa.Integer(), nullable=False),
+        sa.Column('half_days', sa.Integer(), nullable=False),
+        sa.Column('total_minutes', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'year', 'month')
+    )
+    op.create_index('ix_attendance_rollups_year_month', 'attendance_rollups', ['year', 'month'])
+
+    op.execute(
+        "INSERT INTO attendance_rollups (user_id, year, month, present_days, absent_days, "
+        "half_days, total_minutes, updated_at) "
+        "SELECT user_id, YEAR(date), MONTH(date), "
+        "SUM(CASE WHEN status = 'present' THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN status = 'absent' THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN status = 'half-day' THEN 1 ELSE 0 END), "
+        "COALESCE(SUM(work_minutes), 0), GETUTCDATE() "
+        "FROM attendance GROUP BY user_id, YEAR(date), MONTH(date)"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_attendance_rollups_year_month', table_name='attendance_rollups')
+    op.drop_table('attendance_rollups')
@@ -0,0 +1,128 @@
+"""add_foreign_key_hot_path_indexes
+
+Revision ID: 95d154eb00a7
+Revises: 40349126cfe2
+Create Date: 2026-10-17 09:12:41.203518
+
+Adds composite indexes matched to the router query shapes, and unique
+constraints where the routers already assume one row per key:
+attendance (user_id, date), leave_balances (user_id, leave_type_id, year)
+and payslips (user_id, year, month). Duplicate rows for those keys must be
+cleaned up before upgrading.
+
+Run with `alembic -x benchmark=true upgrade head` to log the estimated
+query plan (physical operators and subtree cost) of each hot query before
+and after the indexes are created.
+"""
+from alembic import op, context
+import sqlalchemy as sa
+from xml.etree import ElementTree
+import logging
+
+
+# revision identifiers, used by Alembic
+revision = '95d154eb00a7'
+down_revision = '40349126cfe2'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+SHOWPLAN_NS = "{http://schemas.microsoft.com/sqlserver/2004/07/showplan}"
+
+INDEXES = [
+    ('ix_users_manager_id', 'users', ['manager_id'], {}),
+    ('ix_users_department_id', 'users', ['department_id'], {}),
+    ('ix_users_created_at_id', 'users', ['created_at', 'id'], {}),
+    ('ix_leaves_user_id_start_date', 'leaves', ['user_id', 'start_date'], {}),
+    ('ix_leaves_status_start_date', 'leaves', ['status', 'start_date'],
+     {'mssql_include': ['end_date', 'user_id']}),
+    ('ix_leaves_created_at_id', 'leaves', ['created_at', 'id'], {}),
+    ('ix_attendance_date', 'attendance', ['date'], {'mssql_include': ['user_id', 'status']}),
+    ('ix_attendance_created_at_id', 'attendance', ['created_at', 'id'], {}),
+    ('ix_salaries_user_id_effective_date', 'salaries', ['user_id', 'effective_date'], {}),
+    ('ix_policy_acknowledgments_user_id_policy_id', 'policy_acknowledgments', ['user_id', 'policy_id'], {}),
+    ('ix_project_assignments_user_id_project_id_status', 'project_assignments',
+     ['user_id', 'project_id', 'status'], {}),
+    ('ix_performance_ratings_user_id', 'performance_ratings', ['user_id'], {}),
+    ('ix_performance_reviews_user_id', 'performance_reviews', ['user_id'], {}),
+    ('ix_employee_certifications_user_id', 'employee_certifications', ['user_id'], {}),
+    ('ix_employee_benefits_user_id', 'employee_benefits', ['user_id'], {}),
+    ('ix_employee_onboarding_user_id', 'employee_onboarding', ['user_id'], {}),
+    ('ix_employee_offboarding_user_id', 'employee_offboarding', ['user_id'], {}),
+    ('ix_course_enrollments_user_id', 'course_enrollments', ['user_id'], {}),
+]
+
+UNIQUE_CONSTRAINTS = [
+    ('uq_attendance_user_id_date', 'attendance', ['user_id', 'date']),
+    ('uq_leave_balances_user_id_leave_type_id_year', 'leave_balances', ['user_id', 'leave_type_id', 'year']),
+    ('uq_payslips_user_id_year_month', 'payslips', ['user_id', 'year', 'month']),
+]
+
+# Representative query shapes from the routers; {user_id} is filled from a sample row
+BENCHMARK_QUERIES = {
+    'leaves by user': "SELECT * FROM leaves WHERE user_id = '{user_id}'",
+    'attendance for day': "SELECT * FROM attendance WHERE user_id = '{user_id}' AND date = CAST(GETDATE() AS date)",
+    'attendance by date range': "SELECT user_id, status FROM attendance WHERE date >= DATEADD(day, -30, CAST(GETDATE() AS date))",
+    'leave balance': "SELECT * FROM leave_balances WHERE user_id = '{user_id}' AND year = YEAR(GETDATE())",
+    'latest salary': "SELECT TOP 1 * FROM salaries WHERE user_id = '{user_id}' ORDER BY effective_date DESC",
+    'payslips': "SELECT * FROM payslips WHERE user_id = '{user_id}' ORDER BY year DESC, month DESC",
+    'policy acknowledgments': "SELECT policy_id FROM policy_acknowledgments WHERE user_id = '{user_id}'",
+    'active project assignment': "SELECT * FROM project_assignments WHERE user_id = '{user_id}' AND status = 'active'",
+    'team members': "SELECT id FROM users WHERE manager_id = '{user_id}'",
+    'department members': "SELECT * FROM users WHERE department_id = (SELECT department_id FROM users WHERE id = '{user_id}')",
+}
+
+
+def _plan_summary(connection, sql):
+    connection.exec_driver_sql("SET SHOWPLAN_XML ON")
+    try:
+        plan = connection.exec_driver_sql(sql).scalar()
+    finally:
+        connection.exec_driver_sql("SET SHOWPLAN_XML OFF")
+
+    root = ElementTree.fromstring(plan)
+    operators = sorted({
+        rel_op.get("PhysicalOp") for rel_op in root.iter(f"{SHOWPLAN_NS}RelOp")
+    })
+    statement = root.find(f".//{SHOWPLAN_NS}StmtSimple")
+    cost = float(statement.get("StatementSubTreeCost", 0)) if statement is not None else 0.0
+    return operators, cost
+
+
+def _benchmark(connection):
+    user_id = connection.exec_driver_sql("SELECT TOP 1 id FROM users").scalar()
+    if user_id is None:
+        logger.info("Skipping query plan benchmark: users table is empty")
+        return {}
+    user_id = user_id.replace("'", "''")
+    return {
+        name: _plan_summary(connection, sql.format(user_id=user_id))
+        for name, sql in BENCHMARK_QUERIES.items()
+    }
+
+
+def upgrade():
+    run_benchmark = context.get_x_argument(as_dictionary=True).get("benchmark") == "true"
+    before = _benchmark(op.get_bind()) if run_benchmark else {}
+
+    for name, table, columns, kwargs in INDEXES:
+        op.create_index(name, table, columns, unique=False, **kwargs)
+    for name, table, columns in UNIQUE_CONSTRAINTS:
+        op.create_unique_constraint(name, table, columns)
+
+    if before:
+        after = _benchmark(op.get_bind())
+        for name, (ops_before, cost_before) in before.items():
+            ops_after, cost_after = after[name]
+            logger.info(
+                f"{name}: cost {cost_before:.4f} -> {cost_after:.4f}; "
+                f"operators {', '.join(ops_before)} -> {', '.join(ops_after)}"
+            )
+
+
+def downgrade():
+    for name, table, columns in reversed(UNIQUE_CONSTRAINTS):
+        op.drop_constraint(name, table, type_='unique')
+    for name, table, columns, kwargs in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
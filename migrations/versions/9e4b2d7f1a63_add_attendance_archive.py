@@ -0,0 +1,51 @@
+"""add_attendance_archive
+
+Revision ID: 9e4b2d7f1a63
+Revises: 7c3f5a1e8d46
+Create Date: 2026-10-17 21:48:31.902577
+
+Cold storage for attendance older than ATTENDANCE_HOT_MONTHS. Rows are
+moved by `python -m app.core.attendance_archive` or
+POST /attendance/archive; reads go through a UNION ALL of both tables.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = '9e4b2d7f1a63'
+down_revision = '7c3f5a1e8d46'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'attendance_archive',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('check_in', sa.DateTime(), nullable=True),
+        sa.Column('check_out', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('work_hours', sa.String(length=20), nullable=True),
+        sa.Column('work_minutes', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'date', name='uq_attendance_archive_user_id_date')
+    )
+    op.create_index(
+        'ix_attendance_archive_date', 'attendance_archive', ['date'],
+        mssql_include=['user_id', 'status']
+    )
+    op.create_index(
+        'ix_attendance_archive_created_at_id', 'attendance_archive', ['created_at', 'id']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_attendance_archive_created_at_id', table_name='attendance_archive')
+    op.drop_index('ix_attendance_archive_date', table_name='attendance_archive')
+    op.drop_table('attendance_archive')
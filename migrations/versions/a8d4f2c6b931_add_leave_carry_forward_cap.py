@@ -0,0 +1,26 @@
+"""add_leave_carry_forward_cap
+
+Revision ID: a8d4f2c6b931
+Revises: f3c7a1d9e254
+Create Date: 2026-10-17 17:03:26.158840
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = 'a8d4f2c6b931'
+down_revision = 'f3c7a1d9e254'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('leave_types', sa.Column(
+        'max_carry_forward_days', sa.Integer(), nullable=False, server_default='0'
+    ))
+
+
+def downgrade():
+    op.drop_column('leave_types', 'max_carry_forward_days', mssql_drop_default=True)
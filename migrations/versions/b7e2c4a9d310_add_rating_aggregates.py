@@ -0,0 +1,54 @@
+"""add_rating_aggregates
+
+Revision ID: b7e2c4a9d310
+Revises: 95d154eb00a7
+Create Date: 2026-10-17 11:02:17.482913
+
+Creates rating_aggregates and fills it from the existing performance
+ratings. POST /performance/aggregates/rebuild or
+`python -m app.core.rating_aggregates` recompute it later.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = 'b7e2c4a9d310'
+down_revision = '95d154eb00a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'rating_aggregates',
+        sa.Column('scope', sa.String(length=20), nullable=False),
+        sa.Column('scope_id', sa.String(length=36), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('period_end', sa.Date(), nullable=False),
+        sa.Column('rating_count', sa.Integer(), nullable=False),
+        sa.Column('rating_sum', sa.Float(), nullable=False),
+        sa.Column('rating_sum_squares', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('scope', 'scope_id', 'category', 'period_start', 'period_end')
+    )
+
+    for scope, scope_id, group_by in (
+        ('company', "''", ''),
+        ('user', 'r.user_id', 'r.user_id, '),
+        ('department', 'u.department_id', 'u.department_id, ')
+    ):
+        op.execute(
+            "INSERT INTO rating_aggregates (scope, scope_id, category, period_start, period_end, "
+            "rating_count, rating_sum, rating_sum_squares, updated_at) "
+            f"SELECT '{scope}', {scope_id}, COALESCE(r.category, ''), r.period_start, r.period_end, "
+            "COUNT(*), SUM(r.rating), SUM(r.rating * r.rating), GETUTCDATE() "
+            "FROM performance_ratings r JOIN users u ON u.id = r.user_id "
+            + ("WHERE u.department_id IS NOT NULL " if scope == 'department' else "")
+            + f"GROUP BY {group_by}COALESCE(r.category, ''), r.period_start, r.period_end"
+        )
+
+
+def downgrade():
+    op.drop_table('rating_aggregates')
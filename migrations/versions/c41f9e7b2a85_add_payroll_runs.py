@@ -0,0 +1,43 @@
+"""add_payroll_runs
+
+Revision ID: c41f9e7b2a85
+Revises: b7e2c4a9d310
+Create Date: 2026-10-17 12:20:45.913604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = 'c41f9e7b2a85'
+down_revision = 'b7e2c4a9d310'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'payroll_runs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('month', sa.Integer(), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('total_employees', sa.Integer(), nullable=True),
+        sa.Column('processed_employees', sa.Integer(), nullable=True),
+        sa.Column('error', sa.String(length=1000), nullable=True),
+        sa.Column('started_by', sa.String(length=36), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['started_by'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('year', 'month', name='uq_payroll_runs_year_month')
+    )
+    op.create_index(op.f('ix_payroll_runs_id'), 'payroll_runs', ['id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_payroll_runs_id'), table_name='payroll_runs')
+    op.drop_table('payroll_runs')
@@ -0,0 +1,75 @@
+"""add_leave_balance_reservations
+
+Revision ID: d5a8e3f1c726
+Revises: c41f9e7b2a85
+Create Date: 2026-10-17 13:41:09.227351
+
+Pending leaves now hold their days in leave_balances.reserved_days until
+they are approved (moved to used_days), rejected or cancelled (released).
+Existing leaves are backfilled with their length in working days under
+WORK_WEEK_MASK, the unit new leaves are charged in; holidays did not exist
+yet, so none are deducted. Reservations of pending leaves are recomputed,
+and used_days is raised to at least the days of approved leaves, so that
+cancelling a leave approved before this revision cannot refund days the
+balance never held. Balances an admin already maintained by hand are kept
+when they cover those leaves.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic
+revision = 'd5a8e3f1c726'
+down_revision = 'c41f9e7b2a85'
+branch_labels = None
+depends_on = None
+
+
+def _working_days(start, end):
+    """
+    T-SQL count of the days in [start, end] whose weekday is set in
+    WORK_WEEK_MASK (Monday first). Weekdays are numbered from 1900-01-01, a
+    Monday, so the result does not depend on the session's DATEFIRST.
+    """
+    first = f"DATEDIFF(day, '19000101', {start})"
+    last = f"DATEDIFF(day, '19000101', {end})"
+    counts = [
+        f"(({last} - {weekday} + 7) / 7 - ({first} - {weekday} + 6) / 7)"
+        for weekday, working in enumerate(settings.WORK_WEEK_MASK) if working == "1"
+    ]
+    return " + ".join(counts) or "0"
+
+
+def upgrade():
+    op.add_column('leaves', sa.Column('days', sa.Integer(), nullable=True))
+    op.add_column('leaves', sa.Column('comment', sa.String(length=500), nullable=True))
+    op.add_column('leave_balances', sa.Column(
+        'reserved_days', sa.Integer(), nullable=False, server_default='0'
+    ))
+
+    op.execute(f"UPDATE leaves SET days = {_working_days('start_date', 'end_date')}")
+    op.execute(
+        "UPDATE b SET reserved_days = p.days "
+        "FROM leave_balances b JOIN ("
+        "SELECT user_id, leave_type_id, YEAR(start_date) AS year, SUM(days) AS days "
+        "FROM leaves WHERE status = 'pending' "
+        "GROUP BY user_id, leave_type_id, YEAR(start_date)"
+        ") p ON p.user_id = b.user_id AND p.leave_type_id = b.leave_type_id AND p.year = b.year"
+    )
+    op.execute(
+        "UPDATE b SET used_days = a.days "
+        "FROM leave_balances b JOIN ("
+        "SELECT user_id, leave_type_id, YEAR(start_date) AS year, SUM(days) AS days "
+        "FROM leaves WHERE status = 'approved' "
+        "GROUP BY user_id, leave_type_id, YEAR(start_date)"
+        ") a ON a.user_id = b.user_id AND a.leave_type_id = b.leave_type_id AND a.year = b.year "
+        "WHERE b.used_days < a.days"
+    )
+
+
+def downgrade():
+    op.drop_column('leave_balances', 'reserved_days', mssql_drop_default=True)
+    op.drop_column('leaves', 'comment')
+    op.drop_column('leaves', 'days')
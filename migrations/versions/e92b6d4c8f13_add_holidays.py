@@ -0,0 +1,39 @@
+"""add_holidays
+
+Revision ID: e92b6d4c8f13
+Revises: d5a8e3f1c726
+Create Date: 2026-10-17 14:58:32.604417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = 'e92b6d4c8f13'
+down_revision = 'd5a8e3f1c726'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'holidays',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('department_id', sa.String(length=36), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('department_id', 'date', name='uq_holidays_department_id_date')
+    )
+    op.create_index(op.f('ix_holidays_id'), 'holidays', ['id'], unique=False)
+    op.create_index('ix_holidays_date', 'holidays', ['date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_holidays_date', table_name='holidays')
+    op.drop_index(op.f('ix_holidays_id'), table_name='holidays')
+    op.drop_table('holidays')
@@ -0,0 +1,30 @@
+"""add_leave_interval_index
+
+Revision ID: f3c7a1d9e254
+Revises: e92b6d4c8f13
+Create Date: 2026-10-17 16:10:54.771092
+
+Widens the per-user leave index to (user_id, start_date, end_date) so the
+overlap predicate start_date <= :end AND end_date >= :start is answered
+from the index.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = 'f3c7a1d9e254'
+down_revision = 'e92b6d4c8f13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_leaves_user_id_start_date', table_name='leaves')
+    op.create_index('ix_leaves_user_id_start_date_end_date', 'leaves',
+                    ['user_id', 'start_date', 'end_date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_leaves_user_id_start_date_end_date', table_name='leaves')
+    op.create_index('ix_leaves_user_id_start_date', 'leaves', ['user_id', 'start_date'], unique=False)
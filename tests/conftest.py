@@ -0,0 +1,61 @@
+# tests/conftest.py
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from types import SimpleNamespace
+import uuid
+import pytest
+
+from app.core.auth import get_current_user_with_permissions
+from app.db.models import Base
+from app.db.session import ThreadedSession, get_db
+from app.routers import leaves
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """
+    File-backed SQLite engine with the full schema, shared by every thread
+    of a test. Unpooled, so stress tests can hold hundreds of connections.
+    """
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'hrms.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        poolclass=NullPool
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """Sessions wrapped like get_db does when DB_ASYNC is disabled"""
+    factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    return lambda: ThreadedSession(factory())
+
+
+@pytest.fixture
+def current_user():
+    """The authenticated principal; tests may change its role or id"""
+    return SimpleNamespace(id=str(uuid.uuid4()), role=SimpleNamespace(name="HR"))
+
+
+@pytest.fixture
+def client(session_factory, current_user):
+    """Leaves API on the test database, authenticated as `current_user`"""
+    app = FastAPI()
+    app.include_router(leaves.router, prefix="/api/v1")
+
+    async def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user_with_permissions] = lambda: current_user
+    return TestClient(app)
@@ -0,0 +1,183 @@
+# tests/test_leave_balances.py
+from sqlalchemy import select
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import asyncio
+import threading
+import uuid
+import pytest
+
+from app.core.leave_balances import reserve_leave_days
+from app.core.leave_type_cache import leave_type_cache
+from app.db import models
+
+USER_ID = str(uuid.uuid4())
+LEAVE_TYPE_ID = str(uuid.uuid4())
+
+
+@pytest.fixture
+def balance(engine, session_factory):
+    session = session_factory().sync_session
+    session.add(models.LeaveBalance(
+        id=str(uuid.uuid4()),
+        user_id=USER_ID,
+        leave_type_id=LEAVE_TYPE_ID,
+        year=2026,
+        total_days=100,
+        used_days=2,
+        reserved_days=0
+    ))
+    session.commit()
+    session.close()
+
+
+def _leave(days):
+    return models.Leave(
+        id=str(uuid.uuid4()),
+        user_id=USER_ID,
+        leave_type_id=LEAVE_TYPE_ID,
+        start_date=date(2026, 3, 2),
+        end_date=date(2026, 3, 2),
+        days=days
+    )
+
+
+async def _reserve(session_factory, days):
+    db = session_factory()
+    try:
+        reserved = await reserve_leave_days(db, _leave(days))
+        await db.commit()
+        return reserved
+    finally:
+        await db.close()
+
+
+def _apply_concurrently(session_factory, requests):
+    """
+    Reserve each request's days at once, one thread, event loop and
+    session per request, all released together by a barrier
+    """
+    start = threading.Barrier(len(requests))
+
+    def apply(days):
+        start.wait()
+        return asyncio.run(_reserve(session_factory, days))
+
+    with ThreadPoolExecutor(len(requests)) as executor:
+        return list(executor.map(apply, requests))
+
+
+def _stored_balance(session_factory):
+    session = session_factory().sync_session
+    try:
+        return session.scalar(select(models.LeaveBalance))
+    finally:
+        session.close()
+
+
+def test_concurrent_reservations_never_exceed_balance(balance, session_factory):
+    # 98 days available; 300 concurrent one-day applications
+    results = _apply_concurrently(session_factory, [1] * 300)
+
+    assert results.count(True) == 98
+    stored = _stored_balance(session_factory)
+    assert stored.reserved_days == 98
+    assert stored.total_days - stored.used_days - stored.reserved_days == 0
+
+
+def test_concurrent_reservations_of_mixed_sizes(balance, session_factory):
+    requests = [3, 5, 2, 4, 1, 6, 2, 3] * 40
+    results = _apply_concurrently(session_factory, requests)
+
+    granted = sum(days for days, reserved in zip(requests, results) if reserved)
+    stored = _stored_balance(session_factory)
+    assert stored.reserved_days == granted
+    assert granted <= 98
+    # Every refused request was larger than what was left at the end
+    assert all(days > 98 - granted for days, reserved in zip(requests, results) if not reserved)
+
+
+def test_reservation_rejected_without_balance(session_factory):
+    assert not asyncio.run(_reserve(session_factory, 1))
+
+
+@pytest.fixture
+def employee(balance, session_factory):
+    """An employee with a 100-day balance (2 used) of an active leave type"""
+    session = session_factory().sync_session
+    session.add(models.User(
+        id=USER_ID, first_name="Asha", last_name="Rao", email="asha@example.com",
+        hashed_password="x", is_active=True
+    ))
+    session.add(models.LeaveType(id=LEAVE_TYPE_ID, name="Annual", default_days=100, is_active=True))
+    session.commit()
+    session.close()
+    leave_type_cache.invalidate()
+    yield USER_ID
+    leave_type_cache.invalidate()
+
+
+def _apply_leave(client, start, end):
+    return client.post(f"/api/v1/employees/{USER_ID}/leaves", json={
+        "leave_type_id": LEAVE_TYPE_ID,
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat()
+    })
+
+
+def test_apply_then_reject_releases_reservation(employee, client, session_factory):
+    # Monday to Wednesday: 3 working days
+    response = _apply_leave(client, date(2026, 3, 2), date(2026, 3, 4))
+    assert response.status_code == 200
+    assert response.json()["days"] == 3
+    assert _stored_balance(session_factory).reserved_days == 3
+
+    response = client.put(f"/api/v1/leaves/{response.json()['id']}/reject", params={"comment": "Release"})
+    assert response.status_code == 200
+
+    stored = _stored_balance(session_factory)
+    assert (stored.reserved_days, stored.used_days) == (0, 2)
+
+
+def test_apply_then_cancel_pending_releases_reservation(employee, client, session_factory):
+    # Friday to Monday: 2 working days
+    leave_id = _apply_leave(client, date(2026, 3, 6), date(2026, 3, 9)).json()["id"]
+    assert _stored_balance(session_factory).reserved_days == 2
+
+    assert client.delete(f"/api/v1/leaves/{leave_id}").status_code == 200
+
+    stored = _stored_balance(session_factory)
+    assert (stored.reserved_days, stored.used_days) == (0, 2)
+
+
+def test_approve_then_cancel_refunds_used_days(employee, client, session_factory):
+    leave_id = _apply_leave(client, date(2026, 3, 2), date(2026, 3, 6)).json()["id"]
+
+    assert client.put(f"/api/v1/leaves/{leave_id}/approve").status_code == 200
+    stored = _stored_balance(session_factory)
+    assert (stored.reserved_days, stored.used_days) == (0, 7)
+
+    assert client.delete(f"/api/v1/leaves/{leave_id}").status_code == 200
+    stored = _stored_balance(session_factory)
+    assert (stored.reserved_days, stored.used_days) == (0, 2)
+
+
+def test_overlapping_application_reserves_nothing(employee, client, session_factory):
+    assert _apply_leave(client, date(2026, 3, 2), date(2026, 3, 4)).status_code == 200
+
+    response = _apply_leave(client, date(2026, 3, 4), date(2026, 3, 5))
+
+    assert response.status_code == 400
+    assert "overlaps" in response.json()["detail"]
+    stored = _stored_balance(session_factory)
+    assert (stored.reserved_days, stored.used_days) == (3, 2)
+
+
+def test_application_beyond_balance_is_refused(employee, client, session_factory):
+    asyncio.run(_reserve(session_factory, 97))
+
+    response = _apply_leave(client, date(2026, 3, 2), date(2026, 3, 3))
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Insufficient leave balance"
+    assert _stored_balance(session_factory).reserved_days == 97
@@ -0,0 +1,56 @@
+# tests/test_leave_queries.py
+from sqlalchemy import event
+from datetime import date, datetime, timedelta
+import uuid
+import pytest
+
+from app.db import models
+
+
+@pytest.fixture
+def statements(engine):
+    """SQL statements sent to the database while the test runs"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def _seed_leaves(session_factory, count):
+    """`count` leaves, each with its own leave type"""
+    session = session_factory().sync_session
+    created_at = datetime(2026, 1, 1)
+    for index in range(count):
+        leave_type_id = str(uuid.uuid4())
+        session.add(models.LeaveType(id=leave_type_id, name=f"Type {index}", default_days=10))
+        session.add(models.Leave(
+            id=str(uuid.uuid4()),
+            user_id=str(uuid.uuid4()),
+            leave_type_id=leave_type_id,
+            start_date=date(2026, 3, 2),
+            end_date=date(2026, 3, 2),
+            days=1,
+            status="pending",
+            created_at=created_at + timedelta(minutes=index)
+        ))
+    session.commit()
+    session.close()
+
+
+@pytest.mark.parametrize("count", [3, 30])
+def test_list_leaves_query_count_is_constant(client, session_factory, statements, count):
+    _seed_leaves(session_factory, count)
+    statements.clear()
+
+    response = client.get("/api/v1/leaves", params={"limit": 100})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body) == count
+    assert {leave["leave_type"]["name"] for leave in body} == {f"Type {index}" for index in range(count)}
+    # Leaves and their leave types come back in a single joined SELECT
+    assert len(statements) == 1
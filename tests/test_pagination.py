@@ -0,0 +1,69 @@
+# tests/test_pagination.py
+from sqlalchemy import update
+from datetime import date, datetime, timedelta
+import uuid
+
+from app.db import models
+
+
+def _seed_leaves(session_factory, count, without_created_at):
+    """`count` leaves; the first `without_created_at` have a NULL created_at, like legacy rows"""
+    session = session_factory().sync_session
+    leave_type_id = str(uuid.uuid4())
+    session.add(models.LeaveType(id=leave_type_id, name="Annual", default_days=10))
+    ids = [str(uuid.uuid4()) for _ in range(count)]
+    for index, leave_id in enumerate(ids):
+        session.add(models.Leave(
+            id=leave_id,
+            user_id=str(uuid.uuid4()),
+            leave_type_id=leave_type_id,
+            start_date=date(2026, 3, 2),
+            end_date=date(2026, 3, 2),
+            days=1,
+            status="pending",
+            created_at=datetime(2026, 1, 1) + timedelta(minutes=index // 2)
+        ))
+    session.flush()
+    session.execute(
+        update(models.Leave)
+        .where(models.Leave.id.in_(ids[:without_created_at]))
+        .values(created_at=None)
+    )
+    session.commit()
+    session.close()
+    return ids
+
+
+def _all_pages(client, limit):
+    pages, params = [], {"limit": limit}
+    while True:
+        response = client.get("/api/v1/leaves", params=params)
+        assert response.status_code == 200
+        pages.append([leave["id"] for leave in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+        params = {"limit": limit, "cursor": cursor}
+
+
+def test_pages_cover_every_row_across_null_timestamps(client, session_factory):
+    ids = _seed_leaves(session_factory, 11, without_created_at=4)
+
+    pages = _all_pages(client, limit=3)
+
+    returned = [leave_id for page in pages for leave_id in page]
+    assert sorted(returned) == sorted(ids)
+    assert len(returned) == len(set(returned))
+    # Rows without a timestamp come first, in id order
+    assert returned[:4] == sorted(ids[:4])
+    assert [len(page) for page in pages] == [3, 3, 3, 2]
+
+
+def test_page_ending_on_null_timestamp_publishes_a_cursor(client, session_factory):
+    _seed_leaves(session_factory, 5, without_created_at=5)
+
+    response = client.get("/api/v1/leaves", params={"limit": 2})
+
+    assert response.status_code == 200
+    assert response.headers["X-Next-Cursor"]
+    assert len(_all_pages(client, limit=2)) == 3